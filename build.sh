@@ -4,5 +4,9 @@ set -o errexit
 
 pip install -r requirements.txt
 
+# Fail the build before migrating when a view exceeds its query budget
+# (tests/query_budgets.json).
+python manage.py test tests.test_query_counts
+
 python manage.py collectstatic --no-input
 python manage.py migrate
@@ -49,8 +49,12 @@ CRISPY_ALLOWED_TEMPLATE_PACKS = "bootstrap5"
 CRISPY_TEMPLATE_PACK = "bootstrap5"
 
 MIDDLEWARE = [
+    "tracker.middleware.ProfilingMiddleware",
+    "tracker.middleware.MetricsMiddleware",
+    "tracker.middleware.SlowQueryMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
+    "tracker.replicas.ReplicaMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -92,6 +96,73 @@ DATABASES = {
 db_from_env = dj_database_url.config()
 DATABASES["default"].update(db_from_env)
 
+# Read replicas: DATABASE_REPLICA_URLS is a comma-separated list of
+# database URLs, added as replica_0, replica_1... GET requests of the
+# index, list and detail views read from a random replica, except for
+# REPLICA_STICKY_SECONDS after the user's last write, see
+# tracker.replicas. Every replica mirrors the default database in tests.
+REPLICA_DATABASES = []
+for number, url in enumerate(
+    filter(None, os.environ.get("DATABASE_REPLICA_URLS", "").split(","))
+):
+    alias = f"replica_{number}"
+    DATABASES[alias] = dj_database_url.parse(url.strip())
+    DATABASES[alias]["TEST"] = {"MIRROR": "default"}
+    REPLICA_DATABASES.append(alias)
+DATABASE_ROUTERS = ["tracker.replicas.ReplicaRouter"]
+REPLICA_STICKY_SECONDS = int(os.environ.get("REPLICA_STICKY_SECONDS", 10))
+
+# Cache
+# https://docs.djangoproject.com/en/4.1/topics/cache/
+# Dashboard counters are shared between workers, so production should
+# point REDIS_URL at a shared cache; local memory is fine for one process.
+
+if os.environ.get("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ["REDIS_URL"],
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+DASHBOARD_CACHE_TIMEOUT = int(
+    os.environ.get("DASHBOARD_CACHE_TIMEOUT", 300)
+)
+
+# Cached page fragments are keyed by a per-user version that model
+# signals bump, so this only bounds how long orphaned entries linger.
+FRAGMENT_CACHE_TIMEOUT = int(
+    os.environ.get("FRAGMENT_CACHE_TIMEOUT", 600)
+)
+
+# Goal and habit lists switch from numbered pages to cursor pagination
+# once an account has more objects than this.
+CURSOR_PAGINATION_THRESHOLD = int(
+    os.environ.get("CURSOR_PAGINATION_THRESHOLD", 100)
+)
+
+# With CACHED_AUTH=True sessions are read through the cache (cached_db)
+# and logged-in users are cached for USER_CACHE_TIMEOUT seconds by
+# tracker.auth.CachedModelBackend, which saves the session and user
+# queries of every request. Saving or deleting a user drops its entry,
+# so all workers must share the cache (REDIS_URL). ModelBackend stays
+# listed: sessions store the backend that logged them in, and sessions
+# from before the switch would otherwise be logged out.
+CACHED_AUTH = os.environ.get("CACHED_AUTH", "") == "True"
+if CACHED_AUTH:
+    SESSION_ENGINE = "django.contrib.sessions.backends.cached_db"
+    AUTHENTICATION_BACKENDS = [
+        "tracker.auth.CachedModelBackend",
+        "django.contrib.auth.backends.ModelBackend",
+    ]
+USER_CACHE_TIMEOUT = int(os.environ.get("USER_CACHE_TIMEOUT", 60))
+
 # Password validation
 # https://docs.djangoproject.com/en/4.1/ref/settings/#auth-password-validators
 
@@ -141,3 +212,62 @@ AUTH_USER_MODEL = "tracker.User"
 
 LOGIN_REDIRECT_URL = "/"
 LOGOUT_REDIRECT_URL = "/"
+
+# Request profiling: Server-Timing headers and one JSON log line per
+# sampled request on the "tracker.profiling" logger. When disabled the
+# middleware is removed at startup.
+PROFILING_ENABLED = os.environ.get("PROFILING_ENABLED", "") == "True"
+PROFILING_SAMPLE_RATE = float(os.environ.get("PROFILING_SAMPLE_RATE", 1.0))
+
+# Per-worker metric files live in METRICS_DIR (default: a tracker-metrics
+# directory in the system temp dir); clear it when the server restarts.
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "") == "True"
+METRICS_DIR = os.environ.get("METRICS_DIR")
+
+# Statements slower than this many milliseconds are stored, with their
+# EXPLAIN output, in the "Slow queries" admin. Unset disables the log;
+# EXPLAIN ANALYZE (PostgreSQL only) re-runs the slow SELECTs.
+SLOW_QUERY_THRESHOLD_MS = (
+    float(os.environ["SLOW_QUERY_THRESHOLD_MS"])
+    if os.environ.get("SLOW_QUERY_THRESHOLD_MS") else None
+)
+SLOW_QUERY_EXPLAIN_ANALYZE = (
+    os.environ.get("SLOW_QUERY_EXPLAIN_ANALYZE", "") == "True"
+)
+
+# Background jobs (manage.py runworker): failed jobs are retried after
+# JOB_RETRY_BACKOFF * 2 ** (attempt - 1) seconds, jobs of a dead worker
+# are requeued after JOB_LOCK_TIMEOUT seconds. Bulk deletes of more than
+# JOB_BULK_DELETE_THRESHOLD goals run as a job. Export files go to
+# JOB_FILES_DIR (default: a directory in the system temp dir). The worker
+# deletes finished jobs and their files after JOB_RETENTION seconds.
+JOB_RETRY_BACKOFF = int(os.environ.get("JOB_RETRY_BACKOFF", 30))
+JOB_LOCK_TIMEOUT = int(os.environ.get("JOB_LOCK_TIMEOUT", 3600))
+JOB_BULK_DELETE_THRESHOLD = int(
+    os.environ.get("JOB_BULK_DELETE_THRESHOLD", 200)
+)
+JOB_FILES_DIR = os.environ.get("JOB_FILES_DIR")
+JOB_RETENTION = int(os.environ.get("JOB_RETENTION", 7 * 24 * 3600))
+
+# manage.py archive_habit_logs compacts habit logs older than
+# HABIT_LOG_ARCHIVE_DAYS into the year bitmaps, deleting at most
+# HABIT_LOG_ARCHIVE_BATCH_SIZE rows per transaction.
+HABIT_LOG_ARCHIVE_DAYS = int(os.environ.get("HABIT_LOG_ARCHIVE_DAYS", 730))
+HABIT_LOG_ARCHIVE_BATCH_SIZE = int(
+    os.environ.get("HABIT_LOG_ARCHIVE_BATCH_SIZE", 5000)
+)
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "tracker.profiling": {
+            "handlers": ["console"],
+            "level": "INFO",
+            "propagate": False,
+        },
+    },
+}
@@ -0,0 +1,15 @@
+"""Settings for ``manage.py test``.
+
+Adds a "replica" database: a second, separate SQLite database that the
+replica router tests fill and leave behind the primary on purpose. The
+test runner only creates it for test cases that list it in
+``databases``, and the router only reads from it where a test puts it
+in ``REPLICA_DATABASES``.
+"""
+from habits_and_goals_service.settings import *  # noqa: F401,F403
+from habits_and_goals_service.settings import DATABASES
+
+DATABASES["replica"] = {
+    "ENGINE": "django.db.backends.sqlite3",
+    "NAME": ":memory:",
+}
@@ -6,8 +6,10 @@ import sys
 
 def main():
     """Run administrative tasks."""
-    os.environ.setdefault("DJANGO_SETTINGS_MODULE",
-                          "habits_and_goals_service.settings")
+    settings_module = "habits_and_goals_service.settings"
+    if sys.argv[1:2] == ["test"]:
+        settings_module = "habits_and_goals_service.test_settings"
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", settings_module)
     try:
         from django.core.management import execute_from_command_line
     except ImportError as exc:
@@ -0,0 +1,35 @@
+// Submit goal and stage status toggles in the background and update the
+// page in place. Without JavaScript the buttons post the form normally.
+document.addEventListener("click", function (event) {
+    const button = event.target.closest("button[formaction][form='status-form']");
+    if (!button) {
+        return;
+    }
+    event.preventDefault();
+
+    const form = document.getElementById("status-form");
+    const container = button.closest(".status-toggle");
+    fetch(button.formAction, {
+        method: "POST",
+        body: new FormData(form),
+        headers: {"Accept": "application/json"},
+        credentials: "same-origin",
+    })
+        .then(function (response) {
+            if (!response.ok) {
+                throw new Error(response.statusText);
+            }
+            return response.json();
+        })
+        .then(function (data) {
+            container.dataset.status = data.status;
+            const label = container.querySelector(".status-label");
+            if (label) {
+                label.textContent = data.status;
+            }
+        })
+        .catch(function () {
+            form.action = button.formAction;
+            form.submit();
+        });
+});
@@ -0,0 +1,143 @@
+import datetime
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from tracker.archive import archive_logs
+from tracker.exporters import iter_records
+from tracker.models import Habit, HabitLog, HabitStats, HabitYearBitmap
+from tracker.reports import month_report
+
+START = datetime.date(2021, 11, 20)
+HORIZON = datetime.date(2023, 2, 10)
+
+
+class HabitLogArchiveTest(TestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            username="Test_user",
+            password="TestPassword123"
+        )
+        self.habit = Habit.objects.create(user=self.user, name="Test_habit")
+        HabitLog.objects.upsert([
+            HabitLog(
+                habit=self.habit,
+                log_date=START + datetime.timedelta(days=day),
+                completed=day % 5 != 0,
+            )
+            for day in range(600)
+            if day % 7 != 3
+        ])
+        self.client.force_login(self.user)
+
+    def snapshot(self) -> dict:
+        heatmaps = {
+            year: self.client.get(
+                reverse(
+                    "tracker:habit-heatmap",
+                    kwargs={"pk": self.habit.pk, "year": year}
+                )
+            ).json()
+            for year in (2021, 2022, 2023)
+        }
+        reports = {
+            month: [
+                (row["completed"], row["missed"], row["ignored"])
+                for row in month_report(self.user, month, HORIZON)
+            ]
+            for month in (
+                datetime.date(2021, 12, 1),
+                datetime.date(2023, 2, 1),
+            )
+        }
+        return {
+            "history": HabitLog.objects.history(self.habit.pk),
+            "stats": HabitStats.compute(self.habit.pk),
+            "heatmaps": heatmaps,
+            "reports": reports,
+            "export": sorted(
+                (record["date"], record["completed"])
+                for record in iter_records(self.user)
+                if record["type"] == "log"
+            ),
+        }
+
+    def test_archive_keeps_every_answer(self):
+        before = self.snapshot()
+
+        archived = archive_logs(HORIZON, batch_size=100)
+
+        self.assertEqual(
+            archived[self.habit.pk],
+            len([day for day in before["history"] if day < HORIZON])
+        )
+        self.assertFalse(
+            HabitLog.objects.filter(log_date__lt=HORIZON).exists()
+        )
+        self.assertEqual(
+            HabitYearBitmap.objects.get(
+                habit=self.habit, year=2023
+            ).archived_through,
+            HORIZON - datetime.timedelta(days=1)
+        )
+        self.assertEqual(self.snapshot(), before)
+
+    def test_rebuilds_keep_archived_days(self):
+        stats = HabitStats.compute(self.habit.pk)
+        archive_logs(HORIZON)
+
+        HabitYearBitmap.rebuild(self.habit.pk)
+        HabitStats.rebuild(self.habit.pk)
+
+        self.habit.stats.refresh_from_db()
+        self.assertEqual(self.habit.stats.as_dict(), stats)
+        self.assertEqual(
+            HabitYearBitmap.objects.filter(
+                habit=self.habit, archived_through__isnull=False
+            ).count(),
+            3
+        )
+
+    def test_live_log_overrides_archived_day(self):
+        archive_logs(HORIZON)
+        day = START + datetime.timedelta(days=5)
+        self.assertFalse(HabitLog.objects.history(self.habit.pk)[day])
+
+        HabitLog.objects.upsert(
+            [HabitLog(habit=self.habit, log_date=day, completed=True)]
+        )
+
+        self.assertTrue(HabitLog.objects.history(self.habit.pk)[day])
+        self.assertEqual(
+            HabitStats.objects.get(habit=self.habit).as_dict(),
+            HabitStats.compute(self.habit.pk)
+        )
+
+    def test_deleting_a_log_on_an_archived_day_updates_stats(self):
+        archive_logs(HORIZON)
+        day = START + datetime.timedelta(days=6)
+        HabitLog.objects.upsert(
+            [HabitLog(habit=self.habit, log_date=day, completed=True)]
+        )
+
+        HabitLog.objects.get(habit=self.habit, log_date=day).delete()
+
+        self.assertNotIn(day, HabitLog.objects.history(self.habit.pk))
+        self.assertEqual(
+            HabitStats.objects.get(habit=self.habit).as_dict(),
+            HabitStats.compute(self.habit.pk)
+        )
+
+    def test_command_archives_in_batches(self):
+        output = StringIO()
+
+        call_command(
+            "archive_habit_logs", "--days=0", "--batch-size=50",
+            stdout=output
+        )
+
+        self.assertFalse(HabitLog.objects.exists())
+        self.assertIn("Archived 514 logs", output.getvalue())
@@ -0,0 +1,90 @@
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from tracker.management.commands.benchmark_auth import MODES
+
+INDEX_URL = reverse("tracker:index")
+
+
+@override_settings(**MODES["cached"])
+class CachedAuthTest(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            username="Test_user",
+            password="TestPassword123"
+        )
+        self.client.force_login(self.user)
+
+    def queries(self, client, url) -> int:
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(context)
+
+    def test_warm_request_skips_session_and_user_queries(self):
+        self.client.get(INDEX_URL)
+        cached = self.queries(self.client, INDEX_URL)
+
+        with override_settings(**MODES["db"]):
+            client = Client()
+            client.force_login(self.user)
+            client.get(INDEX_URL)
+            uncached = self.queries(client, INDEX_URL)
+
+        self.assertEqual(uncached - cached, 2)
+
+    def test_deactivated_user_is_logged_out_immediately(self):
+        self.client.get(INDEX_URL)
+
+        self.user.is_active = False
+        self.user.save()
+
+        response = self.client.get(INDEX_URL)
+        self.assertRedirects(
+            response, f"{reverse('login')}?next={INDEX_URL}",
+            fetch_redirect_response=False
+        )
+
+    def test_edited_user_is_seen_immediately(self):
+        self.client.get(INDEX_URL)
+
+        self.user.username = "Renamed_user"
+        self.user.save()
+
+        response = self.client.get(INDEX_URL)
+        self.assertEqual(response.wsgi_request.user.username, "Renamed_user")
+
+    def test_sessions_from_before_the_switch_stay_logged_in(self):
+        with override_settings(**MODES["db"]):
+            client = Client()
+            client.login(username="Test_user", password="TestPassword123")
+
+        response = client.get(INDEX_URL)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.wsgi_request.user, self.user)
+
+    def test_benchmark_reports_queries_saved(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "results.json"
+            call_command(
+                "benchmark_auth",
+                "--username=Test_user",
+                "--requests=6",
+                f"--json={path}",
+                stdout=StringIO(),
+            )
+            results = json.loads(path.read_text())
+
+        self.assertEqual(results["queries_saved"], 2)
@@ -0,0 +1,125 @@
+import base64
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from tracker import bitmaps
+from tracker.models import Habit, HabitLog, HabitYearBitmap
+
+
+class BitmapHelpersTest(TestCase):
+    def test_set_bit_round_trip(self):
+        bitmap = bitmaps.set_bit(bitmaps.empty_bitmap(), 365, True)
+
+        self.assertEqual(len(bitmap), bitmaps.YEAR_BYTES)
+        self.assertEqual(bitmaps.to_int(bitmap), 1 << 365)
+        self.assertEqual(
+            bitmaps.set_bit(bitmap, 365, False), bitmaps.empty_bitmap()
+        )
+
+    def test_runs(self):
+        bits = 0b1110111101
+
+        self.assertEqual(bitmaps.popcount(bits), 8)
+        self.assertEqual(bitmaps.longest_run(bits), 4)
+        self.assertEqual(bitmaps.run_ending_at(bits, 9), 3)
+        self.assertEqual(bitmaps.run_ending_at(bits, 1), 0)
+        self.assertEqual(bitmaps.run_ending_at(0b111, 2), 3)
+
+    def test_iter_days(self):
+        completed = bitmaps.from_int(0b0101)
+        logged = bitmaps.from_int(0b1111)
+
+        self.assertEqual(
+            list(bitmaps.iter_days(2023, completed, logged, 2)),
+            [
+                (datetime.date(2023, 1, 1), True),
+                (datetime.date(2023, 1, 2), False),
+                (datetime.date(2023, 1, 3), True),
+            ]
+        )
+
+    def test_summarize(self):
+        completed = bitmaps.from_int(0b01011)
+        logged = bitmaps.from_int(0b11011)
+
+        self.assertEqual(
+            bitmaps.summarize(completed, logged, 0, 6),
+            {
+                "completed": 3,
+                "missed": 1,
+                "ignored": 3,
+                "longest_streak": 2,
+                "streak_at_end": 0,
+            }
+        )
+
+
+class HabitYearBitmapTest(TestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            username="Test_user",
+            password="TestPassword123"
+        )
+        self.habit = Habit.objects.create(user=self.user, name="Test_habit")
+
+    def log(self, day, completed):
+        HabitLog.objects.upsert(
+            [HabitLog(habit=self.habit, log_date=day, completed=completed)]
+        )
+
+    def test_logs_update_bitmaps(self):
+        self.log(datetime.date(2023, 1, 1), True)
+        self.log(datetime.date(2023, 1, 2), False)
+        self.log(datetime.date(2024, 12, 31), True)
+
+        bitmap_2023 = HabitYearBitmap.objects.get(habit=self.habit, year=2023)
+        bitmap_2024 = HabitYearBitmap.objects.get(habit=self.habit, year=2024)
+
+        self.assertEqual(bitmaps.to_int(bitmap_2023.completed), 0b01)
+        self.assertEqual(bitmaps.to_int(bitmap_2023.logged), 0b11)
+        self.assertEqual(bitmaps.to_int(bitmap_2024.completed), 1 << 365)
+
+    def test_upsert_overwrites_completed_bit(self):
+        self.log(datetime.date(2023, 1, 1), True)
+        self.log(datetime.date(2023, 1, 1), False)
+
+        bitmap = HabitYearBitmap.objects.get(habit=self.habit, year=2023)
+
+        self.assertEqual(bitmaps.to_int(bitmap.completed), 0)
+        self.assertEqual(bitmaps.to_int(bitmap.logged), 1)
+
+    def test_heatmap_view(self):
+        self.client.force_login(self.user)
+        self.log(datetime.date(2023, 1, 1), True)
+        url = reverse(
+            "tracker:habit-heatmap",
+            kwargs={"pk": self.habit.pk, "year": 2023}
+        )
+
+        response = self.client.get(url)
+        raw = self.client.get(url, {"format": "bin"})
+
+        self.assertEqual(response.json()["days"], 365)
+        self.assertEqual(
+            base64.b64decode(response.json()["completed"])[0], 1
+        )
+        self.assertEqual(len(raw.content), 2 * bitmaps.YEAR_BYTES)
+
+    def test_heatmap_view_hides_other_users_habits(self):
+        other = get_user_model().objects.create_user(
+            username="Other_user",
+            password="TestPassword123"
+        )
+        self.client.force_login(other)
+
+        response = self.client.get(
+            reverse(
+                "tracker:habit-heatmap",
+                kwargs={"pk": self.habit.pk, "year": 2023}
+            )
+        )
+
+        self.assertEqual(response.status_code, 404)
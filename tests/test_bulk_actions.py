@@ -0,0 +1,158 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from tracker.dashboard import compute_dashboard_counts, get_dashboard_counts
+from tracker.models import Goal, GoalStage, SearchDocument
+from tracker.transitions import bulk_goal_action, bulk_stage_action
+
+GOAL_BULK_URL = reverse("tracker:goal-bulk-action")
+
+
+class BulkActionTest(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            username="Test_user",
+            password="TestPassword123"
+        )
+        self.other = get_user_model().objects.create_user(
+            username="Other_user"
+        )
+        deadline = timezone.make_aware(datetime.datetime(2023, 3, 4))
+        self.goals = [
+            Goal.objects.create(
+                user=self.user, name=f"Goal {number}", deadline=deadline
+            )
+            for number in range(3)
+        ]
+        self.foreign_goal = Goal.objects.create(
+            user=self.other, name="Foreign", deadline=deadline
+        )
+        self.stages = [
+            GoalStage.objects.create(
+                goal=self.goals[0], stage_name=f"Stage {number}"
+            )
+            for number in range(3)
+        ]
+        self.client.force_login(self.user)
+
+    def test_status_change_is_one_update(self):
+        ids = [goal.pk for goal in self.goals] + [self.foreign_goal.pk]
+
+        # One UPDATE, wrapped in a savepoint inside the test transaction.
+        with self.assertNumQueries(3):
+            count = bulk_goal_action(self.user.pk, ids, "complete")
+
+        self.assertEqual(count, 3)
+        self.assertEqual(
+            Goal.objects.filter(status="completed").count(), 3
+        )
+        self.foreign_goal.refresh_from_db()
+        self.assertEqual(self.foreign_goal.status, "active")
+
+    def test_rows_already_in_status_are_not_counted(self):
+        bulk_goal_action(self.user.pk, [self.goals[0].pk], "abandon")
+
+        count = bulk_goal_action(
+            self.user.pk, [goal.pk for goal in self.goals], "abandon"
+        )
+
+        self.assertEqual(count, 2)
+
+    def test_delete_keeps_counters_and_search_index(self):
+        get_dashboard_counts(self.user.pk)
+
+        count = bulk_goal_action(
+            self.user.pk,
+            [self.goals[0].pk, self.foreign_goal.pk],
+            "delete"
+        )
+
+        self.assertEqual(count, 1)
+        self.assertTrue(Goal.objects.filter(pk=self.foreign_goal.pk).exists())
+        self.assertFalse(GoalStage.objects.exists())
+        self.assertFalse(
+            SearchDocument.objects.filter(
+                entity="goal", object_id=self.goals[0].pk
+            ).exists()
+        )
+        self.assertEqual(
+            get_dashboard_counts(self.user.pk),
+            compute_dashboard_counts(self.user.pk)
+        )
+
+    def test_stage_actions_are_scoped_to_goal_owner(self):
+        ids = [stage.pk for stage in self.stages]
+
+        self.assertEqual(
+            bulk_stage_action(self.other.pk, self.goals[0].pk, ids, "delete"),
+            0
+        )
+        self.assertEqual(
+            bulk_stage_action(
+                self.user.pk, self.goals[0].pk, ids[:2], "complete"
+            ),
+            2
+        )
+        self.assertEqual(
+            list(
+                GoalStage.objects.order_by("pk").values_list(
+                    "status", flat=True
+                )
+            ),
+            ["completed", "completed", "active"]
+        )
+
+    def test_goal_view_reports_count(self):
+        response = self.client.post(
+            GOAL_BULK_URL,
+            {"action": "complete", "ids": [self.goals[0].pk]},
+            follow=True
+        )
+
+        self.assertRedirects(response, reverse("tracker:goal-list"))
+        self.assertContains(response, "Complete: 1 goal changed.")
+
+    def test_stage_view_answers_json(self):
+        url = reverse(
+            "tracker:goal-stage-bulk-action",
+            kwargs={"goal_id": self.goals[0].pk}
+        )
+
+        response = self.client.post(
+            url,
+            {"action": "delete", "ids": [stage.pk for stage in self.stages]},
+            HTTP_ACCEPT="application/json"
+        )
+
+        self.assertEqual(response.json(), {"action": "delete", "count": 3})
+
+    def test_stage_view_redirects_to_goal(self):
+        goal_id = self.goals[0].pk
+
+        response = self.client.post(
+            reverse(
+                "tracker:goal-stage-bulk-action", kwargs={"goal_id": goal_id}
+            ),
+            {"action": "complete", "ids": [self.stages[0].pk]},
+        )
+
+        self.assertRedirects(
+            response,
+            reverse("tracker:goal-detail", args=[goal_id]),
+            fetch_redirect_response=False,
+        )
+
+    def test_invalid_selection_is_rejected(self):
+        response = self.client.post(
+            GOAL_BULK_URL,
+            {"action": "complete", "ids": ["x"]},
+            HTTP_ACCEPT="application/json"
+        )
+
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,99 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from tracker.models import Commentary, Goal, GoalStage, Habit, HabitLog
+
+
+class ConditionalGetTest(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            username="Test_user",
+            password="TestPassword123"
+        )
+        self.goal = Goal.objects.create(
+            user=self.user,
+            name="Test_goal",
+            deadline=timezone.make_aware(datetime.datetime(2023, 3, 4))
+        )
+        self.habit = Habit.objects.create(user=self.user, name="Test_habit")
+        self.goal_url = reverse(
+            "tracker:goal-detail", kwargs={"pk": self.goal.pk}
+        )
+        self.habit_url = reverse(
+            "tracker:habit-detail", kwargs={"pk": self.habit.pk}
+        )
+        self.client.force_login(self.user)
+
+    def test_unchanged_goal_returns_304_without_rendering(self):
+        etag = self.client.get(self.goal_url)["ETag"]
+
+        with self.assertNumQueries(3):
+            response = self.client.get(
+                self.goal_url, HTTP_IF_NONE_MATCH=etag
+            )
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.templates, [])
+
+    def test_last_modified_is_honoured(self):
+        last_modified = self.client.get(self.goal_url)["Last-Modified"]
+
+        response = self.client.get(
+            self.goal_url, HTTP_IF_MODIFIED_SINCE=last_modified
+        )
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_stage_and_comment_changes_roll_up_to_goal(self):
+        etag = self.client.get(self.goal_url)["ETag"]
+        stage = GoalStage.objects.create(goal=self.goal, stage_name="Stage")
+        stage_etag = self.client.get(self.goal_url)["ETag"]
+        Commentary.objects.create(user=self.user, text="Nice").goals.add(
+            self.goal
+        )
+        comment_etag = self.client.get(self.goal_url)["ETag"]
+        stage.delete()
+        delete_etag = self.client.get(self.goal_url)["ETag"]
+
+        self.assertEqual(
+            len({etag, stage_etag, comment_etag, delete_etag}), 4
+        )
+
+    def test_log_changes_roll_up_to_habit(self):
+        etag = self.client.get(self.habit_url)["ETag"]
+
+        HabitLog.objects.upsert([HabitLog(habit=self.habit, completed=True)])
+        response = self.client.get(self.habit_url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context["logged_today"])
+
+    def test_etag_differs_between_users(self):
+        etag = self.client.get(self.goal_url)["ETag"]
+        other = get_user_model().objects.create_user(username="Other_user")
+        self.client.force_login(other)
+
+        response = self.client.get(self.goal_url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_logging_in_again_invalidates_cached_pages(self):
+        for url in (self.goal_url, self.habit_url):
+            response = self.client.get(url)
+            self.client.logout()
+            self.client.login(username="Test_user", password="TestPassword123")
+
+            revalidated = self.client.get(
+                url,
+                HTTP_IF_NONE_MATCH=response["ETag"],
+                HTTP_IF_MODIFIED_SINCE=response["Last-Modified"],
+            )
+
+            self.assertEqual(revalidated.status_code, 200, url)
+            self.assertNotEqual(revalidated["ETag"], response["ETag"])
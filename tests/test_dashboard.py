@@ -0,0 +1,137 @@
+import datetime
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from tracker.dashboard import (
+    apply_dashboard_deltas,
+    compute_dashboard_counts,
+    get_dashboard_counts,
+)
+from tracker.models import Goal, Habit
+
+INDEX_URL = reverse("tracker:index")
+
+
+class DashboardCountsTest(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            username="Test_user",
+            password="TestPassword123"
+        )
+        self.deadline = timezone.make_aware(datetime.datetime(2023, 3, 4))
+        for status in ["active", "active", "completed", "abandoned"]:
+            Goal.objects.create(
+                user=self.user,
+                name="Test_goal",
+                deadline=self.deadline,
+                status=status
+            )
+        Habit.objects.create(user=self.user, name="Test_habit")
+
+    def test_compute_counts_in_two_queries(self):
+        with self.assertNumQueries(2):
+            counts = compute_dashboard_counts(self.user.pk)
+
+        self.assertEqual(
+            counts,
+            {
+                "total": 4,
+                "active": 2,
+                "completed": 1,
+                "abandoned": 1,
+                "habits": 1,
+            }
+        )
+
+    def test_cached_counts_skip_database(self):
+        get_dashboard_counts(self.user.pk)
+
+        with self.assertNumQueries(0):
+            get_dashboard_counts(self.user.pk)
+
+    def test_signals_keep_cached_counts_up_to_date(self):
+        get_dashboard_counts(self.user.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            goal = Goal.objects.create(
+                user=self.user,
+                name="New_goal",
+                deadline=self.deadline
+            )
+            goal.status = "completed"
+            goal.save()
+            Goal.objects.filter(status="abandoned").first().delete()
+            Habit.objects.create(user=self.user, name="New_habit")
+
+        with self.assertNumQueries(0):
+            counts = get_dashboard_counts(self.user.pk)
+
+        self.assertEqual(counts, compute_dashboard_counts(self.user.pk))
+
+    def test_deltas_wait_for_commit(self):
+        before = get_dashboard_counts(self.user.pk)
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            Habit.objects.create(user=self.user, name="New_habit")
+        self.assertEqual(get_dashboard_counts(self.user.pk), before)
+
+        for callback in callbacks:
+            callback()
+        self.assertEqual(get_dashboard_counts(self.user.pk)["habits"], 2)
+
+    def test_locked_entry_is_dropped_instead_of_adjusted(self):
+        get_dashboard_counts(self.user.pk)
+        cache.add(f"dashboard:counts:{self.user.pk}:lock", 1)
+
+        apply_dashboard_deltas(self.user.pk, {"habits": 1})
+        cache.delete(f"dashboard:counts:{self.user.pk}:lock")
+
+        with self.assertNumQueries(2):
+            get_dashboard_counts(self.user.pk)
+
+    def test_recompute_racing_a_delta_does_not_cache_stale_counts(self):
+        stale = compute_dashboard_counts(self.user.pk)
+        Habit.objects.create(user=self.user, name="New_habit")
+
+        def recompute(user_id):
+            # The delta of a commit arrives while this recompute, which
+            # read the counts before that commit, holds the lock.
+            apply_dashboard_deltas(user_id, {"habits": 1})
+            return stale
+
+        with mock.patch(
+            "tracker.dashboard.compute_dashboard_counts",
+            side_effect=recompute,
+        ):
+            get_dashboard_counts(self.user.pk)
+
+        self.assertEqual(get_dashboard_counts(self.user.pk)["habits"], 2)
+
+    def test_index_view_uses_counts(self):
+        self.client.force_login(self.user)
+
+        response = self.client.get(INDEX_URL)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["active_goals_number"], 2)
+        self.assertEqual(response.context["active_goals_percent"], 50.0)
+        self.assertEqual(response.context["total_goals_number"], 4)
+        self.assertEqual(response.context["habits_number"], 1)
+
+    def test_index_view_lists_only_newest_habits(self):
+        Habit.objects.bulk_create([
+            Habit(user=self.user, name=f"Habit {number}")
+            for number in range(12)
+        ])
+        self.client.force_login(self.user)
+
+        response = self.client.get(INDEX_URL)
+
+        self.assertEqual(len(response.context["habits_objects"]), 10)
+        self.assertContains(response, "View all (13)")
@@ -0,0 +1,103 @@
+import datetime
+import gzip
+import io
+import json
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from tracker.exporters import iter_records
+from tracker.importers import import_stream
+from tracker.models import Commentary, Goal, GoalStage, Habit, HabitLog
+
+EXPORT_URL = reverse("tracker:data-export")
+
+
+class DataExportTest(TestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            username="Test_user",
+            password="TestPassword123"
+        )
+        self.goal = Goal.objects.create(
+            user=self.user,
+            name="Test_goal",
+            deadline=timezone.make_aware(datetime.datetime(2023, 3, 4))
+        )
+        GoalStage.objects.create(goal=self.goal, stage_name="Test_stage")
+        self.habit = Habit.objects.create(user=self.user, name="Test_habit")
+        HabitLog.objects.upsert([
+            HabitLog(
+                habit=self.habit,
+                log_date=datetime.date(2023, 5, day),
+                completed=day % 2 == 0
+            )
+            for day in range(1, 11)
+        ])
+        commentary = Commentary.objects.create(user=self.user, text="Nice")
+        commentary.goals.add(self.goal)
+        self.client.force_login(self.user)
+
+    def test_records_cover_every_model(self):
+        records = list(iter_records(self.user, chunk_size=3))
+
+        types = [record["type"] for record in records]
+        self.assertEqual(types.count("log"), 10)
+        self.assertEqual(
+            sorted(set(types)),
+            ["commentary", "goal", "habit", "log", "stage"]
+        )
+        self.assertEqual(records[-1]["goal"], ["Test_goal"])
+
+    def test_query_count_does_not_grow_with_logs(self):
+        with self.assertNumQueries(8):
+            list(iter_records(self.user))
+
+        HabitLog.objects.upsert([
+            HabitLog(
+                habit=self.habit,
+                log_date=datetime.date(2022, 1, 1) + datetime.timedelta(day),
+                completed=True
+            )
+            for day in range(200)
+        ])
+
+        with self.assertNumQueries(8):
+            list(iter_records(self.user))
+
+    def test_jsonl_export_round_trips_through_importer(self):
+        response = self.client.get(EXPORT_URL, {"format": "jsonl"})
+        body = b"".join(response.streaming_content).decode()
+        other = get_user_model().objects.create_user(username="Other_user")
+
+        report = import_stream(other, io.StringIO(body), "jsonl")
+
+        self.assertEqual(
+            report["imported"],
+            {"goal": 1, "stage": 1, "habit": 1, "log": 10}
+        )
+        self.assertEqual(report["rejected"], 1)
+
+    def test_csv_export_is_gzipped_when_accepted(self):
+        response = self.client.get(
+            EXPORT_URL,
+            {"format": "csv"},
+            HTTP_ACCEPT_ENCODING="gzip"
+        )
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        body = gzip.decompress(b"".join(response.streaming_content))
+        self.assertTrue(body.startswith(b"type,name,goal,habit"))
+        self.assertIn(b"commentary,,Test_goal,", body)
+
+    def test_export_contains_only_own_data(self):
+        other = get_user_model().objects.create_user(username="Other_user")
+        self.client.force_login(other)
+
+        response = self.client.get(EXPORT_URL)
+        lines = b"".join(response.streaming_content).splitlines()
+
+        self.assertEqual([json.loads(line) for line in lines], [])
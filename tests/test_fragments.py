@@ -0,0 +1,116 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from tracker import fragments
+from tracker.models import Commentary, Goal, GoalStage, Habit, HabitLog
+
+GOAL_LIST_URL = reverse("tracker:goal-list")
+
+
+class FragmentCacheTest(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            username="Test_user",
+            password="TestPassword123"
+        )
+        self.goal = Goal.objects.create(
+            user=self.user,
+            name="Test_goal",
+            deadline=timezone.make_aware(datetime.datetime(2023, 3, 4))
+        )
+        self.habit = Habit.objects.create(user=self.user, name="Test_habit")
+        self.client.force_login(self.user)
+
+    def assertVersionBumped(self, change):
+        version = fragments.get_cache_version(self.user.pk)
+        change()
+        self.assertGreater(fragments.get_cache_version(self.user.pk), version)
+
+    def test_model_signals_bump_version(self):
+        self.assertVersionBumped(lambda: GoalStage.objects.create(
+            goal=self.goal, stage_name="Test_stage"
+        ))
+        self.assertVersionBumped(lambda: HabitLog.objects.upsert([
+            HabitLog(habit=self.habit, completed=True)
+        ]))
+        self.assertVersionBumped(
+            lambda: HabitLog.objects.get(habit=self.habit).delete()
+        )
+        commentary = Commentary.objects.create(user=self.user, text="Nice")
+        self.assertVersionBumped(lambda: commentary.goals.add(self.goal))
+        self.assertVersionBumped(self.goal.delete)
+
+    def test_version_is_bumped_again_on_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            GoalStage.objects.create(goal=self.goal, stage_name="Test_stage")
+        # A fragment cached from the pre-commit rows in between.
+        fragments.get_or_set(self.user.pk, "stale", lambda: "stale")
+
+        self.assertVersionBumped(
+            lambda: [callback() for callback in callbacks]
+        )
+
+    def test_other_users_are_not_invalidated(self):
+        other = get_user_model().objects.create_user(username="Other_user")
+        version = fragments.get_cache_version(other.pk)
+
+        Goal.objects.create(
+            user=self.user,
+            name="New_goal",
+            deadline=self.goal.deadline
+        )
+
+        self.assertEqual(fragments.get_cache_version(other.pk), version)
+
+    def test_get_or_set_counts_hits_and_misses(self):
+        fragments.reset_cache_stats()
+        calls = []
+
+        for _ in range(3):
+            fragments.get_or_set(
+                self.user.pk, "answer", lambda: calls.append(1) or 42
+            )
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(
+            fragments.cache_stats(),
+            {"hits": 2, "misses": 1, "hit_ratio": 0.6667}
+        )
+
+    def test_goal_list_fragment_is_cached_until_a_change(self):
+        self.client.get(GOAL_LIST_URL)
+        first = fragments.cache_stats()
+
+        response = self.client.get(GOAL_LIST_URL)
+
+        self.assertEqual(fragments.cache_stats()["hits"], first["hits"] + 1)
+        self.assertContains(response, "Test_goal")
+
+        Goal.objects.create(
+            user=self.user,
+            name="Fresh_goal",
+            deadline=self.goal.deadline
+        )
+        response = self.client.get(GOAL_LIST_URL)
+
+        self.assertContains(response, "Fresh_goal")
+
+    def test_habit_detail_stats_are_cached(self):
+        url = reverse("tracker:habit-detail", kwargs={"pk": self.habit.pk})
+        self.client.get(url)
+
+        with self.assertNumQueries(4):
+            response = self.client.get(url)
+        self.assertFalse(response.context["logged_today"])
+
+        self.client.post(url, {"completed": "True"})
+        response = self.client.get(url)
+
+        self.assertTrue(response.context["logged_today"])
+        self.assertEqual(response.context["completed_days_log"], 1)
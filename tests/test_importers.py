@@ -0,0 +1,130 @@
+import datetime
+import io
+import json
+import tempfile
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from tracker.importers import CSV_COLUMNS, import_stream
+from tracker.models import Goal, GoalStage, Habit, HabitLog, HabitStats
+
+CSV_DATA = ",".join(CSV_COLUMNS) + """
+goal,Learn Django,,,Read the docs,2023-06-01,,,,
+stage,Models,Learn Django,,,,completed,,,
+habit,Running,,,,,,20 runs,,
+log,,,Running,,,,,2023-05-01,true
+log,,,Running,,,,,2023-05-02,1
+log,,,Running,,,,,2023-05-03,no
+log,,,Swimming,,,,,2023-05-03,no
+log,,,Running,,,,,not-a-date,no
+unknown,,,,,,,,,
+"""
+
+
+class DataImporterTest(TestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            username="Test_user",
+            password="TestPassword123"
+        )
+
+    def test_import_csv(self):
+        report = import_stream(self.user, io.StringIO(CSV_DATA), "csv")
+
+        self.assertEqual(report["rows"], 9)
+        self.assertEqual(
+            report["imported"],
+            {"goal": 1, "stage": 1, "habit": 1, "log": 3}
+        )
+        self.assertEqual(report["rejected"], 3)
+        self.assertEqual(
+            sorted(line for line, _ in report["rejections"]), [8, 9, 10]
+        )
+
+        goal = Goal.objects.get(user=self.user)
+        self.assertEqual(goal.stages.get().status, "completed")
+        stats = HabitStats.objects.get(habit__user=self.user)
+        self.assertEqual(stats.completed_count, 2)
+        self.assertEqual(stats.missed_count, 1)
+        self.assertEqual(stats.longest_streak, 2)
+
+    def test_import_jsonl_in_small_chunks(self):
+        lines = [
+            {"type": "habit", "name": "Reading"},
+            {"type": "log", "habit": "Reading", "date": "2023-05-01",
+             "completed": True},
+            {"type": "log", "habit": "Reading", "date": "2023-05-01",
+             "completed": False},
+        ]
+        stream = io.StringIO(
+            "\n".join(json.dumps(line) for line in lines) + "\n{broken\n"
+        )
+
+        report = import_stream(self.user, stream, "jsonl", chunk_size=2)
+
+        self.assertEqual(report["rejected"], 1)
+        log = HabitLog.objects.get(habit__user=self.user)
+        self.assertFalse(log.completed)
+
+    def test_import_command(self):
+        stdout = StringIO()
+        with tempfile.NamedTemporaryFile("w", suffix=".csv") as csv_file:
+            csv_file.write(CSV_DATA)
+            csv_file.flush()
+            call_command(
+                "import_data", "Test_user", csv_file.name,
+                stdout=stdout, stderr=StringIO()
+            )
+
+        self.assertIn("rejected 3 rows", stdout.getvalue())
+        self.assertEqual(Habit.objects.filter(user=self.user).count(), 1)
+
+    def test_upload_endpoint(self):
+        self.client.force_login(self.user)
+        upload = SimpleUploadedFile("data.csv", CSV_DATA.encode())
+
+        response = self.client.post(
+            reverse("tracker:data-import"),
+            {"file": upload, "format": "csv"}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["report"]["imported"]["log"], 3)
+        self.assertEqual(GoalStage.objects.count(), 1)
+
+    def test_impossible_deadline_is_rejected(self):
+        lines = [
+            {"type": "goal", "name": "Leap", "deadline": "2023-02-30"},
+            {"type": "goal", "name": "Late", "deadline": "2023-06-01T25:00"},
+            {"type": "goal", "name": "Fine", "deadline": "2023-06-01"},
+        ]
+        stream = io.StringIO("\n".join(json.dumps(line) for line in lines))
+
+        report = import_stream(self.user, stream, "jsonl")
+
+        self.assertEqual(report["rejected"], 2)
+        self.assertEqual(
+            list(Goal.objects.values_list("name", flat=True)), ["Fine"]
+        )
+
+    def test_imported_stages_touch_their_goal(self):
+        goal = Goal.objects.create(
+            user=self.user,
+            name="Learn Django",
+            deadline=timezone.make_aware(datetime.datetime(2023, 6, 1))
+        )
+        updated_at = goal.updated_at
+        stream = io.StringIO(json.dumps(
+            {"type": "stage", "goal": "Learn Django", "name": "Views"}
+        ))
+
+        import_stream(self.user, stream, "jsonl")
+
+        goal.refresh_from_db()
+        self.assertGreater(goal.updated_at, updated_at)
@@ -0,0 +1,256 @@
+import gzip
+import json
+import tempfile
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from datetime import timedelta
+from pathlib import Path
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from tracker import jobs
+from tracker.models import Goal, Habit, Job
+
+JOB_LIST_URL = reverse("tracker:job-list")
+JOB_CREATE_URL = reverse("tracker:job-create")
+GOAL_BULK_URL = reverse("tracker:goal-bulk-action")
+
+
+class JobQueueTest(TestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            username="Test_user",
+            password="TestPassword123"
+        )
+
+    def test_claim_takes_each_runnable_job_once(self):
+        first = jobs.enqueue("rebuild_habit_stats", self.user)
+        second = jobs.enqueue("rebuild_habit_stats", self.user)
+        jobs.enqueue("rebuild_habit_stats", self.user, delay=60)
+
+        claimed = jobs.claim_jobs("worker-a", 5)
+
+        self.assertEqual([job.pk for job in claimed], [first.pk, second.pk])
+        self.assertEqual(
+            {(job.status, job.locked_by, job.attempts) for job in claimed},
+            {("running", "worker-a", 1)}
+        )
+        self.assertEqual(jobs.claim_jobs("worker-b", 5), [])
+
+    def test_enqueue_rejects_unknown_kind(self):
+        with self.assertRaises(ValueError):
+            jobs.enqueue("no_such_job")
+
+    def test_failed_job_is_retried_with_backoff_then_fails(self):
+        job = jobs.enqueue("rebuild_habit_stats", self.user, max_attempts=2)
+
+        with mock.patch.dict(
+            jobs.TASKS, rebuild_habit_stats=mock.Mock(side_effect=OSError)
+        ):
+            jobs.claim_jobs("worker", 1)
+            self.assertEqual(jobs.run_job(job.pk), "queued")
+            job.refresh_from_db()
+            self.assertGreater(
+                job.run_after,
+                timezone.now() + timedelta(seconds=jobs.JOB_RETRY_BACKOFF - 5)
+            )
+            self.assertIn("OSError", job.error)
+
+            Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+            jobs.claim_jobs("worker", 1)
+            self.assertEqual(jobs.run_job(job.pk), "failed")
+
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ("failed", 2))
+        self.assertIsNotNone(job.finished_at)
+
+    def test_stale_running_job_is_requeued(self):
+        job = jobs.enqueue("rebuild_habit_stats", self.user)
+        jobs.claim_jobs("dead-worker", 1)
+        Job.objects.filter(pk=job.pk).update(
+            locked_at=timezone.now() - timedelta(hours=2)
+        )
+
+        self.assertEqual(jobs.requeue_stale_jobs(timeout=3600), 1)
+        self.assertEqual(
+            [claimed.pk for claimed in jobs.claim_jobs("worker", 1)],
+            [job.pk]
+        )
+
+    def test_stale_job_on_its_last_attempt_fails(self):
+        job = jobs.enqueue("rebuild_habit_stats", self.user, max_attempts=1)
+        jobs.claim_jobs("dead-worker", 1)
+        Job.objects.filter(pk=job.pk).update(
+            locked_at=timezone.now() - timedelta(hours=2)
+        )
+
+        self.assertEqual(jobs.requeue_stale_jobs(timeout=3600), 1)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.locked_by), ("failed", ""))
+        self.assertIsNotNone(job.finished_at)
+        self.assertEqual(jobs.claim_jobs("worker", 1), [])
+
+    def test_runworker_restarts_a_broken_pool(self):
+        job = jobs.enqueue("rebuild_habit_stats", self.user)
+        pools = []
+
+        class Pool:
+            """Runs jobs in this process; the first pool is broken."""
+
+            def __init__(self, **kwargs):
+                self.broken = not pools
+                pools.append(self)
+
+            def submit(self, func, job_id):
+                future = Future()
+                if self.broken:
+                    future.set_exception(BrokenProcessPool())
+                else:
+                    future.set_result(jobs.run_job(job_id))
+                return future
+
+            def shutdown(self, **kwargs):
+                pass
+
+        output = StringIO()
+        with mock.patch(
+            "tracker.management.commands.runworker.ProcessPoolExecutor",
+            Pool
+        ):
+            call_command("runworker", "--burst", stdout=output)
+
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ("succeeded", 2))
+        self.assertEqual(len(pools), 2)
+        self.assertIn("released 1 jobs", output.getvalue())
+
+    def test_expired_jobs_are_deleted_with_their_files(self):
+        old = jobs.enqueue("export_data", self.user)
+        recent = jobs.enqueue("export_data", self.user)
+        queued = jobs.enqueue("export_data", self.user)
+        Job.objects.filter(pk=old.pk).update(
+            status="succeeded",
+            finished_at=timezone.now() - timedelta(days=8)
+        )
+        Job.objects.filter(pk=recent.pk).update(
+            status="failed", finished_at=timezone.now()
+        )
+
+        with tempfile.TemporaryDirectory() as directory:
+            with override_settings(JOB_FILES_DIR=directory):
+                path = Path(directory) / f"job-{old.pk}.gz"
+                path.touch()
+                with self.captureOnCommitCallbacks(execute=True):
+                    deleted = jobs.delete_finished_jobs(
+                        retention=7 * 24 * 3600
+                    )
+                self.assertFalse(path.exists())
+
+        self.assertEqual(deleted, 1)
+        self.assertEqual(
+            set(Job.objects.values_list("pk", flat=True)),
+            {recent.pk, queued.pk}
+        )
+
+    def test_runworker_inline_runs_export(self):
+        Goal.objects.create(
+            user=self.user, name="Test_goal", deadline=timezone.now()
+        )
+        Habit.objects.create(user=self.user, name="Test_habit")
+        job = jobs.enqueue("export_data", self.user, {"format": "jsonl"})
+
+        with tempfile.TemporaryDirectory() as directory:
+            with override_settings(JOB_FILES_DIR=directory):
+                output = StringIO()
+                call_command(
+                    "runworker", "--inline", "--burst", stdout=output
+                )
+                job.refresh_from_db()
+                self.assertEqual(job.status, "succeeded")
+                self.assertEqual(job.result["lines"], 2)
+                self.assertIn(f"Job {job.pk}: succeeded", output.getvalue())
+
+                self.client.force_login(self.user)
+                response = self.client.get(
+                    reverse("tracker:job-download", args=[job.pk])
+                )
+                body = gzip.decompress(b"".join(response.streaming_content))
+
+        types = [json.loads(line)["type"] for line in body.splitlines()]
+        self.assertEqual(types, ["goal", "habit"])
+
+
+class JobViewsTest(TestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            username="Test_user",
+            password="TestPassword123"
+        )
+        self.other = get_user_model().objects.create_user(
+            username="Other_user"
+        )
+        self.client.force_login(self.user)
+
+    def test_create_queues_job_and_redirects_to_status(self):
+        response = self.client.post(
+            JOB_CREATE_URL, {"kind": "export_data", "format": "csv"}
+        )
+
+        job = Job.objects.get()
+        self.assertRedirects(
+            response, reverse("tracker:job-detail", args=[job.pk])
+        )
+        self.assertEqual(
+            (job.user, job.status, job.payload),
+            (self.user, "queued", {"format": "csv"})
+        )
+
+    def test_status_pages_only_show_own_jobs(self):
+        own = jobs.enqueue("rebuild_habit_stats", self.user)
+        other = jobs.enqueue("rebuild_habit_stats", self.other)
+
+        response = self.client.get(JOB_LIST_URL)
+        self.assertEqual(list(response.context["job_list"]), [own])
+        self.assertEqual(
+            self.client.get(
+                reverse("tracker:job-detail", args=[other.pk])
+            ).status_code,
+            404
+        )
+        response = self.client.get(
+            reverse("tracker:job-detail", args=[own.pk]), {"format": "json"}
+        )
+        self.assertEqual(response.json()["status"], "queued")
+
+    @override_settings(JOB_BULK_DELETE_THRESHOLD=2)
+    def test_large_bulk_delete_runs_as_job(self):
+        ids = [
+            Goal.objects.create(
+                user=self.user, name=f"Goal {number}",
+                deadline=timezone.now()
+            ).pk
+            for number in range(3)
+        ]
+
+        response = self.client.post(
+            GOAL_BULK_URL,
+            {"action": "delete", "ids": ids},
+            HTTP_ACCEPT="application/json"
+        )
+
+        self.assertEqual(response.status_code, 202)
+        job = Job.objects.get(pk=response.json()["job"])
+        self.assertEqual(
+            (job.kind, job.payload), ("delete_goals", {"ids": ids})
+        )
+        self.assertEqual(Goal.objects.count(), 3)
+
+        jobs.claim_jobs("worker", 1)
+        self.assertEqual(jobs.run_job(job.pk), "succeeded")
+        self.assertEqual(Goal.objects.count(), 0)
@@ -0,0 +1,178 @@
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase, TransactionTestCase, override_settings
+
+from tests.test_replicas import replicate
+from tracker.models import (
+    Commentary,
+    Goal,
+    GoalStage,
+    Habit,
+    HabitLog,
+    HabitStats,
+    HabitYearBitmap,
+    SearchDocument,
+    User,
+)
+
+
+def generate(prefix="loadtest", seed=7):
+    call_command(
+        "generate_dataset",
+        "--users=3",
+        "--goals=2",
+        "--stages=2",
+        "--habits=2",
+        "--days=40",
+        "--comments=2",
+        "--users-per-batch=2",
+        f"--seed={seed}",
+        f"--prefix={prefix}",
+        stdout=StringIO(),
+    )
+
+
+class GenerateDatasetTest(TestCase):
+
+    def test_generates_requested_volume(self):
+        generate()
+
+        self.assertEqual(User.objects.count(), 3)
+        self.assertEqual(Goal.objects.count(), 6)
+        self.assertEqual(GoalStage.objects.count(), 12)
+        self.assertEqual(Habit.objects.count(), 6)
+        self.assertEqual(Commentary.objects.count(), 6)
+        self.assertEqual(SearchDocument.objects.count(), 18)
+        self.assertGreater(HabitLog.objects.count(), 6 * 30)
+
+    def test_derived_data_matches_logs(self):
+        generate()
+
+        for habit_id in Habit.objects.values_list("pk", flat=True):
+            stats = HabitStats.objects.get(habit_id=habit_id)
+            self.assertEqual(stats.as_dict(), HabitStats.compute(habit_id))
+
+            stored = list(
+                HabitYearBitmap.objects.filter(habit_id=habit_id)
+                .order_by("year")
+                .values_list("year", "completed", "logged")
+            )
+            HabitYearBitmap.rebuild(habit_id)
+            rebuilt = list(
+                HabitYearBitmap.objects.filter(habit_id=habit_id)
+                .order_by("year")
+                .values_list("year", "completed", "logged")
+            )
+            self.assertEqual(
+                [(year, bytes(c), bytes(lg)) for year, c, lg in stored],
+                [(year, bytes(c), bytes(lg)) for year, c, lg in rebuilt]
+            )
+
+    def test_same_seed_gives_same_data(self):
+        generate(prefix="first")
+        generate(prefix="second")
+
+        first, second = (
+            list(
+                HabitLog.objects.filter(
+                    habit__user__username__startswith=prefix
+                ).order_by("pk").values_list("log_date", "completed")
+            )
+            for prefix in ("first", "second")
+        )
+        self.assertEqual(first, second)
+
+    def test_refuses_existing_prefix(self):
+        generate()
+
+        with self.assertRaises(CommandError):
+            generate()
+
+
+class BenchmarkUrlsTest(TestCase):
+    def test_reports_every_get_route(self):
+        generate()
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "results.json"
+
+            with override_settings(
+                METRICS_ENABLED=True, METRICS_DIR=directory
+            ):
+                call_command(
+                    "benchmark_urls",
+                    "--requests=2",
+                    "--warmup=0",
+                    f"--json={path}",
+                    stdout=StringIO(),
+                    stderr=StringIO(),
+                )
+            results = json.loads(path.read_text())
+
+        self.assertIn("tracker:habit-detail", results)
+        self.assertIn("tracker:metrics", results)
+        self.assertNotIn("tracker:goal-update-status", results)
+        for name, result in results.items():
+            self.assertEqual(result["status"], [200], name)
+            self.assertLessEqual(result["p50_ms"], result["p99_ms"])
+
+
+class BenchmarkUrlsReplicaTest(TransactionTestCase):
+    # "replica" is a separate database (see test_settings), filled by
+    # replicate() once the dataset is committed.
+    databases = {"default", "replica"}
+
+    def queries(self) -> float:
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "results.json"
+            call_command(
+                "benchmark_urls",
+                "--requests=2",
+                "--warmup=1",
+                "--route=goal-list",
+                f"--json={path}",
+                stdout=StringIO(),
+            )
+            return json.loads(path.read_text())["tracker:goal-list"][
+                "queries"
+            ]
+
+    def test_counts_queries_on_replicas(self):
+        generate()
+        replicate()
+        primary = self.queries()
+
+        with override_settings(REPLICA_DATABASES=["replica"]):
+            self.assertEqual(self.queries(), primary)
+
+
+class BenchmarkAsgiTest(TransactionTestCase):
+    # Requests run on other threads, which only see committed data.
+
+    def test_compares_both_interfaces(self):
+        generate()
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "results.json"
+
+            call_command(
+                "benchmark_asgi",
+                "--requests=4",
+                "--concurrency=2",
+                "--warmup=1",
+                f"--json={path}",
+                stdout=StringIO(),
+            )
+            results = json.loads(path.read_text())
+
+        self.assertEqual(
+            sorted(results), ["tracker:habit-detail", "tracker:index"]
+        )
+        for name, interfaces in results.items():
+            self.assertEqual(sorted(interfaces), ["asgi", "wsgi"])
+            for result in interfaces.values():
+                self.assertEqual(result["status"], [200], name)
+                self.assertEqual(result["requests"], 4)
+                self.assertGreater(result["rps"], 0)
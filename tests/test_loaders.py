@@ -0,0 +1,98 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from tracker.loaders import (
+    RECENT_COMMENTARIES,
+    goal_detail_queryset,
+    load_goal_detail,
+)
+from tracker.models import Commentary, Goal, GoalStage
+
+
+class GoalDetailLoaderTest(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            username="Test_user",
+            password="TestPassword123"
+        )
+        self.goal = Goal.objects.create(
+            user=self.user,
+            name="Test_goal",
+            deadline=timezone.make_aware(datetime.datetime(2023, 3, 4))
+        )
+        self.url = reverse("tracker:goal-detail", kwargs={"pk": self.goal.pk})
+        self.client.force_login(self.user)
+
+    def add_stages_and_comments(self, count):
+        for number in range(count):
+            GoalStage.objects.create(
+                goal=self.goal,
+                stage_name=f"Stage {number}",
+                status=["active", "completed", "abandoned"][number % 3]
+            )
+            commentary = Commentary.objects.create(
+                user=self.user, text=f"Comment {number}"
+            )
+            commentary.goals.add(self.goal)
+
+    def load(self):
+        goal = goal_detail_queryset().get(pk=self.goal.pk)
+        context = load_goal_detail(goal)
+        list(context["goal_stages"])
+        list(context["goal_commentaries"])
+        return context
+
+    def test_stage_progress_comes_from_one_aggregate(self):
+        self.add_stages_and_comments(6)
+
+        progress = self.load()["stage_progress"]
+
+        self.assertEqual(
+            progress,
+            {
+                "active": 2,
+                "completed": 2,
+                "abandoned": 2,
+                "total": 6,
+                "percent": 50.0,
+            }
+        )
+
+    def test_only_recent_commentaries_are_loaded(self):
+        self.add_stages_and_comments(RECENT_COMMENTARIES + 5)
+
+        commentaries = self.load()["goal_commentaries"]
+
+        self.assertEqual(len(commentaries), RECENT_COMMENTARIES)
+        self.assertEqual(
+            commentaries[0].text, f"Comment {RECENT_COMMENTARIES + 4}"
+        )
+
+    def test_query_count_is_constant(self):
+        for count in (1, 10, 30):
+            self.add_stages_and_comments(count)
+            cache.clear()
+
+            with self.assertNumQueries(3):
+                self.load()
+
+            # Session, user, ETag lookup and the three loader queries.
+            with self.assertNumQueries(6):
+                response = self.client.get(self.url)
+            self.assertEqual(response.status_code, 200)
+
+    def test_cached_fragments_skip_stage_and_comment_queries(self):
+        self.add_stages_and_comments(10)
+        self.client.get(self.url)
+
+        # Session, user, ETag lookup and the annotated goal.
+        with self.assertNumQueries(4):
+            response = self.client.get(self.url)
+        self.assertContains(response, "Stage 9")
+        self.assertContains(response, "Comment 9")
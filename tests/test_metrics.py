@@ -0,0 +1,157 @@
+import multiprocessing
+import os
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from tracker import metrics
+
+GOAL_LIST_URL = reverse("tracker:goal-list")
+METRICS_URL = reverse("tracker:metrics")
+
+
+def _record_in_child(amount):
+    metrics.inc("tracker_db_queries_total", amount, view="tracker:index")
+
+
+class MetricsStoreTest(TestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings_override = override_settings(METRICS_DIR=directory.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.directory = directory.name
+
+    def test_store_grows_and_reopens(self):
+        store = metrics.get_store()
+        for index in range(3000):
+            store.inc(f"key-{index}", index)
+
+        reopened = metrics.MmapStore(store.path)
+
+        self.assertEqual(len(reopened.positions), 3000)
+        self.assertEqual(metrics.collect()["key-2999"], 2999)
+
+    def test_entries_stop_at_the_end_of_a_stale_mapping(self):
+        store = metrics.get_store()
+        store.inc("first", 1)
+        store.inc("second", 2)
+        buffer = bytearray(store.mmap[:store.positions["second"]])
+
+        self.assertEqual(
+            [(key, value) for key, _, value in metrics._entries(buffer)],
+            [("first", 1.0)]
+        )
+
+    def test_label_values_are_escaped(self):
+        metrics.inc(
+            "tracker_http_exceptions_total", view='say "hi"\\n\n'
+        )
+
+        self.assertIn(
+            'tracker_http_exceptions_total{view="say \\"hi\\"\\\\n\\n"} 1',
+            metrics.render_prometheus(metrics.collect()),
+        )
+
+    def test_collect_sums_every_worker(self):
+        metrics.inc("tracker_db_queries_total", 2, view="tracker:index")
+        worker = multiprocessing.get_context("fork").Process(
+            target=_record_in_child, args=(5,)
+        )
+        worker.start()
+        worker.join()
+
+        self.assertEqual(len(os.listdir(self.directory)), 2)
+        self.assertIn(
+            'tracker_db_queries_total{view="tracker:index"} 7',
+            metrics.render_prometheus(metrics.collect()),
+        )
+
+    def test_histogram_is_rendered_cumulative(self):
+        for seconds in (0.003, 0.02, 0.02, 30):
+            metrics.observe(
+                "tracker_http_request_duration_seconds",
+                seconds,
+                view="tracker:index",
+            )
+
+        text = metrics.render_prometheus(metrics.collect())
+
+        name = "tracker_http_request_duration_seconds"
+        labels = 'view="tracker:index"'
+        self.assertIn(f'{name}_bucket{{le="0.005",{labels}}} 1', text)
+        self.assertIn(f'{name}_bucket{{le="0.025",{labels}}} 3', text)
+        self.assertIn(f'{name}_bucket{{le="10.0",{labels}}} 3', text)
+        self.assertIn(f'{name}_bucket{{le="+Inf",{labels}}} 4', text)
+        self.assertIn(f"{name}_count{{{labels}}} 4", text)
+
+
+class MetricsMiddlewareTest(TestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.settings_override = override_settings(
+            METRICS_ENABLED=True, METRICS_DIR=directory.name
+        )
+        self.user = get_user_model().objects.create_user(
+            username="Test_user",
+            password="TestPassword123"
+        )
+
+    def test_endpoint_is_hidden_when_disabled(self):
+        response = self.client.get(METRICS_URL)
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_requests_are_counted_per_url_name(self):
+        with self.settings_override:
+            client = Client()
+            client.force_login(self.user)
+            client.get(GOAL_LIST_URL)
+            client.get(GOAL_LIST_URL)
+            client.get("/missing-page/")
+            with self.assertNumQueries(0):
+                response = client.get(METRICS_URL)
+
+        text = response.content.decode()
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        self.assertIn(
+            'tracker_http_requests_total{method="GET",status="200",'
+            'view="tracker:goal-list"} 2',
+            text,
+        )
+        self.assertIn(
+            'tracker_http_requests_total{method="GET",status="404",'
+            'view="other"} 1',
+            text,
+        )
+        self.assertIn(
+            "tracker_http_request_duration_seconds_count"
+            '{view="tracker:goal-list"} 2',
+            text,
+        )
+        queries = [
+            line for line in text.splitlines()
+            if line.startswith(
+                'tracker_db_queries_total{view="tracker:goal-list"}'
+            )
+        ]
+        self.assertGreater(int(queries[0].split()[-1]), 0)
+
+    def test_unknown_methods_share_one_label(self):
+        with self.settings_override:
+            client = Client()
+            client.generic("BREW", "/missing-page/")
+            client.generic("PROPFIND", "/missing-page/")
+            response = client.get(METRICS_URL)
+
+        text = response.content.decode()
+        self.assertIn(
+            'tracker_http_requests_total{method="other",status="404",'
+            'view="other"} 2',
+            text,
+        )
+        self.assertNotIn("BREW", text)
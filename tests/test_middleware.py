@@ -0,0 +1,48 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+GOAL_LIST_URL = reverse("tracker:goal-list")
+
+
+class ProfilingMiddlewareTest(TestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            username="Test_user",
+            password="TestPassword123"
+        )
+
+    def get(self, url):
+        client = Client()
+        client.force_login(self.user)
+        return client.get(url)
+
+    def test_disabled_by_default(self):
+        response = self.get(GOAL_LIST_URL)
+
+        self.assertNotIn("Server-Timing", response)
+
+    @override_settings(PROFILING_ENABLED=True)
+    def test_reports_server_timing_and_log_line(self):
+        with self.assertLogs("tracker.profiling", "INFO") as logs:
+            response = self.get(GOAL_LIST_URL)
+
+        timing = response["Server-Timing"]
+        for metric in ("db;dur=", "tpl;dur=", "view;dur=", "total;dur="):
+            self.assertIn(metric, timing)
+
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record["url_name"], "tracker:goal-list")
+        self.assertEqual(record["status"], 200)
+        self.assertGreater(record["db_queries"], 0)
+        self.assertIn(f'"{record["db_queries"]} queries"', timing)
+        self.assertGreater(record["template_ms"], 0)
+        self.assertGreaterEqual(record["total_ms"], record["view_ms"])
+
+    @override_settings(PROFILING_ENABLED=True, PROFILING_SAMPLE_RATE=0)
+    def test_unsampled_requests_are_not_profiled(self):
+        response = self.get(GOAL_LIST_URL)
+
+        self.assertNotIn("Server-Timing", response)
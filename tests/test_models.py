@@ -1,10 +1,12 @@
 import datetime
+from io import StringIO
 
 from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
 from django.test import TestCase
 from django.utils import timezone
 
-from tracker.models import Habit, Goal
+from tracker.models import Habit, Goal, HabitLog, HabitStats
 
 
 class ModelTest(TestCase):
@@ -43,3 +45,104 @@ class ModelTest(TestCase):
             str(format_),
             format_.name
         )
+
+
+class HabitStatsTest(TestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            username="test_user",
+            password="test_pass"
+        )
+        self.habit = Habit.objects.create(user=self.user, name="Test123")
+        # Entries are folded into an existing row; a missing row is
+        # rebuilt from the logs instead.
+        HabitStats.objects.create(habit=self.habit)
+
+    def test_record_log_tracks_counts_and_streaks(self):
+        start = datetime.date(2023, 5, 1)
+        days = [True, True, True, False, True]
+        for offset, completed in enumerate(days):
+            HabitStats.record_logs(
+                self.habit.pk,
+                [(start + datetime.timedelta(days=offset), completed)]
+            )
+
+        stats = HabitStats.objects.get(habit=self.habit)
+
+        self.assertEqual(stats.completed_count, 4)
+        self.assertEqual(stats.missed_count, 1)
+        self.assertEqual(stats.current_streak, 1)
+        self.assertEqual(stats.longest_streak, 3)
+        self.assertEqual(stats.last_log_date, datetime.date(2023, 5, 5))
+
+    def test_streak_breaks_on_skipped_day(self):
+        HabitStats.record_logs(
+            self.habit.pk,
+            [
+                (datetime.date(2023, 5, 1), True),
+                (datetime.date(2023, 5, 3), True),
+            ]
+        )
+
+        stats = HabitStats.objects.get(habit=self.habit)
+
+        self.assertEqual(stats.current_streak, 1)
+        self.assertEqual(
+            stats.active_streak(today=datetime.date(2023, 5, 4)), 1
+        )
+        self.assertEqual(
+            stats.active_streak(today=datetime.date(2023, 5, 5)), 0
+        )
+
+    def test_first_log_without_stats_row_counts_earlier_logs(self):
+        HabitLog.objects.upsert([
+            HabitLog(
+                habit=self.habit,
+                log_date=datetime.date(2023, 5, day),
+                completed=True
+            )
+            for day in (1, 2)
+        ])
+        HabitStats.objects.filter(habit=self.habit).delete()
+
+        HabitLog.objects.create(
+            habit=self.habit,
+            completed=True,
+            log_date=datetime.date(2023, 5, 3)
+        )
+
+        stats = HabitStats.objects.get(habit=self.habit)
+        self.assertEqual(stats.completed_count, 3)
+        self.assertEqual(stats.current_streak, 3)
+
+    def test_saving_log_updates_stats(self):
+        HabitLog.objects.create(habit=self.habit, completed=True)
+
+        stats = HabitStats.objects.get(habit=self.habit)
+
+        self.assertEqual(stats.completed_count, 1)
+        self.assertEqual(stats.current_streak, 1)
+        self.assertEqual(stats.last_log_date, timezone.localdate())
+
+    def test_rebuild_command_repairs_stale_stats(self):
+        HabitLog.objects.create(
+            habit=self.habit,
+            completed=True,
+            log_date=datetime.date(2023, 5, 1)
+        )
+        HabitLog.objects.create(
+            habit=self.habit,
+            completed=False,
+            log_date=datetime.date(2023, 5, 2)
+        )
+        HabitStats.objects.update(completed_count=10)
+
+        with self.assertRaises(CommandError):
+            call_command("rebuild_habit_stats", "--check", stdout=StringIO())
+
+        call_command("rebuild_habit_stats", stdout=StringIO())
+        call_command("rebuild_habit_stats", "--check", stdout=StringIO())
+
+        stats = HabitStats.objects.get(habit=self.habit)
+        self.assertEqual(stats.completed_count, 1)
+        self.assertEqual(stats.missed_count, 1)
@@ -0,0 +1,106 @@
+import datetime
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from tracker.models import Goal, Habit
+from tracker.pagination import CursorPage
+
+GOAL_URL = reverse("tracker:goal-list")
+HABIT_URL = reverse("tracker:habit-list")
+
+
+class CursorPaginationTest(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            username="Test_user",
+            password="TestPassword123"
+        )
+        created_at = timezone.make_aware(datetime.datetime(2023, 1, 1))
+        for number in range(12):
+            goal = Goal.objects.create(
+                user=self.user,
+                name=f"Goal {number}",
+                deadline=created_at,
+                status="completed" if number % 3 == 0 else "active"
+            )
+            # Every other goal shares a timestamp to exercise the id
+            # tie-breaker.
+            Goal.objects.filter(pk=goal.pk).update(
+                created_at=created_at + datetime.timedelta(days=number // 2)
+            )
+        self.client.force_login(self.user)
+
+    def names(self, response, key="goal_list"):
+        return [goal.name for goal in response.context[key]]
+
+    def test_walk_forward_and_back_without_count(self):
+        with CaptureQueriesContext(connection) as queries:
+            first = self.client.get(GOAL_URL, {"cursor": ""})
+
+        self.assertIsInstance(first.context["page_obj"], CursorPage)
+        self.assertFalse(
+            any("COUNT(" in query["sql"] for query in queries.captured_queries)
+        )
+        self.assertEqual(
+            self.names(first), [f"Goal {number}" for number in range(5)]
+        )
+
+        second = self.client.get(
+            GOAL_URL, {"cursor": first.context["page_obj"].next_cursor}
+        )
+        third = self.client.get(
+            GOAL_URL, {"cursor": second.context["page_obj"].next_cursor}
+        )
+        self.assertEqual(self.names(third), ["Goal 10", "Goal 11"])
+        self.assertFalse(third.context["page_obj"].has_next)
+
+        back = self.client.get(
+            GOAL_URL, {"cursor": third.context["page_obj"].previous_cursor}
+        )
+        self.assertEqual(self.names(back), self.names(second))
+        self.assertTrue(back.context["page_obj"].has_previous)
+
+    def test_cursor_respects_status_filter(self):
+        response = self.client.get(
+            GOAL_URL, {"cursor": "", "status": "completed"}
+        )
+
+        self.assertEqual(
+            self.names(response), ["Goal 0", "Goal 3", "Goal 6", "Goal 9"]
+        )
+        self.assertEqual(
+            response.context["pagination_query"], "status=completed"
+        )
+
+    def test_tampered_cursor_starts_from_first_page(self):
+        response = self.client.get(GOAL_URL, {"cursor": "bogus"})
+
+        self.assertEqual(self.names(response)[0], "Goal 0")
+
+    def test_small_accounts_keep_offset_pages(self):
+        response = self.client.get(GOAL_URL)
+
+        self.assertFalse(response.context["cursor_pagination"])
+        self.assertEqual(response.context["paginator"].num_pages, 3)
+
+    @mock.patch("tracker.pagination.CURSOR_PAGINATION_THRESHOLD", 10)
+    def test_large_accounts_switch_to_cursor(self):
+        for number in range(11):
+            Habit.objects.create(user=self.user, name=f"Habit {number}")
+
+        goals = self.client.get(GOAL_URL)
+        habits = self.client.get(HABIT_URL)
+        offset = self.client.get(GOAL_URL, {"page": 2})
+
+        self.assertTrue(goals.context["cursor_pagination"])
+        self.assertTrue(habits.context["cursor_pagination"])
+        self.assertContains(habits, "?cursor=")
+        self.assertEqual(self.names(offset)[0], "Goal 5")
@@ -0,0 +1,276 @@
+"""Query-count regression suite for every tracker view.
+
+Each view is requested with 1, 10 and 100 related objects seeded. The
+number of queries must not depend on that number, and must stay within
+the budget recorded in ``query_budgets.json`` next to this file. Run
+
+    QUERY_BUDGET_UPDATE=1 python manage.py test tests.test_query_counts
+
+to rewrite the baseline after an intended change; review its diff like
+any other code change. build.sh runs this suite before every deploy.
+"""
+import datetime
+import json
+import os
+import time
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from tracker.models import (
+    Commentary,
+    Goal,
+    GoalStage,
+    Habit,
+    HabitLog,
+    Job,
+)
+
+BUDGET_FILE = Path(__file__).with_name("query_budgets.json")
+UPDATE_BUDGETS = os.environ.get("QUERY_BUDGET_UPDATE") == "1"
+SIZES = (1, 10, 100)
+
+# Recorded SQL time may grow this much over the baseline before the
+# test fails; the floor keeps tiny baselines from being flaky.
+SQL_TIME_FACTOR = 20
+SQL_TIME_FLOOR_MS = 250
+
+
+def seed(user, size):
+    """``size`` goals and habits; the first of each gets ``size`` stages,
+    logs and comments."""
+    deadline = timezone.make_aware(datetime.datetime(2030, 1, 1))
+    goals = [
+        Goal.objects.create(
+            user=user, name=f"Goal {number}", deadline=deadline
+        )
+        for number in range(size)
+    ]
+    habits = [
+        Habit.objects.create(user=user, name=f"Habit {number}")
+        for number in range(size)
+    ]
+    for number in range(size):
+        GoalStage.objects.create(goal=goals[0], stage_name=f"Stage {number}")
+        commentary = Commentary.objects.create(
+            user=user, text=f"Goal comment {number}"
+        )
+        commentary.goals.add(goals[0])
+        commentary = Commentary.objects.create(
+            user=user, text=f"Habit comment {number}"
+        )
+        commentary.habits.add(habits[0])
+    today = timezone.localdate()
+    HabitLog.objects.upsert([
+        HabitLog(
+            habit=habits[0],
+            log_date=today - datetime.timedelta(days=day),
+            completed=day % 3 != 0,
+        )
+        for day in range(size)
+    ])
+    Job.objects.bulk_create([
+        Job(user=user, kind="rebuild_habit_stats") for _ in range(size)
+    ])
+    return {
+        "goal": goals[0],
+        "stage": goals[0].stages.first(),
+        "habit": habits[0],
+        "job": user.jobs.first(),
+        "year": today.year,
+        "month": today.month,
+    }
+
+
+def _goal(objects):
+    return {"pk": objects["goal"].pk}
+
+
+def _stage(objects):
+    return {"goal_id": objects["goal"].pk, "pk": objects["stage"].pk}
+
+
+def _habit(objects):
+    return {"pk": objects["habit"].pk}
+
+
+def _month(objects):
+    return {"year": objects["year"], "month": objects["month"]}
+
+
+# url name (with a suffix for variants): (method, kwargs builder, data)
+VIEWS = {
+    "tracker:index": ("get", None, None),
+    "tracker:goal-list": ("get", None, None),
+    "tracker:goal-list?name": ("get", None, {"name": "goal"}),
+    "tracker:goal-create": ("get", None, None),
+    "tracker:goal-detail": ("get", _goal, None),
+    "tracker:goal-delete": ("get", _goal, None),
+    "tracker:goal-update": ("get", _goal, None),
+    "tracker:goal-update-status": ("post", _goal, None),
+    "tracker:goal-update-status-abandoned": ("post", _goal, None),
+    "tracker:goal-bulk-action": ("post", None, {"action": "complete"}),
+    "tracker:goal-create-stage": (
+        "get", lambda objects: {"goal_id": objects["goal"].pk}, None
+    ),
+    "tracker:goal-update-stage": ("get", _stage, None),
+    "tracker:goal-delete-stage": ("get", _stage, None),
+    "tracker:goal-update-stage-status": ("post", _stage, None),
+    "tracker:goal-update-stage-status-abandoned": ("post", _stage, None),
+    "tracker:goal-stage-bulk-action": (
+        "post",
+        lambda objects: {"goal_id": objects["goal"].pk},
+        {"action": "complete"},
+    ),
+    "tracker:goal-commentary-create": ("get", _goal, None),
+    "tracker:habit-list": ("get", None, None),
+    "tracker:habit-create": ("get", None, None),
+    "tracker:habit-check-in": ("get", None, None),
+    "tracker:habit-delete": ("get", _habit, None),
+    "tracker:habit-update": ("get", _habit, None),
+    "tracker:habit-detail": ("get", _habit, None),
+    "tracker:habit-heatmap": (
+        "get",
+        lambda objects: {
+            "pk": objects["habit"].pk, "year": objects["year"]
+        },
+        None,
+    ),
+    "tracker:habit-commentary-create": ("get", _habit, None),
+    "tracker:habit-report": ("get", None, None),
+    "tracker:habit-month-report": ("get", _month, None),
+    "tracker:habit-month-report?json": ("get", _month, {"format": "json"}),
+    "tracker:data-import": ("get", None, None),
+    "tracker:data-export": ("get", None, None),
+    "tracker:search": ("get", None, {"q": "comment"}),
+    "tracker:job-list": ("get", None, None),
+    "tracker:job-create": ("post", None, {"kind": "rebuild_habit_stats"}),
+    "tracker:job-detail": ("get", lambda objects: {
+        "pk": objects["job"].pk
+    }, None),
+}
+
+
+class QueryTimer:
+    """``execute_wrapper`` that counts queries and sums their time."""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.seconds += time.perf_counter() - started
+
+
+def load_budgets() -> dict:
+    if BUDGET_FILE.exists():
+        return json.loads(BUDGET_FILE.read_text())
+    return {}
+
+
+class QueryCountRegressionTest(TestCase):
+    measurements = {}
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        if UPDATE_BUDGETS and cls.measurements:
+            budgets = load_budgets()
+            budgets.update(cls.measurements)
+            BUDGET_FILE.write_text(
+                json.dumps(budgets, indent=2, sort_keys=True) + "\n"
+            )
+
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            username="Test_user",
+            password="TestPassword123"
+        )
+        self.client.force_login(self.user)
+
+    def measure(self, name, size):
+        method, kwargs_builder, data = VIEWS[name]
+        with transaction.atomic():
+            objects = seed(self.user, size)
+            url = reverse(
+                name.split("?")[0],
+                kwargs=kwargs_builder(objects) if kwargs_builder else None
+            )
+            data = dict(data or {})
+            if name.endswith("bulk-action"):
+                data["ids"] = (
+                    [objects["stage"].pk] if "stage" in name
+                    else [objects["goal"].pk]
+                )
+            cache.clear()
+
+            timer = QueryTimer()
+            with connection.execute_wrapper(timer):
+                response = getattr(self.client, method)(url, data)
+                if response.streaming:
+                    b"".join(response.streaming_content)
+            transaction.set_rollback(True)
+
+        self.assertLess(response.status_code, 400, f"{name} failed")
+        return timer.count, timer.seconds * 1000
+
+    def check_view(self, name):
+        budgets = load_budgets()
+        results = {size: self.measure(name, size) for size in SIZES}
+        counts = {size: count for size, (count, _) in results.items()}
+        sql_ms = max(ms for _, ms in results.values())
+
+        self.assertEqual(
+            len(set(counts.values())), 1,
+            f"{name} query count grows with data: {counts}"
+        )
+        queries = counts[SIZES[-1]]
+        self.measurements[name] = {
+            "queries": queries,
+            "sql_ms": round(sql_ms, 2),
+        }
+        if UPDATE_BUDGETS:
+            return
+
+        self.assertIn(
+            name, budgets,
+            f"{name} has no budget; run with QUERY_BUDGET_UPDATE=1"
+        )
+        self.assertLessEqual(
+            queries, budgets[name]["queries"],
+            f"{name} runs {queries} queries, budget is "
+            f"{budgets[name]['queries']}"
+        )
+        self.assertLessEqual(
+            sql_ms,
+            max(
+                budgets[name]["sql_ms"] * SQL_TIME_FACTOR,
+                SQL_TIME_FLOOR_MS,
+            ),
+            f"{name} spent {sql_ms:.1f}ms in SQL"
+        )
+
+
+def _view_test(name):
+    def test(self):
+        self.check_view(name)
+    return test
+
+
+# One test per view, so that a failure names the view.
+for _name in VIEWS:
+    setattr(
+        QueryCountRegressionTest,
+        "test_" + _name.split(":")[1].replace("-", "_").replace("?", "_"),
+        _view_test(_name),
+    )
@@ -0,0 +1,121 @@
+import datetime
+import time
+
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connections
+from django.test import TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from tracker.models import Goal, Habit
+from tracker.replicas import REPLICA_STICKY_COOKIE
+
+GOAL_LIST_URL = reverse("tracker:goal-list")
+GOAL_CREATE_URL = reverse("tracker:goal-create")
+INDEX_URL = reverse("tracker:index")
+
+
+def replicate(alias="replica"):
+    """Copy every tracker row of the default database to ``alias``.
+
+    The replica only changes when this runs, so anything written after
+    it is missing there, like on a replica that lags the primary.
+    bulk_create sends no signals, so nothing is written back to the
+    primary. Expects an empty replica.
+    """
+    for model in apps.get_app_config("tracker").get_models():
+        model.objects.using(alias).bulk_create(
+            model.objects.using("default").order_by("pk")
+        )
+
+
+# "replica" is a separate database (see test_settings) that only gets
+# the rows replicate() copies, so a replica read is visible in the
+# response. TransactionTestCase because requests and the replica must
+# see what setUp wrote.
+@override_settings(REPLICA_DATABASES=["replica"], REPLICA_STICKY_SECONDS=30)
+class ReplicaRouterTest(TransactionTestCase):
+    databases = {"default", "replica"}
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            username="Test_user",
+            password="TestPassword123"
+        )
+        Goal.objects.create(
+            user=self.user, name="Test goal",
+            deadline=timezone.make_aware(datetime.datetime(2030, 1, 1))
+        )
+        Habit.objects.create(user=self.user, name="Test habit")
+        replicate()
+        # Written after the last replication: only on the primary.
+        Goal.objects.create(
+            user=self.user, name="Unreplicated goal",
+            deadline=timezone.make_aware(datetime.datetime(2030, 1, 1))
+        )
+        Habit.objects.create(user=self.user, name="Unreplicated habit")
+        self.client.force_login(self.user)
+
+    def get(self, url):
+        """Return the response and the number of queries the replica ran."""
+        with CaptureQueriesContext(connections["replica"]) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response, len(queries)
+
+    def test_list_and_index_read_from_replica(self):
+        response, replica_queries = self.get(GOAL_LIST_URL)
+        self.assertContains(response, "Test goal")
+        self.assertNotContains(response, "Unreplicated goal")
+        self.assertGreater(replica_queries, 0)
+
+        response, replica_queries = self.get(INDEX_URL)
+        self.assertContains(response, "Test habit")
+        self.assertNotContains(response, "Unreplicated habit")
+        self.assertGreater(replica_queries, 0)
+
+    def test_other_views_read_from_primary(self):
+        response, replica_queries = self.get(
+            reverse("tracker:habit-check-in")
+        )
+
+        self.assertContains(response, "Unreplicated habit")
+        self.assertEqual(replica_queries, 0)
+
+    def test_writes_go_to_primary_and_reads_stick_to_it(self):
+        with CaptureQueriesContext(connections["replica"]) as queries:
+            response = self.client.post(
+                GOAL_CREATE_URL,
+                {
+                    "name": "New goal",
+                    "description": "",
+                    "deadline": "2030-01-01",
+                    "status": "active",
+                }
+            )
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(len(queries), 0)
+        self.assertIn(REPLICA_STICKY_COOKIE, response.cookies)
+        self.assertTrue(Goal.objects.filter(name="New goal").exists())
+        self.assertFalse(
+            Goal.objects.using("replica").filter(name="New goal").exists()
+        )
+
+        # Read your writes: the lagging replica has no "New goal" yet.
+        response, replica_queries = self.get(GOAL_LIST_URL)
+        self.assertContains(response, "New goal")
+        self.assertContains(response, "Unreplicated goal")
+        self.assertEqual(replica_queries, 0)
+
+    def test_expired_window_reads_from_replica_again(self):
+        self.client.cookies[REPLICA_STICKY_COOKIE] = str(time.time() - 1)
+
+        response, replica_queries = self.get(GOAL_LIST_URL)
+
+        self.assertNotContains(response, "Unreplicated goal")
+        self.assertGreater(replica_queries, 0)
+        self.assertNotIn(REPLICA_STICKY_COOKIE, response.cookies)
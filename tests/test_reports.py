@@ -0,0 +1,164 @@
+import datetime
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from tracker.models import Habit, HabitLog, HabitMonthReport
+from tracker.reports import month_report, refresh_reports
+
+
+def log(habit, day, completed=True):
+    HabitLog.objects.upsert(
+        [HabitLog(habit=habit, log_date=day, completed=completed)]
+    )
+
+
+class MonthlyReportTest(TestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            username="Test_user",
+            password="TestPassword123"
+        )
+        self.habit = Habit.objects.create(
+            user=self.user, name="Test_habit", month_goal="Run 20 days"
+        )
+        Habit.objects.filter(pk=self.habit.pk).update(
+            created_at=timezone.make_aware(datetime.datetime(2023, 1, 1))
+        )
+        self.habit.refresh_from_db()
+        self.march = datetime.date(2023, 3, 1)
+        self.client.force_login(self.user)
+
+    def rollup(self):
+        output = StringIO()
+        call_command("rollup_habit_months", stdout=output)
+        return output.getvalue()
+
+    def test_logs_mark_only_their_months_dirty(self):
+        log(self.habit, datetime.date(2023, 3, 5))
+        log(self.habit, datetime.date(2023, 3, 6), completed=False)
+        log(self.habit, datetime.date(2023, 4, 1))
+        self.rollup()
+
+        log(self.habit, datetime.date(2023, 3, 7))
+
+        dirty = HabitMonthReport.objects.filter(dirty=True)
+        self.assertEqual(
+            list(dirty.values_list("month", flat=True)), [self.march]
+        )
+        self.assertIn("Updated 1 monthly reports", self.rollup())
+        report = HabitMonthReport.objects.get(month=self.march)
+        self.assertEqual(
+            (report.completed_days, report.missed_days, report.ignored_days),
+            (2, 1, 28),
+        )
+        self.assertEqual(report.computed_through, datetime.date(2023, 3, 31))
+
+    def test_deleted_log_is_rolled_up(self):
+        log(self.habit, datetime.date(2023, 3, 5))
+        self.rollup()
+
+        HabitLog.objects.get(log_date=datetime.date(2023, 3, 5)).delete()
+        self.rollup()
+
+        report = HabitMonthReport.objects.get(month=self.march)
+        self.assertEqual((report.completed_days, report.ignored_days), (0, 31))
+
+    def test_concurrent_change_keeps_row_dirty(self):
+        log(self.habit, datetime.date(2023, 3, 5))
+        stale = HabitMonthReport.objects.get(month=self.march)
+
+        log(self.habit, datetime.date(2023, 3, 6))
+        refresh_reports([stale])
+
+        self.assertTrue(HabitMonthReport.objects.get(month=self.march).dirty)
+
+    def test_all_rebuilds_reports_from_bitmaps(self):
+        log(self.habit, datetime.date(2023, 3, 5))
+        log(self.habit, datetime.date(2023, 5, 5), completed=False)
+        HabitMonthReport.objects.all().delete()
+
+        call_command("rollup_habit_months", "--all", stdout=StringIO())
+
+        self.assertEqual(
+            dict(
+                HabitMonthReport.objects.values_list("month", "missed_days")
+            ),
+            {self.march: 0, datetime.date(2023, 5, 1): 1},
+        )
+
+    def test_report_counts_unlogged_months_as_ignored(self):
+        rows = month_report(
+            self.user, datetime.date(2023, 2, 1), datetime.date(2023, 6, 1)
+        )
+
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(
+            (rows[0]["days"], rows[0]["ignored"], rows[0]["target"]),
+            (28, 28, 20),
+        )
+
+    def test_json_report(self):
+        for day in range(1, 11):
+            log(self.habit, datetime.date(2023, 3, day), completed=day > 2)
+
+        response = self.client.get(
+            reverse(
+                "tracker:habit-month-report",
+                kwargs={"year": 2023, "month": 3},
+            ),
+            {"format": "json"},
+        )
+
+        self.assertEqual(response.json()["month"], "2023-03")
+        row = response.json()["habits"][0]
+        self.assertEqual(
+            (row["completed"], row["missed"], row["ignored"]), (8, 2, 21)
+        )
+        self.assertEqual(row["target_percent"], 40)
+        self.assertFalse(HabitMonthReport.objects.filter(dirty=True))
+
+    def test_report_of_the_first_and_last_month(self):
+        for year, month in [(1, 1), (9999, 12)]:
+            response = self.client.get(
+                reverse(
+                    "tracker:habit-month-report",
+                    kwargs={"year": year, "month": month},
+                )
+            )
+
+            self.assertEqual(response.status_code, 200)
+            self.assertIsNone(
+                response.context[
+                    "previous_month" if year == 1 else "next_month"
+                ]
+            )
+
+    def test_report_queries_do_not_grow_with_history(self):
+        url = reverse(
+            "tracker:habit-month-report", kwargs={"year": 2023, "month": 3}
+        )
+        log(self.habit, datetime.date(2023, 3, 1))
+        self.client.get(url)
+
+        with self.assertNumQueries(5):
+            response = self.client.get(url)
+        self.assertContains(response, "March 2023")
+
+        HabitLog.objects.upsert([
+            HabitLog(
+                habit=self.habit,
+                log_date=datetime.date(2023, 1, 1)
+                + datetime.timedelta(days=day),
+                completed=True,
+            )
+            for day in range(300)
+        ])
+        call_command("rollup_habit_months", stdout=StringIO())
+
+        with self.assertNumQueries(5):
+            self.client.get(url)
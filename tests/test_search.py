@@ -0,0 +1,152 @@
+import datetime
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from tracker import search
+from tracker.models import Commentary, Goal, Habit, SearchDocument
+
+SEARCH_URL = reverse("tracker:search")
+
+
+class FullTextSearchTest(TestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            username="Test_user",
+            password="TestPassword123"
+        )
+        deadline = timezone.make_aware(datetime.datetime(2023, 3, 4))
+        self.marathon = Goal.objects.create(
+            user=self.user,
+            name="Run a marathon",
+            description="Build up to 42 km",
+            deadline=deadline
+        )
+        self.swimming = Goal.objects.create(
+            user=self.user,
+            name="Learn swimming",
+            description="Maybe run afterwards",
+            deadline=deadline
+        )
+        self.habit = Habit.objects.create(
+            user=self.user,
+            name="Stretching",
+            month_goal="Stretch before every run"
+        )
+        self.commentary = Commentary.objects.create(
+            user=self.user, text="The long run went well"
+        )
+        self.commentary.goals.add(self.marathon)
+        self.client.force_login(self.user)
+
+    def test_search_ranks_title_matches_first(self):
+        ids = search.search_ids(self.user.pk, "run", "goal")
+
+        self.assertEqual(ids, [self.marathon.pk, self.swimming.pk])
+
+    def test_search_covers_descriptions_and_prefixes(self):
+        self.assertEqual(
+            search.search_ids(self.user.pk, "stret", "habit"),
+            [self.habit.pk]
+        )
+        self.assertEqual(
+            search.search_ids(self.user.pk, "before every", "habit"),
+            [self.habit.pk]
+        )
+        self.assertEqual(
+            search.search_ids(self.user.pk, "long run", "commentary"),
+            [self.commentary.pk]
+        )
+
+    def test_index_follows_updates_and_deletes(self):
+        self.swimming.name = "Learn diving"
+        self.swimming.description = ""
+        self.swimming.save()
+        self.marathon.delete()
+
+        self.assertEqual(search.search_ids(self.user.pk, "run", "goal"), [])
+        self.assertEqual(
+            search.search_ids(self.user.pk, "diving", "goal"),
+            [self.swimming.pk]
+        )
+
+    def test_search_is_scoped_to_user(self):
+        other = get_user_model().objects.create_user(username="Other_user")
+
+        self.assertEqual(search.search(other.pk, "run"), [])
+
+    def test_list_views_use_ranked_search(self):
+        goals = self.client.get(reverse("tracker:goal-list"), {"name": "run"})
+        habits = self.client.get(
+            reverse("tracker:habit-list"), {"name": "stretch"}
+        )
+
+        self.assertEqual(
+            list(goals.context["goal_list"]), [self.marathon, self.swimming]
+        )
+        self.assertEqual(list(habits.context["habit_list"]), [self.habit])
+
+    def test_list_search_is_not_cut_at_the_default_limit(self):
+        Habit.objects.bulk_create([
+            Habit(user=self.user, name=f"Stretch {number}")
+            for number in range(search.DEFAULT_LIMIT + 5)
+        ])
+        search.reindex_user(self.user.pk)
+
+        response = self.client.get(
+            reverse("tracker:habit-list"), {"name": "stretch"}
+        )
+
+        self.assertEqual(
+            response.context["paginator"].count, search.DEFAULT_LIMIT + 6
+        )
+
+    def test_list_search_query_does_not_grow_with_matches(self):
+        def list_queries(count):
+            Habit.objects.bulk_create([
+                Habit(user=self.user, name=f"Stretch {number}")
+                for number in range(count)
+            ])
+            search.reindex_user(self.user.pk)
+            cache.clear()
+            with CaptureQueriesContext(connection) as queries:
+                self.client.get(
+                    reverse("tracker:habit-list"), {"name": "stretch"}
+                )
+            return [query["sql"] for query in queries]
+
+        few = list_queries(10)
+        many = list_queries(200)
+
+        self.assertEqual(len(many), len(few))
+        # The session and user lookups carry the current time.
+        for many_sql, few_sql in zip(many[2:], few[2:]):
+            self.assertEqual(many_sql, few_sql)
+        self.assertNotIn("CASE", " ".join(many))
+
+    def test_unified_search_page(self):
+        response = self.client.get(SEARCH_URL, {"q": "run"})
+
+        self.assertEqual(
+            [entity for entity, _ in response.context["results"]].count(
+                "goal"
+            ),
+            2
+        )
+        self.assertContains(response, "The long run went well")
+        self.assertContains(response, "Stretching")
+
+    def test_rebuild_command(self):
+        SearchDocument.objects.all().delete()
+
+        call_command("rebuild_search_index", stdout=StringIO())
+
+        self.assertEqual(SearchDocument.objects.count(), 4)
+        self.assertEqual(len(search.search(self.user.pk, "run")), 4)
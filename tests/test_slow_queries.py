@@ -0,0 +1,88 @@
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from tracker.models import Goal, Habit, SlowQuery
+from tracker.slow_queries import (
+    capture_slow_queries,
+    fingerprint,
+    normalize_sql,
+)
+
+
+class SlowQueryRecorderTest(TestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            username="Test_user",
+            password="TestPassword123"
+        )
+        self.habit = Habit.objects.create(user=self.user, name="Test_habit")
+
+    def test_literals_and_lists_share_a_fingerprint(self):
+        self.assertEqual(
+            normalize_sql("SELECT * FROM t WHERE a IN (1, 2) AND b = 'x'"),
+            "SELECT * FROM t WHERE a IN (...) AND b = ?",
+        )
+        self.assertEqual(
+            fingerprint("SELECT * FROM t WHERE id IN (%s, %s)"),
+            fingerprint("SELECT  *  FROM t WHERE id IN (7, 8, 9)"),
+        )
+
+    def test_repeats_are_deduplicated_with_plan(self):
+        for pk in (self.habit.pk, self.habit.pk + 1):
+            with capture_slow_queries("tracker:habit-detail", threshold_ms=0):
+                list(Habit.objects.filter(pk=pk))
+
+        record = SlowQuery.objects.get(sql__contains='FROM "tracker_habit"')
+        self.assertEqual(record.count, 2)
+        self.assertEqual(record.view_name, "tracker:habit-detail")
+        self.assertIn("tracker_habit", record.plan)
+        self.assertTrue(record.params.startswith("["))
+        self.assertGreaterEqual(record.max_ms, record.average_ms)
+
+    def test_fast_queries_are_ignored(self):
+        with capture_slow_queries("tracker:index", threshold_ms=10_000):
+            list(Goal.objects.all())
+
+        self.assertFalse(SlowQuery.objects.exists())
+
+    def test_statements_without_plan_are_still_recorded(self):
+        with capture_slow_queries("tracker:index", threshold_ms=0):
+            Goal.objects.filter(user=self.user).delete()
+
+        self.assertTrue(SlowQuery.objects.exists())
+        self.assertFalse(
+            SlowQuery.objects.filter(plan="", sql__startswith="SELECT")
+        )
+
+    @override_settings(SLOW_QUERY_THRESHOLD_MS=0)
+    def test_middleware_labels_queries_with_url_name(self):
+        client = Client()
+        client.force_login(self.user)
+
+        client.get(reverse("tracker:habit-detail", args=[self.habit.pk]))
+
+        self.assertIn(
+            "tracker:habit-detail",
+            SlowQuery.objects.values_list("view_name", flat=True),
+        )
+
+    def test_admin_lists_slow_queries(self):
+        with capture_slow_queries("tracker:goal-list", threshold_ms=0):
+            list(Goal.objects.all())
+        admin = get_user_model().objects.create_superuser(
+            username="Admin_user",
+            password="TestPassword123"
+        )
+        self.client.force_login(admin)
+        record = SlowQuery.objects.first()
+
+        changelist = self.client.get(
+            reverse("admin:tracker_slowquery_changelist")
+        )
+        change = self.client.get(
+            reverse("admin:tracker_slowquery_change", args=[record.pk])
+        )
+
+        self.assertContains(changelist, "tracker:goal-list")
+        self.assertContains(change, record.fingerprint)
@@ -10,6 +10,7 @@ from tracker.models import (
     Goal,
     GoalStage,
     Habit,
+    HabitLog,
     Commentary,
     User)
 from tracker.views import GoalListView, HabitListView
@@ -179,6 +180,55 @@ class TestGoalAndGoalStageToggleStatus(TestCase):
         self.goal_stage.refresh_from_db()
         self.assertEqual(self.goal_stage.status, "abandoned")
 
+    def test_toggle_returns_new_state_as_json(self):
+        self.client.login(username="Test_user", password="Test_pass")
+        url = reverse(
+            "tracker:goal-update-stage-status",
+            args=[self.goal.pk, self.goal_stage.pk]
+        )
+
+        first = self.client.post(url, HTTP_ACCEPT="application/json")
+        second = self.client.post(url, HTTP_ACCEPT="application/json")
+
+        self.assertEqual(
+            first.json(), {"id": self.goal_stage.pk, "status": "completed"}
+        )
+        self.assertEqual(second.json()["status"], "active")
+
+    def test_toggle_is_one_update_scoped_to_owner(self):
+        User.objects.create_user(
+            username="Other_user", password="Other_pass"
+        )
+        self.client.login(username="Other_user", password="Other_pass")
+        url = reverse("tracker:goal-update-status", args=[self.goal.pk])
+
+        response = self.client.post(url)
+
+        self.assertEqual(response.status_code, 404)
+        self.goal.refresh_from_db()
+        self.assertEqual(self.goal.status, "active")
+
+    def test_toggle_requires_post(self):
+        self.client.login(username="Test_user", password="Test_pass")
+
+        response = self.client.get(
+            reverse("tracker:goal-update-status", args=[self.goal.pk])
+        )
+
+        self.assertEqual(response.status_code, 405)
+
+    def test_toggle_refreshes_dashboard_counts(self):
+        self.client.login(username="Test_user", password="Test_pass")
+        self.client.get(reverse("tracker:index"))
+
+        self.client.post(
+            reverse("tracker:goal-update-status", args=[self.goal.pk])
+        )
+        response = self.client.get(reverse("tracker:index"))
+
+        self.assertEqual(response.context["completed_goals_number"], 1)
+        self.assertEqual(response.context["active_goals_number"], 0)
+
 
 class PublicHabitListViews(TestCase):
     def test_login_required(self):
@@ -332,6 +382,88 @@ class HabitDetailViewTestCase(TestCase):
         self.assertContains(response, "Test Habit")
         self.assertContains(response, "This is a test habit")
 
+    def test_log_today_is_upserted(self):
+        self.client.login(username="Test_user", password="Test_pass")
+
+        self.client.post(self.url, {"completed": "False"})
+        self.client.post(self.url, {"completed": "True"})
+
+        log = HabitLog.objects.get(habit=self.habit)
+        self.assertTrue(log.completed)
+        self.assertEqual(log.log_date, timezone.localdate())
+        self.assertEqual(self.habit.stats.completed_count, 1)
+        self.assertEqual(self.habit.stats.missed_count, 0)
+
+    def test_log_form_hidden_once_logged_today(self):
+        self.client.login(username="Test_user", password="Test_pass")
+
+        response = self.client.get(self.url)
+        self.assertFalse(response.context["logged_today"])
+
+        self.client.post(self.url, {"completed": "True"})
+        response = self.client.get(self.url)
+
+        self.assertTrue(response.context["logged_today"])
+        self.assertNotContains(response, "Have you completed the habit today?")
+
+
+class HabitCheckInViewTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="Test_user",
+            password="Test_pass"
+        )
+        self.habits = [
+            Habit.objects.create(name=f"Habit {number}", user=self.user)
+            for number in range(3)
+        ]
+        self.url = reverse("tracker:habit-check-in")
+        self.client.login(username="Test_user", password="Test_pass")
+
+    def test_logs_answered_habits_in_one_request(self):
+        first, second, skipped = self.habits
+
+        response = self.client.post(self.url, {
+            f"habit_{first.pk}": "True",
+            f"habit_{second.pk}": "False",
+            f"habit_{skipped.pk}": "",
+        })
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [(log.habit, log.completed) for log in response.context["logged"]],
+            [(first, True), (second, False)]
+        )
+        self.assertEqual(
+            dict(HabitLog.objects.values_list("habit_id", "log_date")),
+            {
+                first.pk: timezone.localdate(),
+                second.pk: timezone.localdate(),
+            }
+        )
+        self.assertEqual(second.stats.missed_count, 1)
+
+    def test_form_shows_todays_answers_and_updates_them(self):
+        first = self.habits[0]
+        self.client.post(self.url, {f"habit_{first.pk}": "False"})
+
+        response = self.client.get(self.url)
+        self.assertIs(
+            response.context["form"].initial[f"habit_{first.pk}"], False
+        )
+
+        self.client.post(self.url, {f"habit_{first.pk}": "True"})
+
+        self.assertTrue(HabitLog.objects.get(habit=first).completed)
+
+    def test_only_own_habits_are_offered(self):
+        other = User.objects.create_user(username="Other_user")
+        other_habit = Habit.objects.create(name="Other", user=other)
+
+        self.client.post(self.url, {f"habit_{other_habit.pk}": "True"})
+
+        self.assertFalse(HabitLog.objects.exists())
+
 
 class IndexViewTestCase(TestCase):
 
@@ -1,7 +1,7 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
 
-from tracker.models import Habit, Goal, User, GoalStage
+from tracker.models import Habit, Goal, User, GoalStage, SlowQuery, Job
 
 
 class GoalStageInline(admin.TabularInline):
@@ -31,3 +31,34 @@ class User(UserAdmin):
 class HabitAdmin(admin.ModelAdmin):
     list_display = ["name", "description", "month_goal", "created_at", "user"]
     list_filter = ["user", "created_at"]
+
+
+@admin.register(SlowQuery)
+class SlowQueryAdmin(admin.ModelAdmin):
+    list_display = [
+        "normalized_sql", "view_name", "count", "max_ms", "average_ms",
+        "last_seen"
+    ]
+    list_filter = ["view_name", "last_seen"]
+    search_fields = ["normalized_sql", "view_name"]
+    readonly_fields = [
+        "fingerprint", "normalized_sql", "sql", "params", "view_name",
+        "plan", "count", "total_ms", "max_ms", "first_seen", "last_seen"
+    ]
+
+    @admin.display(description="Average ms")
+    def average_ms(self, obj):
+        return round(obj.average_ms, 2)
+
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = [
+        "kind", "status", "user", "attempts", "run_after", "locked_by",
+        "created_at", "finished_at"
+    ]
+    list_filter = ["status", "kind"]
+    readonly_fields = ["locked_by", "locked_at", "result", "error"]
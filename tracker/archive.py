@@ -0,0 +1,68 @@
+"""Archival of old ``HabitLog`` rows into the year bitmaps.
+
+A habit's ``HabitYearBitmap`` rows already hold every logged day and
+its outcome, so a log older than the archive horizon carries nothing the
+bitmaps do not. ``archive_logs`` folds such logs into the bitmaps again
+(which also repairs any drift), moves the bitmaps' ``archived_through``
+forward and deletes the logs, ``batch_size`` logs per transaction so
+locks stay short and the work can be interrupted at any point.
+
+Readers that need every logged day use ``HabitLog.objects.history``,
+which merges the archived days with the live rows; stats, the calendar
+and monthly reports read the bitmaps and see no difference.
+"""
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from tracker.models import HabitLog, HabitYearBitmap
+
+HABIT_LOG_ARCHIVE_DAYS = getattr(settings, "HABIT_LOG_ARCHIVE_DAYS", 730)
+ARCHIVE_BATCH_SIZE = getattr(settings, "HABIT_LOG_ARCHIVE_BATCH_SIZE", 5000)
+
+
+def archive_horizon(today: date = None,
+                    days: int = HABIT_LOG_ARCHIVE_DAYS) -> date:
+    """Logs dated before this day are archived."""
+    return (today or timezone.localdate()) - timedelta(days=days)
+
+
+def archive_batch(before: date, batch_size: int, habit_ids=None) -> dict:
+    """Archive up to ``batch_size`` logs dated before ``before`` in one
+    transaction; returns ``{habit_id: archived logs}``."""
+    logs = HabitLog.objects.filter(log_date__lt=before)
+    if habit_ids is not None:
+        logs = logs.filter(habit_id__in=habit_ids)
+
+    with transaction.atomic():
+        rows = list(
+            logs.select_for_update().order_by("habit_id", "log_date")
+            .values_list("pk", "habit_id", "log_date", "completed")
+            [:batch_size]
+        )
+        entries = {}
+        for _, habit_id, log_date, completed in rows:
+            entries.setdefault(habit_id, []).append((log_date, completed))
+        if not entries:
+            return {}
+
+        for habit_id, days in entries.items():
+            HabitYearBitmap.record_logs(habit_id, days, archived=True)
+        HabitLog.objects.filter(pk__in=[row[0] for row in rows]).delete()
+    return {habit_id: len(days) for habit_id, days in entries.items()}
+
+
+def archive_logs(before: date = None, batch_size: int = ARCHIVE_BATCH_SIZE,
+                 habit_ids=None) -> dict:
+    """Archive every log dated before ``before`` (default: the archive
+    horizon), batch by batch; returns ``{habit_id: archived logs}``."""
+    before = before or archive_horizon()
+    archived = {}
+    while True:
+        batch = archive_batch(before, batch_size, habit_ids)
+        if not batch:
+            return archived
+        for habit_id, count in batch.items():
+            archived[habit_id] = archived.get(habit_id, 0) + count
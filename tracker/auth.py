@@ -0,0 +1,38 @@
+"""Authentication backend that serves ``request.user`` from the cache.
+
+``AuthenticationMiddleware`` loads the logged-in user on every request.
+``CachedModelBackend`` keeps the loaded ``User`` in the cache for
+``USER_CACHE_TIMEOUT`` seconds; together with the ``cached_db`` session
+engine a warm request then needs neither the session nor the user
+query. Enable both with ``CACHED_AUTH=True``.
+
+Every save or delete of a user drops its entry (``tracker.signals``), so
+deactivating or editing a user takes effect on the next request, as
+long as all processes share the cache backend. Queryset ``update()``
+calls send no signals; call ``invalidate_cached_user`` after them.
+"""
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
+USER_CACHE_TIMEOUT = getattr(settings, "USER_CACHE_TIMEOUT", 60)
+
+
+def _user_key(user_id) -> str:
+    return f"auth:user:{user_id}"
+
+
+def invalidate_cached_user(user_id) -> None:
+    cache.delete(_user_key(user_id))
+
+
+class CachedModelBackend(ModelBackend):
+    def get_user(self, user_id):
+        key = _user_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            user = super().get_user(user_id)
+            if user is None:
+                return None
+            cache.set(key, user, USER_CACHE_TIMEOUT)
+        return user if self.user_can_authenticate(user) else None
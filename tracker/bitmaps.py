@@ -0,0 +1,104 @@
+"""Helpers for per-year day bitmaps.
+
+Day ``n`` of a year (0 for January 1st) is bit ``n % 8`` of byte
+``n // 8``, so a bitmap read as a little-endian integer has that day at
+bit ``n``. 366 bits fit in 46 bytes.
+"""
+import calendar
+from datetime import date, timedelta
+
+YEAR_BITS = 366
+YEAR_BYTES = (YEAR_BITS + 7) // 8
+
+
+def empty_bitmap() -> bytes:
+    return bytes(YEAR_BYTES)
+
+
+def days_in_year(year: int) -> int:
+    return 366 if calendar.isleap(year) else 365
+
+
+def day_index(day: date) -> int:
+    return day.timetuple().tm_yday - 1
+
+
+def index_date(year: int, index: int) -> date:
+    return date(year, 1, 1) + timedelta(days=index)
+
+
+def to_int(bitmap: bytes) -> int:
+    return int.from_bytes(bytes(bitmap), "little")
+
+
+def from_int(value: int) -> bytes:
+    return value.to_bytes(YEAR_BYTES, "little")
+
+
+def set_bit(bitmap: bytes, index: int, value: bool) -> bytes:
+    bits = to_int(bitmap)
+    if value:
+        bits |= 1 << index
+    else:
+        bits &= ~(1 << index)
+    return from_int(bits)
+
+
+def range_mask(first: int, last: int) -> int:
+    """Mask with bits ``first`` to ``last`` (inclusive) set."""
+    if last < first:
+        return 0
+    return ((1 << (last - first + 1)) - 1) << first
+
+
+def popcount(bits: int) -> int:
+    return bin(bits).count("1")
+
+
+def longest_run(bits: int) -> int:
+    """Length of the longest run of set bits.
+
+    Each ``bits & (bits >> 1)`` shortens every run by one, so the number
+    of rounds until nothing is left is the longest run.
+    """
+    rounds = 0
+    while bits:
+        bits &= bits >> 1
+        rounds += 1
+    return rounds
+
+
+def run_ending_at(bits: int, index: int) -> int:
+    """Length of the run of set bits that ends at ``index``."""
+    gaps = ~bits & range_mask(0, index)
+    if not gaps:
+        return index + 1
+    return index - (gaps.bit_length() - 1)
+
+
+def iter_days(year: int, completed: bytes, logged: bytes, last: int):
+    """Yield ``(day, completed)`` for the logged days up to ``last``."""
+    logged_bits = to_int(logged) & range_mask(0, last)
+    completed_bits = to_int(completed)
+    while logged_bits:
+        index = (logged_bits & -logged_bits).bit_length() - 1
+        yield index_date(year, index), bool(completed_bits >> index & 1)
+        logged_bits &= logged_bits - 1
+
+
+def summarize(completed: bytes, logged: bytes, first: int, last: int) -> dict:
+    """Totals for days ``first`` to ``last`` of one year's bitmaps."""
+    mask = range_mask(first, last)
+    completed_bits = to_int(completed) & mask
+    logged_bits = to_int(logged) & mask
+    completed_days = popcount(completed_bits)
+    logged_days = popcount(logged_bits)
+    return {
+        "completed": completed_days,
+        "missed": logged_days - completed_days,
+        "ignored": max(last - first + 1, 0) - logged_days,
+        "longest_streak": longest_run(completed_bits),
+        "streak_at_end": (
+            run_ending_at(completed_bits, last) if last >= first else 0
+        ),
+    }
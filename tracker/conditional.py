@@ -0,0 +1,78 @@
+"""ETag and Last-Modified validators for the goal and habit detail pages.
+
+``updated_at`` on a goal or habit is rolled up from its stages, logs and
+comments by ``tracker.signals``, so the page version is one primary-key
+lookup of a single column. The ``condition`` decorator calls both
+validators; the row is fetched once per request.
+
+The pages embed the CSRF token, which changes when the user logs in
+again. So the ETag also hashes the session key, which login cycles,
+and Last-Modified is never older than the user's last login: a page
+cached by a previous session is never revalidated.
+"""
+import hashlib
+from datetime import datetime, time
+
+from django.utils import timezone
+
+from tracker.models import Goal, Habit
+
+
+def _updated_at(request, model, pk):
+    cache = request.__dict__.setdefault("_tracker_updated_at", {})
+    key = (model, pk)
+    if key not in cache:
+        cache[key] = model.objects.filter(pk=pk).values_list(
+            "updated_at", flat=True
+        ).first()
+    return cache[key]
+
+
+def _session_hash(request) -> str:
+    session_key = request.session.session_key or ""
+    return hashlib.md5(session_key.encode()).hexdigest()[:12]
+
+
+def _etag(request, updated_at, *extra):
+    if updated_at is None:
+        return None
+    parts = [
+        request.user.pk, _session_hash(request), updated_at.timestamp(),
+        *extra
+    ]
+    return "-".join(str(part) for part in parts)
+
+
+def _last_modified(request, updated_at, *floors):
+    if updated_at is None:
+        return None
+    last_login = request.user.last_login
+    return max(
+        updated_at, *floors, *([last_login] if last_login else [])
+    )
+
+
+def goal_last_modified(request, pk):
+    return _last_modified(request, _updated_at(request, Goal, pk))
+
+
+def goal_etag(request, pk):
+    return _etag(request, _updated_at(request, Goal, pk))
+
+
+def habit_last_modified(request, pk):
+    """The habit page also changes at midnight (streaks, today's form)."""
+    midnight = timezone.make_aware(
+        datetime.combine(timezone.localdate(), time.min)
+    )
+    return _last_modified(
+        request, _updated_at(request, Habit, pk), midnight
+    )
+
+
+def habit_etag(request, pk):
+    return _etag(
+        request,
+        _updated_at(request, Habit, pk),
+        timezone.localdate().isoformat(),
+    )
@@ -0,0 +1,159 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Q
+
+from tracker.models import Goal, Habit
+
+GOAL_STATUSES = [status for status, _ in Goal.STATUS_CHOICES]
+
+DASHBOARD_CACHE_TIMEOUT = getattr(settings, "DASHBOARD_CACHE_TIMEOUT", 300)
+DASHBOARD_LOCK_TIMEOUT = getattr(settings, "DASHBOARD_LOCK_TIMEOUT", 10)
+DASHBOARD_LOCK_WAIT = 0.05
+DASHBOARD_LOCK_RETRIES = 10
+
+
+def _generation_key(user_id: int) -> str:
+    return f"dashboard:generation:{user_id}"
+
+
+def _generation(user_id: int) -> int:
+    key = _generation_key(user_id)
+    generation = cache.get(key)
+    if generation is None:
+        # From the clock, so a generation lost to eviction is not reused.
+        generation = time.time_ns()
+        if not cache.add(key, generation, None):
+            generation = cache.get(key, generation)
+    return generation
+
+
+def _counts_key(user_id: int) -> str:
+    return f"dashboard:counts:{user_id}:{_generation(user_id)}"
+
+
+def _lock_key(user_id: int) -> str:
+    return f"dashboard:counts:{user_id}:lock"
+
+
+def compute_dashboard_counts(user_id: int) -> dict:
+    """Goal counts per status and habit count, straight from the database.
+
+    All goal statuses come from one conditional aggregation; the habit
+    count is a second plain COUNT.
+    """
+    aggregates = {
+        status: Count("id", filter=Q(status=status))
+        for status in GOAL_STATUSES
+    }
+    counts = Goal.objects.filter(user_id=user_id).aggregate(
+        total=Count("id"), **aggregates
+    )
+    counts["habits"] = Habit.objects.filter(user_id=user_id).count()
+    return counts
+
+
+def get_dashboard_counts(user_id: int) -> dict:
+    """Return the cached dashboard counters for a user.
+
+    On a miss only one caller recomputes the counters: the others wait
+    briefly for the value to appear instead of all hitting the database
+    at once. If the recomputing caller dies, the lock expires after
+    ``DASHBOARD_LOCK_TIMEOUT`` seconds.
+
+    The entry is stored under the generation read before computing, so
+    a value computed before an invalidation lands under a key nobody
+    reads any more.
+    """
+    key = _counts_key(user_id)
+    counts = cache.get(key)
+    if counts is not None:
+        return counts
+
+    lock_key = _lock_key(user_id)
+    if not cache.add(lock_key, 1, DASHBOARD_LOCK_TIMEOUT):
+        for _ in range(DASHBOARD_LOCK_RETRIES):
+            time.sleep(DASHBOARD_LOCK_WAIT)
+            counts = cache.get(key)
+            if counts is not None:
+                return counts
+        return compute_dashboard_counts(user_id)
+
+    try:
+        counts = compute_dashboard_counts(user_id)
+        cache.set(key, counts, DASHBOARD_CACHE_TIMEOUT)
+    finally:
+        cache.delete(lock_key)
+    return counts
+
+
+def adjust_dashboard_counts(user_id: int, **deltas: int) -> None:
+    """Apply counter deltas to the cached entry once the current
+    transaction commits; see ``apply_dashboard_deltas``."""
+    transaction.on_commit(lambda: apply_dashboard_deltas(user_id, deltas))
+
+
+def apply_dashboard_deltas(user_id: int, deltas: dict) -> None:
+    """Apply counter deltas to a cached entry, if there is one.
+
+    A missing entry is left alone: the next read rebuilds it from the
+    database. The read-modify-write holds the recompute lock, so a
+    concurrent update cannot be lost; when the lock is taken, or a
+    counter would go negative, the entry is dropped instead.
+    """
+    key = _counts_key(user_id)
+    lock_key = _lock_key(user_id)
+    if not cache.add(lock_key, 1, DASHBOARD_LOCK_TIMEOUT):
+        invalidate_dashboard_counts(user_id)
+        return
+
+    try:
+        counts = cache.get(key)
+        if counts is None:
+            return
+        for field, delta in deltas.items():
+            counts[field] = counts.get(field, 0) + delta
+            if counts[field] < 0:
+                invalidate_dashboard_counts(user_id)
+                return
+        cache.set(key, counts, DASHBOARD_CACHE_TIMEOUT)
+    finally:
+        cache.delete(lock_key)
+
+
+def invalidate_dashboard_counts(user_id: int) -> None:
+    """Start a new generation, also discarding values still being
+    computed for the current one."""
+    key = _counts_key(user_id)
+    try:
+        cache.incr(_generation_key(user_id))
+    except ValueError:
+        cache.set(_generation_key(user_id), time.time_ns(), None)
+    cache.delete(key)
+
+
+def dashboard_context(counts: dict) -> dict:
+    """Build the ``index.html`` context from the raw counters."""
+    goals_number = {
+        f"{status}_goals_number": counts[status]
+        for status in GOAL_STATUSES
+    }
+    total_goals_number = counts["total"]
+
+    if total_goals_number == 0:
+        total_goals_number = float("inf")
+
+    goals_percent = {
+        f"{field_name.split('_number')[0]}_percent":
+            round(goal_number / total_goals_number * 100, 1)
+        for field_name, goal_number in goals_number.items()
+    }
+
+    return {
+        **goals_number,
+        **goals_percent,
+        "habits_number": counts["habits"],
+        "total_goals_number": total_goals_number,
+    }
@@ -0,0 +1,158 @@
+"""Streaming export of everything a user owns.
+
+Records use the same ``type`` and field names as ``tracker.importers``,
+plus ``commentary`` records that the importer does not read back.
+Every queryset is consumed with ``iterator(chunk_size=...)``, and
+commentary links are prefetched one chunk at a time, so memory use stays
+flat however many logs an account has. Archived logs (see
+``tracker.archive``) are read back from the year bitmaps and exported
+before the live ones.
+"""
+import csv
+import json
+
+from django.db.models import Prefetch
+
+from tracker import bitmaps
+from tracker.importers import CSV_COLUMNS
+from tracker.models import (
+    Commentary,
+    Goal,
+    GoalStage,
+    Habit,
+    HabitLog,
+    HabitYearBitmap,
+)
+
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_COLUMNS = CSV_COLUMNS + ["text", "created_at"]
+LINK_SEPARATOR = "; "
+
+
+def _iso(value):
+    return value.isoformat() if value else ""
+
+
+def iter_records(user, chunk_size=EXPORT_CHUNK_SIZE):
+    """Yield the user's data as importer-style record dicts."""
+    goals = Goal.objects.filter(user=user).order_by("pk").values_list(
+        "name", "description", "deadline", "status", "created_at"
+    )
+    for name, description, deadline, status, created_at in goals.iterator(
+        chunk_size=chunk_size
+    ):
+        yield {
+            "type": "goal",
+            "name": name,
+            "description": description or "",
+            "deadline": _iso(deadline),
+            "status": status,
+            "created_at": _iso(created_at),
+        }
+
+    stages = GoalStage.objects.filter(goal__user=user).order_by(
+        "goal_id", "pk"
+    ).values_list(
+        "goal__name", "stage_name", "description", "deadline", "status",
+        "created_at",
+    )
+    for (
+        goal, name, description, deadline, status, created_at
+    ) in stages.iterator(chunk_size=chunk_size):
+        yield {
+            "type": "stage",
+            "goal": goal,
+            "name": name,
+            "description": description or "",
+            "deadline": _iso(deadline),
+            "status": status,
+            "created_at": _iso(created_at),
+        }
+
+    habits = Habit.objects.filter(user=user).order_by("pk").values_list(
+        "name", "description", "month_goal", "created_at"
+    )
+    for name, description, month_goal, created_at in habits.iterator(
+        chunk_size=chunk_size
+    ):
+        yield {
+            "type": "habit",
+            "name": name,
+            "description": description or "",
+            "month_goal": month_goal or "",
+            "created_at": _iso(created_at),
+        }
+
+    archived = HabitYearBitmap.objects.filter(
+        habit__user=user, archived_through__isnull=False
+    ).order_by("habit_id", "year").values_list(
+        "habit__name", "year", "completed", "logged", "archived_through"
+    )
+    for habit, year, completed, logged, archived_through in archived.iterator(
+        chunk_size=chunk_size
+    ):
+        for log_date, day_completed in bitmaps.iter_days(
+            year, completed, logged, bitmaps.day_index(archived_through)
+        ):
+            yield {
+                "type": "log",
+                "habit": habit,
+                "date": log_date.isoformat(),
+                "completed": day_completed,
+            }
+
+    logs = HabitLog.objects.filter(habit__user=user).order_by(
+        "habit_id", "log_date"
+    ).values_list("habit__name", "log_date", "completed")
+    for habit, log_date, completed in logs.iterator(chunk_size=chunk_size):
+        yield {
+            "type": "log",
+            "habit": habit,
+            "date": log_date.isoformat(),
+            "completed": completed,
+        }
+
+    commentaries = Commentary.objects.filter(user=user).order_by(
+        "pk"
+    ).prefetch_related(
+        Prefetch("goals", queryset=Goal.objects.only("name")),
+        Prefetch("habits", queryset=Habit.objects.only("name")),
+    )
+    for commentary in commentaries.iterator(chunk_size=chunk_size):
+        yield {
+            "type": "commentary",
+            "goal": [goal.name for goal in commentary.goals.all()],
+            "habit": [habit.name for habit in commentary.habits.all()],
+            "text": commentary.text,
+            "created_at": _iso(commentary.created_at),
+        }
+
+
+class _LineBuffer:
+    """File-like object that hands back what the csv writer writes."""
+
+    def write(self, value):
+        return value
+
+
+def csv_lines(records):
+    writer = csv.DictWriter(
+        _LineBuffer(), fieldnames=EXPORT_COLUMNS, extrasaction="ignore"
+    )
+    yield writer.writeheader()
+    for record in records:
+        for field in ("goal", "habit"):
+            if isinstance(record.get(field), list):
+                record[field] = LINK_SEPARATOR.join(record[field])
+        yield writer.writerow(record)
+
+
+def jsonl_lines(records):
+    for record in records:
+        yield json.dumps(record) + "\n"
+
+
+WRITERS = {
+    "csv": (csv_lines, "text/csv"),
+    "jsonl": (jsonl_lines, "application/x-ndjson"),
+}
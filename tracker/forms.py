@@ -1,6 +1,5 @@
 from django import forms
 from django.forms.widgets import DateInput
-from django.utils import timezone
 
 from tracker.models import (
     Goal,
@@ -74,12 +73,95 @@ class HabitCommentaryForm(forms.ModelForm):
 
 class HabitLogForm(forms.ModelForm):
     CHOICES = [(True, "Completed"), (False, "Not Completed")]
-    completed = forms.ChoiceField(choices=CHOICES, widget=forms.RadioSelect)
-    completed_at = forms.DateField(
-        initial=timezone.now().date(),
-        widget=forms.HiddenInput()
+    completed = forms.TypedChoiceField(
+        choices=CHOICES,
+        coerce=lambda value: value == "True",
+        widget=forms.RadioSelect
     )
 
     class Meta:
         model = HabitLog
-        fields = ["completed", "completed_at"]
+        fields = ["completed"]
+
+
+class HabitCheckInForm(forms.Form):
+    """One three-way choice per habit: completed, not completed or skip."""
+
+    CHOICES = [("", "Skip")] + HabitLogForm.CHOICES
+
+    def __init__(self, *args, habits=(), **kwargs):
+        super().__init__(*args, **kwargs)
+        self.habits = {f"habit_{habit.pk}": habit for habit in habits}
+        for field_name, habit in self.habits.items():
+            self.fields[field_name] = forms.TypedChoiceField(
+                label=habit.name,
+                choices=self.CHOICES,
+                coerce=lambda value: value == "True",
+                empty_value=None,
+                required=False,
+                widget=forms.RadioSelect,
+            )
+
+    def logs(self, log_date) -> list:
+        """Unsaved ``HabitLog`` objects for every answered habit."""
+        return [
+            HabitLog(
+                habit=habit,
+                log_date=log_date,
+                completed=self.cleaned_data[field_name],
+            )
+            for field_name, habit in self.habits.items()
+            if self.cleaned_data.get(field_name) is not None
+        ]
+
+
+class IdListField(forms.Field):
+    """A list of primary keys, e.g. from checkboxes sharing one name."""
+
+    widget = forms.MultipleHiddenInput
+    default_error_messages = {"invalid": "Select valid items."}
+
+    def to_python(self, value):
+        if not value:
+            return []
+        try:
+            return sorted({int(pk) for pk in value})
+        except (TypeError, ValueError):
+            raise forms.ValidationError(
+                self.error_messages["invalid"], code="invalid"
+            )
+
+
+class BulkActionForm(forms.Form):
+    ACTION_CHOICES = [
+        ("complete", "Complete"),
+        ("abandon", "Abandon"),
+        ("reactivate", "Reactivate"),
+        ("delete", "Delete"),
+    ]
+    action = forms.ChoiceField(choices=ACTION_CHOICES)
+    ids = IdListField()
+
+
+class DataImportForm(forms.Form):
+    FORMAT_CHOICES = [("csv", "CSV"), ("jsonl", "JSON Lines")]
+    file = forms.FileField()
+    format = forms.ChoiceField(choices=FORMAT_CHOICES)
+
+
+class JobCreateForm(forms.Form):
+    """Background jobs a user may start for their own data."""
+
+    KIND_CHOICES = [
+        ("export_data", "Export data"),
+        ("rebuild_habit_stats", "Recompute habit statistics"),
+    ]
+    kind = forms.ChoiceField(choices=KIND_CHOICES)
+    format = forms.ChoiceField(
+        choices=DataImportForm.FORMAT_CHOICES, required=False
+    )
+
+    def payload(self) -> dict:
+        if self.cleaned_data["kind"] == "export_data":
+            return {"format": self.cleaned_data["format"] or "jsonl"}
+        return {}
@@ -0,0 +1,103 @@
+"""Per-user versioned cache for rendered fragments and computed contexts.
+
+Every key embeds the owner's current cache version. Model signals bump
+that version whenever one of the user's goals, stages, habits, logs or
+commentaries changes, which orphans all of the user's entries at once:
+invalidation is a single ``incr`` and never scans keys. Orphaned entries
+simply expire.
+
+Hits and misses are counted in the cache as well, so with a shared
+backend the counters cover every worker process.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+FRAGMENT_CACHE_TIMEOUT = getattr(settings, "FRAGMENT_CACHE_TIMEOUT", 600)
+
+HITS_KEY = "fragments:stats:hits"
+MISSES_KEY = "fragments:stats:misses"
+
+_missing = object()
+
+
+def _version_key(user_id: int) -> str:
+    return f"fragments:version:{user_id}"
+
+
+def _new_version() -> int:
+    # Start from the clock, so that a version lost to eviction is never
+    # handed out again for the same user.
+    return time.time_ns()
+
+
+def get_cache_version(user_id: int) -> int:
+    key = _version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        version = _new_version()
+        if not cache.add(key, version, None):
+            version = cache.get(key, version)
+    return version
+
+
+def bump_cache_version(user_id: int) -> None:
+    """Invalidate every cached fragment of a user."""
+    if user_id is None:
+        return
+    try:
+        cache.incr(_version_key(user_id))
+    except ValueError:
+        cache.set(_version_key(user_id), _new_version(), None)
+
+
+def fragment_key(user_id: int, name: str, vary_on=()) -> str:
+    digest = hashlib.md5(
+        ":".join(str(value) for value in vary_on).encode()
+    ).hexdigest()
+    version = get_cache_version(user_id)
+    return f"fragments:{user_id}:{version}:{name}:{digest}"
+
+
+def _count(key: str) -> None:
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, None):
+            cache.incr(key)
+
+
+def get_or_set(user_id: int, name: str, compute, vary_on=(),
+               timeout: int = None):
+    """Return the cached value of ``name``, computing it on a miss."""
+    key = fragment_key(user_id, name, vary_on)
+    value = cache.get(key, _missing)
+    if value is not _missing:
+        _count(HITS_KEY)
+        return value
+
+    _count(MISSES_KEY)
+    value = compute()
+    cache.set(
+        key,
+        value,
+        FRAGMENT_CACHE_TIMEOUT if timeout is None else timeout,
+    )
+    return value
+
+
+def cache_stats() -> dict:
+    hits = cache.get(HITS_KEY, 0)
+    misses = cache.get(MISSES_KEY, 0)
+    lookups = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+    }
+
+
+def reset_cache_stats() -> None:
+    cache.delete_many([HITS_KEY, MISSES_KEY])
@@ -0,0 +1,322 @@
+"""Streaming import of goals, stages, habits and habit logs.
+
+Records are read one line at a time and written in chunks with
+``bulk_create``, one transaction per chunk, so memory use does not
+depend on the size of the file. Every record has a ``type`` of
+``goal``, ``stage``, ``habit`` or ``log``:
+
+* goal: ``name``, ``description``, ``deadline``, ``status``
+* stage: ``goal`` (goal name), ``name``, ``description``, ``deadline``,
+  ``status``
+* habit: ``name``, ``description``, ``month_goal``
+* log: ``habit`` (habit name), ``date``, ``completed``
+
+Stages and logs refer to their goal or habit by name; a name used by
+several goals resolves to the most recent one.
+"""
+import csv
+import datetime
+import json
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from tracker import fragments, search
+from tracker.dashboard import invalidate_dashboard_counts
+from tracker.models import Goal, GoalStage, Habit, HabitLog
+
+CSV_COLUMNS = [
+    "type",
+    "name",
+    "goal",
+    "habit",
+    "description",
+    "deadline",
+    "status",
+    "month_goal",
+    "date",
+    "completed",
+]
+RECORD_TYPES = ["goal", "stage", "habit", "log"]
+STATUSES = [status for status, _ in Goal.STATUS_CHOICES]
+TRUE_VALUES = {"1", "true", "yes", "y", "completed"}
+FALSE_VALUES = {"0", "false", "no", "n", "missed", ""}
+
+NAME_MAX_LENGTH = Goal._meta.get_field("name").max_length
+DEFAULT_CHUNK_SIZE = 1000
+MAX_REPORTED_REJECTIONS = 100
+
+
+class RejectedRow(ValueError):
+    pass
+
+
+def iter_csv(stream):
+    """Yield ``(line_number, record)`` pairs from a CSV text stream."""
+    reader = csv.DictReader(stream)
+    for record in reader:
+        yield reader.line_num, record
+
+
+def iter_jsonl(stream):
+    """Yield ``(line_number, record)`` pairs from a JSONL text stream."""
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as error:
+            record = RejectedRow(f"Invalid JSON: {error}")
+        yield line_number, record
+
+
+READERS = {
+    "csv": iter_csv,
+    "jsonl": iter_jsonl,
+}
+
+
+def _text(record: dict, field: str, required: bool = False) -> str:
+    value = record.get(field)
+    value = "" if value is None else str(value).strip()
+    if required and not value:
+        raise RejectedRow(f"Missing {field}")
+    return value
+
+
+def _name(record: dict, field: str = "name") -> str:
+    value = _text(record, field, required=True)
+    if len(value) > NAME_MAX_LENGTH:
+        raise RejectedRow(f"{field} is longer than {NAME_MAX_LENGTH}")
+    return value
+
+
+def _deadline(record: dict, required: bool) -> datetime.datetime:
+    value = _text(record, "deadline", required)
+    if not value:
+        return None
+    try:
+        parsed = parse_datetime(value)
+        day = None if parsed else parse_date(value)
+    except ValueError:
+        parsed = day = None
+    if parsed is None:
+        if day is None:
+            raise RejectedRow(f"Invalid deadline {value!r}")
+        parsed = datetime.datetime.combine(day, datetime.time())
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def _status(record: dict) -> str:
+    status = _text(record, "status") or "active"
+    if status not in STATUSES:
+        raise RejectedRow(f"Invalid status {status!r}")
+    return status
+
+
+def _completed(record: dict) -> bool:
+    value = record.get("completed")
+    if isinstance(value, bool):
+        return value
+    value = _text(record, "completed").lower()
+    if value in TRUE_VALUES:
+        return True
+    if value in FALSE_VALUES:
+        return False
+    raise RejectedRow(f"Invalid completed value {value!r}")
+
+
+def _log_date(record: dict) -> datetime.date:
+    value = _text(record, "date", required=True)
+    try:
+        day = parse_date(value)
+    except ValueError:
+        day = None
+    if day is None:
+        raise RejectedRow(f"Invalid date {value!r}")
+    return day
+
+
+class DataImporter:
+    """Import records for one user in chunked transactions.
+
+    ``progress`` is called with the running report after every chunk.
+    """
+
+    def __init__(self, user, chunk_size=DEFAULT_CHUNK_SIZE, progress=None):
+        self.user = user
+        self.chunk_size = chunk_size
+        self.progress = progress
+        self.goal_ids = {}
+        self.habit_ids = {}
+        self.needs_reindex = False
+        self.report = {
+            "rows": 0,
+            "imported": dict.fromkeys(RECORD_TYPES, 0),
+            "rejected": 0,
+            "rejections": [],
+        }
+
+    def run(self, records) -> dict:
+        chunk = []
+        for line_number, record in records:
+            chunk.append((line_number, record))
+            if len(chunk) >= self.chunk_size:
+                self.flush(chunk)
+                chunk = []
+        if chunk:
+            self.flush(chunk)
+
+        if self.needs_reindex:
+            search.reindex_user(self.user.pk)
+        invalidate_dashboard_counts(self.user.pk)
+        fragments.bump_cache_version(self.user.pk)
+        return self.report
+
+    def reject(self, line_number: int, reason: str) -> None:
+        self.report["rejected"] += 1
+        if len(self.report["rejections"]) < MAX_REPORTED_REJECTIONS:
+            self.report["rejections"].append((line_number, reason))
+
+    def flush(self, chunk: list) -> None:
+        parsed = {record_type: [] for record_type in RECORD_TYPES}
+        for line_number, record in chunk:
+            self.report["rows"] += 1
+            try:
+                if isinstance(record, Exception):
+                    raise record
+                if not isinstance(record, dict):
+                    raise RejectedRow("Record is not an object")
+                record_type = _text(record, "type").lower()
+                if record_type not in parsed:
+                    raise RejectedRow(f"Unknown type {record_type!r}")
+                parsed[record_type].append((line_number, record))
+            except RejectedRow as error:
+                self.reject(line_number, str(error))
+
+        with transaction.atomic():
+            self.import_goals(parsed["goal"])
+            self.import_habits(parsed["habit"])
+            self.import_stages(parsed["stage"])
+            self.import_logs(parsed["log"])
+
+        if self.progress:
+            self.progress(self.report)
+
+    def build(self, records: list, factory) -> list:
+        objects = []
+        for line_number, record in records:
+            try:
+                objects.append(factory(record))
+            except RejectedRow as error:
+                self.reject(line_number, str(error))
+        return objects
+
+    def resolve(self, model, names: set, cache: dict) -> None:
+        """Load the ids of named goals or habits that are not cached yet."""
+        missing = names - cache.keys()
+        if not missing:
+            return
+        rows = model.objects.filter(
+            user=self.user, name__in=missing
+        ).order_by("pk").values_list("name", "pk")
+        cache.update(rows)
+
+    def import_goals(self, records: list) -> None:
+        goals = self.build(records, lambda record: Goal(
+            user=self.user,
+            name=_name(record),
+            description=_text(record, "description"),
+            deadline=_deadline(record, required=True),
+            status=_status(record),
+        ))
+        Goal.objects.bulk_create(goals, batch_size=self.chunk_size)
+        self.index(goals)
+        self.forget(self.goal_ids, goals)
+        self.report["imported"]["goal"] += len(goals)
+
+    def import_habits(self, records: list) -> None:
+        habits = self.build(records, lambda record: Habit(
+            user=self.user,
+            name=_name(record),
+            description=_text(record, "description"),
+            month_goal=_text(record, "month_goal"),
+        ))
+        Habit.objects.bulk_create(habits, batch_size=self.chunk_size)
+        self.index(habits)
+        self.forget(self.habit_ids, habits)
+        self.report["imported"]["habit"] += len(habits)
+
+    def index(self, objects: list) -> None:
+        # bulk_create skips the signals that feed the search index. Old
+        # SQLite versions do not return primary keys from bulk inserts;
+        # those imports are reindexed once at the end instead.
+        if all(obj.pk for obj in objects):
+            search.index_objects(objects)
+        else:
+            self.needs_reindex = True
+
+    @staticmethod
+    def forget(cache: dict, objects: list) -> None:
+        # Newly created objects win over older ones with the same name;
+        # their ids are looked up again on the next reference.
+        for obj in objects:
+            cache.pop(obj.name, None)
+
+    def import_stages(self, records: list) -> None:
+        self.resolve(
+            Goal,
+            {_text(record, "goal") for _, record in records},
+            self.goal_ids
+        )
+
+        def factory(record):
+            goal_name = _text(record, "goal", required=True)
+            if goal_name not in self.goal_ids:
+                raise RejectedRow(f"Unknown goal {goal_name!r}")
+            return GoalStage(
+                goal_id=self.goal_ids[goal_name],
+                stage_name=_name(record),
+                description=_text(record, "description"),
+                deadline=_deadline(record, required=False),
+                status=_status(record),
+            )
+
+        stages = self.build(records, factory)
+        GoalStage.objects.bulk_create(stages, batch_size=self.chunk_size)
+        # bulk_create skips the signals that roll stage changes up to
+        # the goal's updated_at, which the goal page's ETag is built on.
+        Goal.objects.filter(
+            pk__in={stage.goal_id for stage in stages}
+        ).update(updated_at=timezone.now())
+        self.report["imported"]["stage"] += len(stages)
+
+    def import_logs(self, records: list) -> None:
+        self.resolve(
+            Habit,
+            {_text(record, "habit") for _, record in records},
+            self.habit_ids
+        )
+
+        def factory(record):
+            habit_name = _text(record, "habit", required=True)
+            if habit_name not in self.habit_ids:
+                raise RejectedRow(f"Unknown habit {habit_name!r}")
+            return HabitLog(
+                habit_id=self.habit_ids[habit_name],
+                log_date=_log_date(record),
+                completed=_completed(record),
+            )
+
+        logs = self.build(records, factory)
+        if logs:
+            HabitLog.objects.upsert(logs)
+        self.report["imported"]["log"] += len(logs)
+
+
+def import_stream(user, stream, data_format, **kwargs) -> dict:
+    """Import a CSV or JSONL text stream for ``user``."""
+    return DataImporter(user, **kwargs).run(READERS[data_format](stream))
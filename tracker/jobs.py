@@ -0,0 +1,186 @@
+"""Background jobs stored in the application database.
+
+``enqueue`` inserts a ``Job`` row; ``manage.py runworker`` claims queued
+rows and runs them in a process pool. No broker is involved, jobs live
+in the database the app already uses.
+
+Claiming depends on the backend:
+
+* with ``SELECT ... FOR UPDATE SKIP LOCKED`` (PostgreSQL, MySQL 8) the
+  oldest runnable rows are locked and marked running in one
+  transaction; concurrent workers skip each other's locked rows instead
+  of waiting for them;
+* on SQLite every candidate is claimed with a conditional
+  ``UPDATE ... WHERE status = 'queued'``. SQLite serializes writers, so
+  exactly one worker's update matches a row.
+
+A failed job is retried ``JOB_RETRY_BACKOFF * 2 ** (attempts - 1)``
+seconds later until it has run ``max_attempts`` times. A job left
+running by a worker that died is requeued after ``JOB_LOCK_TIMEOUT``
+seconds, or failed if that was its last attempt. Finished jobs are
+deleted ``JOB_RETENTION`` seconds later, with their files.
+
+Tasks are functions registered with ``@task(kind)`` (see
+``tracker.tasks``); they get the ``Job`` and return a JSON-serializable
+result.
+"""
+import os
+import socket
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from tracker.models import Job
+
+JOB_RETRY_BACKOFF = getattr(settings, "JOB_RETRY_BACKOFF", 30)
+JOB_LOCK_TIMEOUT = getattr(settings, "JOB_LOCK_TIMEOUT", 3600)
+JOB_RETENTION = getattr(settings, "JOB_RETENTION", 7 * 24 * 3600)
+
+TASKS = {}
+
+
+def task(kind: str):
+    """Register the decorated function as the handler of ``kind`` jobs."""
+    def register(func):
+        TASKS[kind] = func
+        return func
+    return register
+
+
+def enqueue(kind: str, user=None, payload: dict = None,
+            max_attempts: int = 3, delay: float = 0) -> Job:
+    if kind not in TASKS:
+        raise ValueError(f"Unknown job kind: {kind}")
+    return Job.objects.create(
+        kind=kind,
+        user=user,
+        payload=payload or {},
+        max_attempts=max_attempts,
+        run_after=timezone.now() + timedelta(seconds=delay),
+    )
+
+
+def worker_name() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _runnable(now):
+    return Job.objects.filter(status="queued", run_after__lte=now).order_by(
+        "run_after", "pk"
+    )
+
+
+def claim_jobs(worker: str, limit: int) -> list:
+    """Mark up to ``limit`` runnable jobs as running for ``worker``."""
+    if limit <= 0:
+        return []
+    now = timezone.now()
+    claim = {
+        "status": "running",
+        "locked_by": worker,
+        "locked_at": now,
+        "attempts": F("attempts") + 1,
+    }
+
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            ids = list(
+                _runnable(now).select_for_update(skip_locked=True)
+                .values_list("pk", flat=True)[:limit]
+            )
+            Job.objects.filter(pk__in=ids).update(**claim)
+    else:
+        ids = [
+            pk for pk in _runnable(now).values_list("pk", flat=True)[:limit]
+            if Job.objects.filter(pk=pk, status="queued").update(**claim)
+        ]
+    return list(Job.objects.filter(pk__in=ids).order_by("run_after", "pk"))
+
+
+def release_jobs(jobs, error: str) -> int:
+    """Requeue the running ``jobs`` that have attempts left and fail the
+    others with ``error``; returns how many were released."""
+    jobs = jobs.filter(status="running")
+    unlock = {"locked_by": "", "locked_at": None}
+    failed = jobs.filter(attempts__gte=F("max_attempts")).update(
+        status="failed", error=error, finished_at=timezone.now(), **unlock
+    )
+    return failed + jobs.update(status="queued", **unlock)
+
+
+def requeue_stale_jobs(timeout: float = JOB_LOCK_TIMEOUT) -> int:
+    """Release jobs whose worker has not finished them in ``timeout``."""
+    return release_jobs(
+        Job.objects.filter(
+            locked_at__lt=timezone.now() - timedelta(seconds=timeout)
+        ),
+        f"The job did not finish within {timeout} seconds.",
+    )
+
+
+def delete_finished_jobs(retention: float = JOB_RETENTION) -> int:
+    """Delete jobs that finished over ``retention`` seconds ago; their
+    files go with them, see ``tracker.signals``."""
+    deleted, _ = Job.objects.filter(
+        status__in=["succeeded", "failed"],
+        finished_at__lt=timezone.now() - timedelta(seconds=retention),
+    ).delete()
+    return deleted
+
+
+def retry_delay(attempts: int) -> float:
+    return JOB_RETRY_BACKOFF * 2 ** max(attempts - 1, 0)
+
+
+def run_job(job_id: int) -> str:
+    """Run a claimed job and record its outcome; returns the new status."""
+    job = Job.objects.get(pk=job_id)
+    handler = TASKS.get(job.kind)
+    owned = Job.objects.filter(
+        pk=job.pk, status="running", locked_by=job.locked_by
+    )
+    try:
+        if handler is None:
+            raise LookupError(f"Unknown job kind: {job.kind}")
+        result = handler(job)
+    except Exception:
+        now = timezone.now()
+        if handler is not None and job.attempts < job.max_attempts:
+            status = "queued"
+            run_after = now + timedelta(seconds=retry_delay(job.attempts))
+            finished_at = None
+        else:
+            status, run_after, finished_at = "failed", job.run_after, now
+        owned.update(
+            status=status,
+            run_after=run_after,
+            finished_at=finished_at,
+            error=traceback.format_exc(),
+            locked_by="",
+            locked_at=None,
+        )
+        return status
+
+    owned.update(
+        status="succeeded",
+        result=result,
+        error="",
+        finished_at=timezone.now(),
+        locked_by="",
+        locked_at=None,
+    )
+    return "succeeded"
+
+
+def run_job_in_process(job_id: int) -> str:
+    """``run_job`` for pool processes: like a request, close stale
+    database connections before and after."""
+    close_old_connections()
+    try:
+        return run_job(job_id)
+    finally:
+        close_old_connections()
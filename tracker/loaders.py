@@ -0,0 +1,58 @@
+"""Query-count-bounded data loaders for detail pages.
+
+A goal detail page runs at most three queries, however many stages and
+comments the goal has: the goal with its stage counts aggregated in the
+same SELECT, the stages, and the latest comments with their authors.
+The stages and comments are lazy querysets, so they are only run when
+their cached fragments are missing.
+"""
+from django.db.models import Count, Q
+
+from tracker.models import Commentary, Goal, GoalStage
+
+RECENT_COMMENTARIES = 20
+
+STAGE_STATUSES = [status for status, _ in GoalStage.STATUS_CHOICES]
+
+
+def goal_detail_queryset():
+    """Goals annotated with ``stages_<status>`` and ``stages_total``."""
+    counts = {
+        f"stages_{status}": Count("stages", filter=Q(stages__status=status))
+        for status in STAGE_STATUSES
+    }
+    return Goal.objects.annotate(stages_total=Count("stages"), **counts)
+
+
+def stage_progress(goal) -> dict:
+    """Stage counts of an annotated goal plus the percentage completed.
+
+    Abandoned stages do not count towards the total, so a goal whose
+    remaining stages are all done is at 100%.
+    """
+    progress = {
+        status: getattr(goal, f"stages_{status}") for status in STAGE_STATUSES
+    }
+    progress["total"] = goal.stages_total
+    relevant = goal.stages_total - progress["abandoned"]
+    progress["percent"] = (
+        round(100 * progress["completed"] / relevant, 1) if relevant else 0
+    )
+    return progress
+
+
+def recent_commentaries(goal, limit: int = RECENT_COMMENTARIES):
+    return (
+        Commentary.objects.filter(goals=goal)
+        .select_related("user")
+        .order_by("-created_at", "-pk")[:limit]
+    )
+
+
+def load_goal_detail(goal) -> dict:
+    """Context for ``goal/goal_detail.html`` of an annotated goal."""
+    return {
+        "goal_stages": goal.stages.all(),
+        "goal_commentaries": recent_commentaries(goal),
+        "stage_progress": stage_progress(goal),
+    }
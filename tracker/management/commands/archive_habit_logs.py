@@ -0,0 +1,52 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from tracker.archive import (
+    ARCHIVE_BATCH_SIZE,
+    HABIT_LOG_ARCHIVE_DAYS,
+    archive_horizon,
+    archive_logs,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Compact HabitLog rows older than the archive horizon into the "
+        "habits' year bitmaps and delete them, one bounded transaction "
+        "per batch. Safe to interrupt and to run from cron."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "habit_ids",
+            nargs="*",
+            type=int,
+            help="Only process these habits (default: all habits).",
+        )
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=HABIT_LOG_ARCHIVE_DAYS,
+            help="Archive logs older than this many days "
+                 f"(default: {HABIT_LOG_ARCHIVE_DAYS}).",
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=ARCHIVE_BATCH_SIZE
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        before = archive_horizon(days=options["days"])
+        archived = archive_logs(
+            before,
+            batch_size=options["batch_size"],
+            habit_ids=options["habit_ids"] or None,
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Archived {sum(archived.values())} logs before {before} "
+                f"of {len(archived)} habits in "
+                f"{time.perf_counter() - started:.2f}s."
+            )
+        )
@@ -0,0 +1,217 @@
+import asyncio
+import io
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand, CommandError
+from django.core.wsgi import get_wsgi_application
+from django.test import Client
+from django.urls import reverse
+
+from tracker.management.commands.benchmark_urls import percentile
+
+HOST = "127.0.0.1"
+
+
+def wsgi_request(application, path: str, cookie: str) -> int:
+    environ = {
+        "REQUEST_METHOD": "GET",
+        "PATH_INFO": path,
+        "QUERY_STRING": "",
+        "SERVER_NAME": HOST,
+        "SERVER_PORT": "80",
+        "SERVER_PROTOCOL": "HTTP/1.1",
+        "HTTP_HOST": HOST,
+        "HTTP_COOKIE": cookie,
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": "http",
+        "wsgi.input": io.BytesIO(),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": False,
+        "wsgi.run_once": False,
+    }
+    status = []
+    body = application(
+        environ, lambda code, headers: status.append(int(code[:3]))
+    )
+    try:
+        for _ in body:
+            pass
+    finally:
+        body.close()
+    return status[0]
+
+
+async def asgi_request(application, path: str, cookie: str) -> int:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [
+            (b"host", HOST.encode()),
+            (b"cookie", cookie.encode()),
+        ],
+        "client": (HOST, 50000),
+        "server": (HOST, 80),
+    }
+    received = False
+    messages = []
+
+    async def receive():
+        nonlocal received
+        if received:
+            # The request is complete; wait like a connection that stays
+            # open until the handler cancels us.
+            await asyncio.Event().wait()
+        received = True
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await application(scope, receive, send)
+    return messages[0]["status"]
+
+
+def run_wsgi(application, path, cookie, requests, concurrency) -> tuple:
+    def timed(_):
+        started = time.perf_counter()
+        status = wsgi_request(application, path, cookie)
+        return status, (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        results = list(pool.map(timed, range(requests)))
+    return results, time.perf_counter() - started
+
+
+def run_asgi(application, path, cookie, requests, concurrency) -> tuple:
+    async def worker(queue, results):
+        while not queue.empty():
+            queue.get_nowait()
+            started = time.perf_counter()
+            status = await asgi_request(application, path, cookie)
+            results.append((status, (time.perf_counter() - started) * 1000))
+
+    async def main():
+        queue = asyncio.Queue()
+        for index in range(requests):
+            queue.put_nowait(index)
+        results = []
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(worker(queue, results) for _ in range(concurrency))
+        )
+        return results, time.perf_counter() - started
+
+    return asyncio.run(main())
+
+
+RUNNERS = {"wsgi": run_wsgi, "asgi": run_asgi}
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare requests per second of the dashboard and habit detail "
+        "pages served through Django's ASGI handler and through its WSGI "
+        "handler, at the same concurrency. WSGI requests run on a thread "
+        "pool like a threaded gunicorn worker; ASGI requests run as "
+        "concurrent tasks on one event loop like a uvicorn worker. Both "
+        "run in this process, without network or server overhead."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--username",
+            default="loadtest-0",
+            help="User to browse as (default: loadtest-0).",
+        )
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument("--concurrency", type=int, default=10)
+        parser.add_argument("--warmup", type=int, default=5)
+        parser.add_argument(
+            "--json",
+            dest="json_path",
+            help="Also write the results to this JSON file.",
+        )
+
+    def handle(self, *args, **options):
+        user_model = get_user_model()
+        try:
+            user = user_model.objects.get(username=options["username"])
+        except user_model.DoesNotExist:
+            raise CommandError(
+                f"User {options['username']} does not exist; run "
+                "generate_dataset first or pass --username."
+            )
+        habit = user.habits.order_by("pk").first()
+        if habit is None:
+            raise CommandError(f"User {user.username} has no habits.")
+
+        client = Client()
+        client.force_login(user)
+        cookie = (
+            f"{settings.SESSION_COOKIE_NAME}="
+            f"{client.cookies[settings.SESSION_COOKIE_NAME].value}"
+        )
+        applications = {
+            "wsgi": get_wsgi_application(),
+            "asgi": get_asgi_application(),
+        }
+        routes = {
+            "tracker:index": reverse("tracker:index"),
+            "tracker:habit-detail": reverse(
+                "tracker:habit-detail", args=[habit.pk]
+            ),
+        }
+
+        results = {}
+        for name, path in routes.items():
+            for interface, runner in RUNNERS.items():
+                application = applications[interface]
+                runner(
+                    application, path, cookie, options["warmup"],
+                    options["concurrency"],
+                )
+                timings, elapsed = runner(
+                    application, path, cookie, options["requests"],
+                    options["concurrency"],
+                )
+                result = self.summarize(timings, elapsed)
+                results.setdefault(name, {})[interface] = result
+                self.stdout.write(self.format_row(name, interface, result))
+
+        if options["json_path"]:
+            with open(options["json_path"], "w") as output:
+                json.dump(results, output, indent=2, sort_keys=True)
+
+    @staticmethod
+    def summarize(timings, elapsed) -> dict:
+        latencies = sorted(ms for _, ms in timings)
+        return {
+            "requests": len(timings),
+            "status": sorted({status for status, _ in timings}),
+            "rps": round(len(timings) / elapsed, 1),
+            "p50_ms": round(percentile(latencies, 0.50), 2),
+            "p99_ms": round(percentile(latencies, 0.99), 2),
+        }
+
+    @staticmethod
+    def format_row(name, interface, result) -> str:
+        return (
+            f"{name:<25} {interface} rps={result['rps']:>8.1f} "
+            f"p50={result['p50_ms']:>8.2f}ms p99={result['p99_ms']:>8.2f}ms "
+            f"status={result['status']}"
+        )
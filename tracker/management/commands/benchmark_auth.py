@@ -0,0 +1,126 @@
+import json
+import statistics
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from tracker.management.commands.benchmark_urls import (
+    QueryCounter,
+    percentile,
+)
+
+MODES = {
+    "db": {
+        "SESSION_ENGINE": "django.contrib.sessions.backends.db",
+        "AUTHENTICATION_BACKENDS": [
+            "django.contrib.auth.backends.ModelBackend"
+        ],
+    },
+    "cached": {
+        "SESSION_ENGINE": "django.contrib.sessions.backends.cached_db",
+        "AUTHENTICATION_BACKENDS": [
+            "tracker.auth.CachedModelBackend",
+            "django.contrib.auth.backends.ModelBackend",
+        ],
+    },
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare queries and latency per request with database sessions "
+        "and user lookups against the cached_db session engine and "
+        "tracker.auth.CachedModelBackend (CACHED_AUTH=True)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--username",
+            default="loadtest-0",
+            help="User to browse as (default: loadtest-0).",
+        )
+        parser.add_argument("--requests", type=int, default=50)
+        parser.add_argument(
+            "--route",
+            action="append",
+            default=[],
+            help="URL names to request (default: index, goal and habit "
+                 "lists).",
+        )
+        parser.add_argument(
+            "--json",
+            dest="json_path",
+            help="Also write the results to this JSON file.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            user = get_user_model().objects.get(username=options["username"])
+        except get_user_model().DoesNotExist:
+            raise CommandError(
+                f"User {options['username']} does not exist; run "
+                "generate_dataset first or pass --username."
+            )
+        urls = [
+            reverse(name) for name in options["route"] or [
+                "tracker:index", "tracker:goal-list", "tracker:habit-list"
+            ]
+        ]
+
+        results = {}
+        for mode, mode_settings in MODES.items():
+            with override_settings(
+                ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"],
+                **mode_settings,
+            ):
+                results[mode] = self.benchmark(user, urls, options)
+            self.stdout.write(
+                f"{mode:<7} {results[mode]['queries']:>5} queries/request  "
+                f"p50 {results[mode]['p50_ms']:>8.2f}ms  "
+                f"p95 {results[mode]['p95_ms']:>8.2f}ms"
+            )
+
+        saved = results["db"]["queries"] - results["cached"]["queries"]
+        results["queries_saved"] = round(saved, 1)
+        self.stdout.write(
+            self.style.SUCCESS(f"Saved {saved:.1f} queries per request.")
+        )
+        if options["json_path"]:
+            with open(options["json_path"], "w") as output:
+                json.dump(results, output, indent=2, sort_keys=True)
+
+    def benchmark(self, user, urls, options) -> dict:
+        cache.clear()
+        client = Client()
+        client.force_login(user)
+        # Warm the session, user and fragment caches.
+        for url in urls:
+            client.get(url)
+
+        timings, queries = [], []
+        for number in range(options["requests"]):
+            counter = QueryCounter()
+            started = time.perf_counter()
+            with connection.execute_wrapper(counter):
+                response = client.get(urls[number % len(urls)])
+            timings.append((time.perf_counter() - started) * 1000)
+            queries.append(counter.count)
+            if response.status_code != 200:
+                raise CommandError(
+                    f"{urls[number % len(urls)]} returned "
+                    f"{response.status_code}"
+                )
+
+        client.logout()
+        timings.sort()
+        return {
+            "queries": round(statistics.mean(queries), 1),
+            "p50_ms": round(percentile(timings, 0.50), 2),
+            "p95_ms": round(percentile(timings, 0.95), 2),
+        }
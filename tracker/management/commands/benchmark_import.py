@@ -0,0 +1,116 @@
+import csv
+import datetime
+import io
+import json
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from tracker.importers import (
+    CSV_COLUMNS,
+    DEFAULT_CHUNK_SIZE,
+    import_stream,
+)
+
+
+def synthetic_records(goals, stages, habits, days):
+    start = datetime.date.today() - datetime.timedelta(days=days)
+    for goal in range(goals):
+        yield {
+            "type": "goal",
+            "name": f"Goal {goal}",
+            "deadline": "2030-01-01",
+        }
+        for stage in range(stages):
+            yield {
+                "type": "stage",
+                "goal": f"Goal {goal}",
+                "name": f"Stage {stage}",
+                "status": "completed" if stage % 2 else "active",
+            }
+    for habit in range(habits):
+        yield {"type": "habit", "name": f"Habit {habit}"}
+        for day in range(days):
+            yield {
+                "type": "log",
+                "habit": f"Habit {habit}",
+                "date": (start + datetime.timedelta(days=day)).isoformat(),
+                "completed": (day * 7 + habit) % 3 != 0,
+            }
+
+
+def csv_lines(records):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=CSV_COLUMNS)
+    writer.writeheader()
+    for record in records:
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerow(record)
+    yield buffer.getvalue()
+
+
+def jsonl_lines(records):
+    for record in records:
+        yield json.dumps(record) + "\n"
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure import throughput (rows per second) on the configured "
+        "database. Point DATABASE_URL at PostgreSQL to benchmark it."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--goals", type=int, default=100)
+        parser.add_argument("--stages", type=int, default=5)
+        parser.add_argument("--habits", type=int, default=20)
+        parser.add_argument("--days", type=int, default=1000)
+        parser.add_argument(
+            "--format", choices=["csv", "jsonl"], default="csv"
+        )
+        parser.add_argument(
+            "--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE
+        )
+        parser.add_argument(
+            "--keep",
+            action="store_true",
+            help="Keep the benchmark user and its data afterwards.",
+        )
+
+    def handle(self, *args, **options):
+        user = get_user_model().objects.create_user(
+            username=f"benchmark-import-{time.time_ns()}"
+        )
+        records = synthetic_records(
+            options["goals"],
+            options["stages"],
+            options["habits"],
+            options["days"],
+        )
+        lines = (
+            csv_lines(records) if options["format"] == "csv"
+            else jsonl_lines(records)
+        )
+
+        started = time.perf_counter()
+        report = import_stream(
+            user,
+            lines,
+            options["format"],
+            chunk_size=options["chunk_size"],
+        )
+        elapsed = time.perf_counter() - started
+
+        if not options["keep"]:
+            user.delete()
+
+        self.stdout.write(
+            f"{connection.vendor} {options['format']} "
+            f"chunk={options['chunk_size']}: {report['rows']} rows in "
+            f"{elapsed:.2f}s = {report['rows'] / elapsed:.0f} rows/s "
+            f"({report['rejected']} rejected)"
+        )
@@ -0,0 +1,185 @@
+import json
+import statistics
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import Client, override_settings
+from django.urls import URLPattern, reverse
+from django.utils import timezone
+
+from tracker import urls as tracker_urls
+from tracker.models import GoalStage
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def percentile(sorted_values: list, fraction: float) -> float:
+    index = min(
+        len(sorted_values) - 1, round(fraction * (len(sorted_values) - 1))
+    )
+    return sorted_values[index]
+
+
+class Command(BaseCommand):
+    help = (
+        "Request every GET route of tracker.urls through the Django test "
+        "client as one user and report p50/p95/p99 latency and queries "
+        "per request. Generate data first with generate_dataset."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--username",
+            default="loadtest-0",
+            help="User to browse as (default: loadtest-0).",
+        )
+        parser.add_argument("--requests", type=int, default=50)
+        parser.add_argument("--warmup", type=int, default=3)
+        parser.add_argument(
+            "--route",
+            action="append",
+            default=[],
+            help="Only benchmark these URL names (repeatable).",
+        )
+        parser.add_argument(
+            "--json",
+            dest="json_path",
+            help="Also write the results to this JSON file.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            user = get_user_model().objects.get(username=options["username"])
+        except get_user_model().DoesNotExist:
+            raise CommandError(
+                f"User {options['username']} does not exist; run "
+                "generate_dataset first or pass --username."
+            )
+
+        routes = self.routes(user, options["route"])
+        client = Client()
+        client.force_login(user)
+
+        results = {}
+        with override_settings(
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]
+        ):
+            for name, url in routes:
+                results[name] = self.benchmark(client, url, options)
+                self.stdout.write(self.format_row(name, results[name]))
+
+        if options["json_path"]:
+            with open(options["json_path"], "w") as output:
+                json.dump(results, output, indent=2, sort_keys=True)
+
+    def routes(self, user, only) -> list:
+        """``(url name, url)`` for every GET route, filled in with the
+        user's first goal, stage, habit and job, and latest finished
+        export."""
+        goal = user.goals.order_by("pk").first()
+        habit = user.habits.order_by("pk").first()
+        stage = GoalStage.objects.filter(goal=goal).order_by("pk").first()
+        job = user.jobs.order_by("pk").first()
+        export = user.jobs.filter(
+            kind="export_data", status="succeeded"
+        ).order_by("pk").last()
+        values = {
+            "goal": {"pk": goal and goal.pk, "goal_id": goal and goal.pk},
+            "stage": {"pk": stage and stage.pk, "goal_id": goal and goal.pk},
+            "habit": {"pk": habit and habit.pk},
+            "job": {"pk": job and job.pk},
+            "export": {"pk": export and export.pk},
+        }
+
+        routes = []
+        seen = set()
+        for pattern in tracker_urls.urlpatterns:
+            if not isinstance(pattern, URLPattern):
+                continue
+            name = f"{tracker_urls.app_name}:{pattern.name}"
+            view_class = getattr(pattern.callback, "view_class", None)
+            if view_class and not hasattr(view_class, "get"):
+                continue
+            if only and name not in only and pattern.name not in only:
+                continue
+            if name in seen:
+                continue
+            seen.add(name)
+
+            params = pattern.pattern.converters.keys()
+            kind = (
+                "stage" if "stage" in pattern.name and "pk" in params
+                else "habit" if pattern.name.startswith("habit")
+                else "export" if pattern.name == "job-download"
+                else "job" if pattern.name.startswith("job")
+                else "goal"
+            )
+            today = timezone.localdate()
+            kwargs = {
+                param: (
+                    today.year if param == "year"
+                    else today.month if param == "month"
+                    else values[kind][param]
+                )
+                for param in params
+            }
+            if None in kwargs.values():
+                self.stderr.write(f"Skipping {name}: no object to show.")
+                continue
+            routes.append((name, reverse(name, kwargs=kwargs)))
+        return routes
+
+    def benchmark(self, client, url, options) -> dict:
+        for _ in range(options["warmup"]):
+            self.request(client, url)
+
+        timings, queries, statuses = [], [], set()
+        for _ in range(options["requests"]):
+            counter = QueryCounter()
+            started = time.perf_counter()
+            # Replica reads run on other connections; count them too.
+            with ExitStack() as stack:
+                for alias in connections:
+                    stack.enter_context(
+                        connections[alias].execute_wrapper(counter)
+                    )
+                statuses.add(self.request(client, url))
+            timings.append((time.perf_counter() - started) * 1000)
+            queries.append(counter.count)
+
+        timings.sort()
+        return {
+            "url": url,
+            "status": sorted(statuses),
+            "p50_ms": round(percentile(timings, 0.50), 2),
+            "p95_ms": round(percentile(timings, 0.95), 2),
+            "p99_ms": round(percentile(timings, 0.99), 2),
+            "queries": round(statistics.mean(queries), 1),
+        }
+
+    @staticmethod
+    def request(client, url) -> int:
+        response = client.get(url)
+        if response.streaming:
+            for _ in response.streaming_content:
+                pass
+        return response.status_code
+
+    @staticmethod
+    def format_row(name, result) -> str:
+        return (
+            f"{name:<45} p50={result['p50_ms']:>8.2f}ms "
+            f"p95={result['p95_ms']:>8.2f}ms p99={result['p99_ms']:>8.2f}ms "
+            f"queries={result['queries']:>5} status={result['status']}"
+        )
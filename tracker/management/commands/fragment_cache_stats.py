@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from tracker.fragments import cache_stats, reset_cache_stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Show fragment cache hits and misses. Counters are kept in the "
+        "configured cache, so they cover every worker sharing it."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help="Reset the counters after printing them.",
+        )
+
+    def handle(self, *args, **options):
+        stats = cache_stats()
+        self.stdout.write(
+            f"hits={stats['hits']} misses={stats['misses']} "
+            f"hit_ratio={stats['hit_ratio']:.2%}"
+        )
+        if options["reset"]:
+            reset_cache_stats()
@@ -0,0 +1,239 @@
+import datetime
+import random
+import time
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from tracker import search
+from tracker.models import (
+    Commentary,
+    Goal,
+    GoalStage,
+    Habit,
+    HabitLog,
+    HabitMonthReport,
+    HabitStats,
+    HabitYearBitmap,
+)
+
+STATUSES = ["active"] * 6 + ["completed"] * 3 + ["abandoned"]
+WORDS = (
+    "run read write swim cook study sleep walk stretch plan save learn "
+    "practice journal meditate build ship review call clean"
+).split()
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a deterministic synthetic dataset for load testing: "
+        "users with goals, stages, habits, years of daily logs and "
+        "comments, written with bulk inserts. Derived data (habit stats, "
+        "year bitmaps, search documents) is built in memory alongside."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=100)
+        parser.add_argument("--goals", type=int, default=30)
+        parser.add_argument("--stages", type=int, default=5)
+        parser.add_argument("--habits", type=int, default=10)
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=730,
+            help="Days of habit history per habit.",
+        )
+        parser.add_argument("--comments", type=int, default=5)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument(
+            "--prefix",
+            default="loadtest",
+            help="Usernames are <prefix>-<n>.",
+        )
+        parser.add_argument(
+            "--password",
+            default="loadtest",
+            help="Password of every generated user.",
+        )
+        parser.add_argument(
+            "--users-per-batch",
+            type=int,
+            default=20,
+            help="Users written per transaction.",
+        )
+
+    def handle(self, *args, **options):
+        user_model = get_user_model()
+        if user_model.objects.filter(
+            username__startswith=f"{options['prefix']}-"
+        ).exists():
+            raise CommandError(
+                f"Users named {options['prefix']}-* already exist; "
+                "choose another --prefix."
+            )
+
+        self.options = options
+        self.random = random.Random(options["seed"])
+        self.password = make_password(options["password"])
+        self.today = timezone.localdate()
+        self.start = timezone.now() - datetime.timedelta(
+            days=options["days"]
+        )
+
+        started = time.perf_counter()
+        totals = dict.fromkeys(
+            ["users", "goals", "stages", "habits", "logs", "comments"], 0
+        )
+        batch_size = options["users_per_batch"]
+        for first in range(0, options["users"], batch_size):
+            last = min(first + batch_size, options["users"])
+            with transaction.atomic():
+                counts = self.generate_users(range(first, last))
+            for key, value in counts.items():
+                totals[key] += value
+            self.stdout.write(f"{last}/{options['users']} users")
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                ", ".join(f"{value} {key}" for key, value in totals.items())
+                + f" in {elapsed:.1f}s"
+            )
+        )
+
+    def text(self, words: int) -> str:
+        return " ".join(self.random.choice(WORDS) for _ in range(words))
+
+    def generate_users(self, numbers) -> dict:
+        options = self.options
+        users = get_user_model().objects.bulk_create([
+            get_user_model()(
+                username=f"{options['prefix']}-{number}",
+                password=self.password,
+            )
+            for number in numbers
+        ])
+
+        goals = Goal.objects.bulk_create([
+            Goal(
+                user=user,
+                name=f"{self.text(2).capitalize()} {number}",
+                description=self.text(12),
+                deadline=self.start + datetime.timedelta(
+                    days=self.random.randint(30, 2 * options["days"] + 30)
+                ),
+                status=self.random.choice(STATUSES),
+            )
+            for user in users
+            for number in range(options["goals"])
+        ])
+        stages = GoalStage.objects.bulk_create([
+            GoalStage(
+                goal=goal,
+                stage_name=f"Step {number + 1}: {self.text(2)}",
+                description=self.text(8),
+                status=self.random.choice(STATUSES),
+            )
+            for goal in goals
+            for number in range(options["stages"])
+        ])
+        habits = Habit.objects.bulk_create([
+            Habit(
+                user=user,
+                name=f"{self.text(1).capitalize()} daily {number}",
+                description=self.text(10),
+                month_goal=self.text(6),
+            )
+            for user in users
+            for number in range(options["habits"])
+        ])
+        # auto_now_add ignores explicit values, so backdate afterwards.
+        Habit.objects.filter(pk__in=[habit.pk for habit in habits]).update(
+            created_at=self.start
+        )
+
+        logs = self.generate_logs(habits)
+        comments = self.generate_comments(users, goals, habits)
+
+        search.index_objects(goals + habits + comments)
+        return {
+            "users": len(users),
+            "goals": len(goals),
+            "stages": len(stages),
+            "habits": len(habits),
+            "logs": logs,
+            "comments": len(comments),
+        }
+
+    def generate_logs(self, habits) -> int:
+        """Insert the logs and the stats and bitmaps they imply."""
+        days = self.options["days"]
+        first_day = self.today - datetime.timedelta(days=days - 1)
+        logs, stats, year_bitmaps = [], [], []
+        for habit in habits:
+            success_rate = self.random.uniform(0.4, 0.95)
+            habit_stats = HabitStats(habit=habit)
+            by_year = {}
+            for offset in range(days):
+                day = first_day + datetime.timedelta(days=offset)
+                if self.random.random() < 0.1:
+                    continue
+                completed = self.random.random() < success_rate
+                logs.append(
+                    HabitLog(habit=habit, log_date=day, completed=completed)
+                )
+                habit_stats._apply(day, completed)
+                by_year.setdefault(
+                    day.year, HabitYearBitmap(habit=habit, year=day.year)
+                ).set_day(day, completed)
+            stats.append(habit_stats)
+            year_bitmaps.extend(by_year.values())
+
+        HabitLog.objects.bulk_create(logs, batch_size=5000)
+        HabitStats.objects.bulk_create(stats)
+        HabitYearBitmap.objects.bulk_create(year_bitmaps)
+        # Left dirty: rollup_habit_months fills them from the bitmaps.
+        HabitMonthReport.objects.bulk_create(
+            [
+                HabitMonthReport(habit_id=habit_id, month=month)
+                for habit_id, month in {
+                    (log.habit_id, log.log_date.replace(day=1))
+                    for log in logs
+                }
+            ],
+            batch_size=5000,
+        )
+        return len(logs)
+
+    def generate_comments(self, users, goals, habits) -> list:
+        count = self.options["comments"]
+        comments = Commentary.objects.bulk_create([
+            Commentary(user=user, text=self.text(10))
+            for user in users
+            for _ in range(count)
+        ])
+
+        goals_by_user, habits_by_user = {}, {}
+        for goal in goals:
+            goals_by_user.setdefault(goal.user_id, []).append(goal)
+        for habit in habits:
+            habits_by_user.setdefault(habit.user_id, []).append(habit)
+
+        goal_links, habit_links = [], []
+        for comment in comments:
+            user_goals = goals_by_user.get(comment.user_id)
+            user_habits = habits_by_user.get(comment.user_id)
+            if user_goals and self.random.random() < 0.5:
+                goal_links.append(Commentary.goals.through(
+                    commentary=comment, goal=self.random.choice(user_goals)
+                ))
+            elif user_habits:
+                habit_links.append(Commentary.habits.through(
+                    commentary=comment, habit=self.random.choice(user_habits)
+                ))
+        Commentary.goals.through.objects.bulk_create(goal_links)
+        Commentary.habits.through.objects.bulk_create(habit_links)
+        return comments
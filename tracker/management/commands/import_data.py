@@ -0,0 +1,67 @@
+import sys
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from tracker.importers import DEFAULT_CHUNK_SIZE, READERS, import_stream
+
+
+class Command(BaseCommand):
+    help = "Stream goals, stages, habits and habit logs from CSV or JSONL."
+
+    def add_arguments(self, parser):
+        parser.add_argument("username")
+        parser.add_argument("path", help="File to import, or - for stdin.")
+        parser.add_argument(
+            "--format",
+            choices=sorted(READERS),
+            help="Input format (default: guessed from the file extension).",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help="Records per transaction.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            user = get_user_model().objects.get(username=options["username"])
+        except get_user_model().DoesNotExist:
+            raise CommandError(f"Unknown user {options['username']!r}")
+
+        path = options["path"]
+        data_format = options["format"] or path.rsplit(".", 1)[-1].lower()
+        if data_format not in READERS:
+            raise CommandError("Pass --format csv or --format jsonl.")
+
+        stream = (
+            sys.stdin if path == "-"
+            else open(path, encoding="utf-8", newline="")
+        )
+        try:
+            report = import_stream(
+                user,
+                stream,
+                data_format,
+                chunk_size=options["chunk_size"],
+                progress=self.write_progress,
+            )
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+        for line_number, reason in report["rejections"]:
+            self.stderr.write(f"Line {line_number}: {reason}")
+        imported = ", ".join(
+            f"{count} {record_type}s"
+            for record_type, count in report["imported"].items()
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {imported}; rejected {report['rejected']} rows."
+        ))
+
+    def write_progress(self, report):
+        self.stdout.write(
+            f"{report['rows']} rows read, {report['rejected']} rejected"
+        )
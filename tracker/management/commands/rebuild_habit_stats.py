@@ -0,0 +1,68 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from tracker.models import Habit, HabitStats, HabitYearBitmap
+from tracker.reports import mark_logged_months_dirty
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild HabitStats records and year bitmaps from the raw "
+        "HabitLog rows and archived days, and queue the habits' monthly "
+        "reports for rollup_habit_months."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "habit_ids",
+            nargs="*",
+            type=int,
+            help="Only process these habits (default: all habits).",
+        )
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Compare stored stats with the logs without writing.",
+        )
+
+    def handle(self, *args, **options):
+        habits = Habit.objects.order_by("pk")
+        if options["habit_ids"]:
+            habits = habits.filter(pk__in=options["habit_ids"])
+
+        stored = {}
+        if options["check"]:
+            stored = {
+                stats.pk: stats.as_dict()
+                for stats in HabitStats.objects.filter(habit__in=habits)
+            }
+        mismatches = 0
+        processed = 0
+
+        for habit_id in habits.values_list("pk", flat=True).iterator():
+            processed += 1
+            if not options["check"]:
+                HabitStats.rebuild(habit_id)
+                HabitYearBitmap.rebuild(habit_id)
+                mark_logged_months_dirty([habit_id])
+                continue
+
+            expected = HabitStats.compute(habit_id)
+            if stored.get(habit_id) != expected:
+                mismatches += 1
+                self.stdout.write(
+                    f"Habit {habit_id}: stored {stored.get(habit_id)}, "
+                    f"expected {expected}"
+                )
+
+        if options["check"]:
+            if mismatches:
+                raise CommandError(
+                    f"{mismatches} of {processed} habits have stale stats."
+                )
+            self.stdout.write(
+                self.style.SUCCESS(f"Stats match for {processed} habits.")
+            )
+        else:
+            self.stdout.write(
+                self.style.SUCCESS(f"Rebuilt stats for {processed} habits.")
+            )
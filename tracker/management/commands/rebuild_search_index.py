@@ -0,0 +1,25 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from tracker import search
+from tracker.models import SearchDocument
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search documents of every user."
+
+    def handle(self, *args, **options):
+        users = get_user_model().objects.order_by("pk").values_list(
+            "pk", flat=True
+        )
+        count = 0
+        for user_id in users.iterator():
+            with transaction.atomic():
+                SearchDocument.objects.filter(user_id=user_id).delete()
+                search.reindex_user(user_id)
+            count += 1
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt the search index of {count} users.")
+        )
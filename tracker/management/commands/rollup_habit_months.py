@@ -0,0 +1,40 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from tracker.reports import (
+    ROLLUP_BATCH_SIZE,
+    mark_logged_months_dirty,
+    rollup_dirty_reports,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the monthly habit reports of months whose logs "
+        "changed since the last run. Cheap enough to run from cron every "
+        "few minutes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Recompute every month with logs, not only changed ones.",
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=ROLLUP_BATCH_SIZE
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        if options["all"]:
+            mark_logged_months_dirty()
+
+        updated = rollup_dirty_reports(batch_size=options["batch_size"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Updated {updated} monthly reports in "
+                f"{time.perf_counter() - started:.2f}s."
+            )
+        )
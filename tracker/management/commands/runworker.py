@@ -0,0 +1,178 @@
+import multiprocessing
+import signal
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+import django
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from tracker.jobs import (
+    claim_jobs,
+    delete_finished_jobs,
+    release_jobs,
+    requeue_stale_jobs,
+    run_job,
+    run_job_in_process,
+    worker_name,
+)
+from tracker.models import Job
+
+# Seconds between two deletions of expired jobs.
+CLEANUP_INTERVAL = 3600
+
+
+class Command(BaseCommand):
+    help = (
+        "Run queued background jobs. Jobs are claimed from the database "
+        "and run in a pool of --concurrency processes; several workers "
+        "may run side by side. SIGINT or SIGTERM stops claiming and "
+        "waits for the running jobs."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=max(multiprocessing.cpu_count() // 2, 1),
+            help="Number of worker processes (default: half the CPUs).",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=1.0,
+            help="Seconds to wait for new jobs when the queue is empty.",
+        )
+        parser.add_argument(
+            "--burst",
+            action="store_true",
+            help="Exit once no job is runnable instead of polling.",
+        )
+        parser.add_argument(
+            "--inline",
+            action="store_true",
+            help="Run jobs one at a time in this process, without a pool.",
+        )
+
+    def handle(self, *args, **options):
+        self.stopping = False
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, self.stop)
+
+        self.worker = worker_name()
+        self.processed = 0
+        self.next_cleanup = 0
+        self.stdout.write(f"Worker {self.worker} started.")
+        if options["inline"]:
+            self.run_inline(options)
+        else:
+            self.run_pool(options)
+        self.stdout.write(
+            f"Worker {self.worker} stopped after {self.processed} jobs."
+        )
+
+    def stop(self, signum, frame):
+        self.stopping = True
+
+    def report(self, job_id, status) -> None:
+        self.processed += 1
+        self.stdout.write(f"Job {job_id}: {status}")
+
+    def clean_up(self) -> None:
+        """Release stale jobs and, every ``CLEANUP_INTERVAL`` seconds,
+        delete expired jobs and their files."""
+        requeue_stale_jobs()
+        if time.monotonic() >= self.next_cleanup:
+            delete_finished_jobs()
+            self.next_cleanup = time.monotonic() + CLEANUP_INTERVAL
+
+    def run_inline(self, options):
+        while not self.stopping:
+            self.clean_up()
+            jobs = claim_jobs(self.worker, 1)
+            if not jobs:
+                if options["burst"]:
+                    return
+                time.sleep(options["poll_interval"])
+                continue
+            self.report(jobs[0].pk, run_job(jobs[0].pk))
+
+    def start_pool(self, concurrency):
+        # Spawned children set Django up from scratch and open their own
+        # connections; nothing is shared with this process.
+        connections.close_all()
+        return ProcessPoolExecutor(
+            max_workers=concurrency,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=django.setup,
+        )
+
+    def restart_pool(self, pool, concurrency, job_ids):
+        """Replace a pool one of whose processes died. Its unfinished
+        jobs are requeued, or failed if that was their last attempt."""
+        pool.shutdown(wait=False, cancel_futures=True)
+        released = release_jobs(
+            Job.objects.filter(pk__in=job_ids, locked_by=self.worker),
+            "The worker process running the job died.",
+        )
+        self.stdout.write(
+            f"A worker process died; released {released} jobs."
+        )
+        return self.start_pool(concurrency)
+
+    def run_pool(self, options):
+        concurrency = options["concurrency"]
+        pool = self.start_pool(concurrency)
+        running = {}
+        try:
+            while True:
+                if not self.stopping:
+                    self.clean_up()
+                    claimed = [
+                        job.pk for job in claim_jobs(
+                            self.worker, concurrency - len(running)
+                        )
+                    ]
+                    try:
+                        for job_id in claimed:
+                            future = pool.submit(run_job_in_process, job_id)
+                            running[future] = job_id
+                    except BrokenProcessPool:
+                        pool = self.restart_pool(
+                            pool, concurrency, [*claimed, *running.values()]
+                        )
+                        running = {}
+                        continue
+
+                if not running:
+                    if self.stopping or options["burst"]:
+                        return
+                    time.sleep(options["poll_interval"])
+                    continue
+
+                done, _ = wait(
+                    running,
+                    timeout=options["poll_interval"],
+                    return_when=FIRST_COMPLETED,
+                )
+                broken = False
+                for future in done:
+                    if isinstance(future.exception(), BrokenProcessPool):
+                        broken = True
+                        continue
+                    job_id = running.pop(future)
+                    try:
+                        status = future.result()
+                    except Exception as error:
+                        # The job stays running and is requeued once its
+                        # lock times out.
+                        status = f"crashed ({error!r})"
+                    self.report(job_id, status)
+                if broken:
+                    pool = self.restart_pool(
+                        pool, concurrency, list(running.values())
+                    )
+                    running = {}
+        finally:
+            pool.shutdown(wait=True)
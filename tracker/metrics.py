@@ -0,0 +1,274 @@
+"""In-process request metrics shared across worker processes.
+
+Every process appends its samples to its own memory-mapped file in
+``METRICS_DIR``: a flat list of ``(key, float64)`` entries that only the
+owning process writes. A scrape of ``/metrics`` on any worker reads and
+sums the files of all workers, so one scrape reports the whole server,
+in the Prometheus text format.
+
+Files of exited workers are kept so counters never go backwards; clear
+``METRICS_DIR`` when the server is (re)started.
+"""
+import json
+import mmap
+import os
+import struct
+import tempfile
+import threading
+from pathlib import Path
+
+from django.conf import settings
+
+HEADER = struct.Struct("<Q")
+LENGTH = struct.Struct("<I")
+VALUE = struct.Struct("<d")
+INITIAL_FILE_SIZE = 64 * 1024
+
+DURATION_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200)
+
+METRICS = {
+    "tracker_http_requests_total": (
+        "counter", "HTTP requests by URL name, method and status."
+    ),
+    "tracker_http_exceptions_total": (
+        "counter", "Unhandled exceptions raised by views, by URL name."
+    ),
+    "tracker_http_request_duration_seconds": (
+        "histogram", "Request latency by URL name."
+    ),
+    "tracker_db_queries_total": (
+        "counter", "Database queries by URL name."
+    ),
+    "tracker_db_queries_per_request": (
+        "histogram", "Database queries per request by URL name."
+    ),
+}
+HISTOGRAM_BUCKETS = {
+    "tracker_http_request_duration_seconds": DURATION_BUCKETS,
+    "tracker_db_queries_per_request": QUERY_BUCKETS,
+}
+
+
+def metrics_dir() -> Path:
+    return Path(
+        getattr(settings, "METRICS_DIR", None)
+        or Path(tempfile.gettempdir()) / "tracker-metrics"
+    )
+
+
+class MmapStore:
+    """Append-only ``key -> float`` map in a memory-mapped file.
+
+    Layout: an 8-byte count of used bytes, then entries of a 4-byte key
+    length, the UTF-8 key padded to 8 bytes, and a float64 value. A new
+    entry is written before the used count is bumped, so readers never
+    see a half-written entry.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.file = open(path, "a+b")
+        if os.fstat(self.file.fileno()).st_size == 0:
+            self.file.truncate(INITIAL_FILE_SIZE)
+        self.mmap = mmap.mmap(self.file.fileno(), 0)
+        if HEADER.unpack_from(self.mmap, 0)[0] == 0:
+            HEADER.pack_into(self.mmap, 0, HEADER.size)
+        self.positions = {
+            key: position for key, position, _ in _entries(self.mmap)
+        }
+
+    def inc(self, key: str, amount: float = 1.0) -> None:
+        with self.lock:
+            position = self.positions.get(key)
+            if position is None:
+                position = self._add(key)
+            value = VALUE.unpack_from(self.mmap, position)[0]
+            VALUE.pack_into(self.mmap, position, value + amount)
+
+    def _add(self, key: str) -> int:
+        encoded = key.encode()
+        padded = len(encoded) + (-(LENGTH.size + len(encoded)) % 8)
+        entry_size = LENGTH.size + padded + VALUE.size
+        used = HEADER.unpack_from(self.mmap, 0)[0]
+
+        if used + entry_size > len(self.mmap):
+            new_size = max(len(self.mmap) * 2, used + entry_size)
+            self.mmap.close()
+            self.file.truncate(new_size)
+            self.mmap = mmap.mmap(self.file.fileno(), 0)
+
+        LENGTH.pack_into(self.mmap, used, len(encoded))
+        self.mmap[used + LENGTH.size:used + LENGTH.size + len(encoded)] = (
+            encoded
+        )
+        position = used + LENGTH.size + padded
+        VALUE.pack_into(self.mmap, position, 0.0)
+        HEADER.pack_into(self.mmap, 0, used + entry_size)
+        self.positions[key] = position
+        return position
+
+
+def _entries(buffer):
+    """Yield ``(key, value position, value)`` of every complete entry.
+
+    A reader may have mapped the file before its owner grew it, so the
+    used count can point past the end of ``buffer``; entries beyond it
+    are skipped until the next read.
+    """
+    used = min(HEADER.unpack_from(buffer, 0)[0], len(buffer))
+    offset = HEADER.size
+    while offset + LENGTH.size <= used:
+        length = LENGTH.unpack_from(buffer, offset)[0]
+        key_start = offset + LENGTH.size
+        position = key_start + length + (-(LENGTH.size + length) % 8)
+        if position + VALUE.size > used:
+            return
+        key = bytes(buffer[key_start:key_start + length]).decode()
+        yield key, position, VALUE.unpack_from(buffer, position)[0]
+        offset = position + VALUE.size
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> MmapStore:
+    """This process's store; a forked worker gets a file of its own."""
+    global _store
+    path = metrics_dir() / f"{os.getpid()}.db"
+    if _store is None or _store.path != path:
+        with _store_lock:
+            if _store is None or _store.path != path:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                _store = MmapStore(path)
+    return _store
+
+
+def _key(name: str, **labels) -> str:
+    return json.dumps([name, labels], sort_keys=True)
+
+
+def inc(name: str, amount: float = 1.0, **labels) -> None:
+    get_store().inc(_key(name, **labels), amount)
+
+
+def observe(name: str, value: float, **labels) -> None:
+    """Add a histogram sample; buckets are stored non-cumulative."""
+    le = next(
+        (str(bound) for bound in HISTOGRAM_BUCKETS[name] if value <= bound),
+        "+Inf",
+    )
+    store = get_store()
+    store.inc(_key(f"{name}_bucket", le=le, **labels))
+    store.inc(_key(f"{name}_sum", **labels), value)
+    store.inc(_key(f"{name}_count", **labels))
+
+
+def record_request(view: str, method: str, status: int, seconds: float,
+                   queries: int) -> None:
+    inc(
+        "tracker_http_requests_total",
+        view=view, method=method, status=str(status),
+    )
+    observe("tracker_http_request_duration_seconds", seconds, view=view)
+    inc("tracker_db_queries_total", queries, view=view)
+    observe("tracker_db_queries_per_request", queries, view=view)
+
+
+def collect() -> dict:
+    """Sum the samples of every worker file: ``{key: value}``."""
+    totals = {}
+    for path in sorted(metrics_dir().glob("*.db")):
+        with open(path, "rb") as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                continue
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                for key, _, value in _entries(buf):
+                    totals[key] = totals.get(key, 0.0) + value
+    return totals
+
+
+def _escape_label_value(value) -> str:
+    return (
+        str(value).replace("\\", "\\\\")
+        .replace('"', '\\"')
+        .replace("\n", "\\n")
+    )
+
+
+def _format_labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    pairs = (
+        f'{name}="{_escape_label_value(value)}"'
+        for name, value in sorted(labels.items())
+    )
+    return "{" + ",".join(pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+def render_prometheus(totals: dict) -> str:
+    samples = {}
+    for key, value in totals.items():
+        name, labels = json.loads(key)
+        samples.setdefault(name, []).append((labels, value))
+
+    lines = []
+    for metric, (kind, help_text) in METRICS.items():
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} {kind}")
+        if kind == "counter":
+            for labels, value in sorted(
+                samples.get(metric, []), key=lambda sample: str(sample[0])
+            ):
+                lines.append(
+                    f"{metric}{_format_labels(labels)} {_format_value(value)}"
+                )
+            continue
+
+        lines.extend(_histogram_lines(metric, samples))
+    return "\n".join(lines) + "\n"
+
+
+def _histogram_lines(metric: str, samples: dict) -> list:
+    bounds = [str(bound) for bound in HISTOGRAM_BUCKETS[metric]] + ["+Inf"]
+    buckets = {}
+    for labels, value in samples.get(f"{metric}_bucket", []):
+        le = labels.pop("le")
+        series = json.dumps(labels, sort_keys=True)
+        buckets.setdefault(series, dict.fromkeys(bounds, 0.0))[le] += value
+    sums = {
+        json.dumps(labels, sort_keys=True): value
+        for labels, value in samples.get(f"{metric}_sum", [])
+    }
+    counts = {
+        json.dumps(labels, sort_keys=True): value
+        for labels, value in samples.get(f"{metric}_count", [])
+    }
+
+    lines = []
+    for series in sorted(buckets):
+        labels = json.loads(series)
+        cumulative = 0.0
+        for le in bounds:
+            cumulative += buckets[series][le]
+            lines.append(
+                f"{metric}_bucket{_format_labels({**labels, 'le': le})} "
+                f"{_format_value(cumulative)}"
+            )
+        lines.append(
+            f"{metric}_sum{_format_labels(labels)} "
+            f"{_format_value(sums.get(series, 0.0))}"
+        )
+        lines.append(
+            f"{metric}_count{_format_labels(labels)} "
+            f"{_format_value(counts.get(series, 0.0))}"
+        )
+    return lines
@@ -0,0 +1,224 @@
+"""Opt-in per-request profiling and metrics.
+
+``ProfilingMiddleware`` measures, for a sample of requests:
+
+* ``db``: query count and time, through a connection execute wrapper;
+* ``tpl``: time spent rendering templates (outermost renders only);
+* ``view``: time from URL resolution to the view's response, including
+  inner middleware and template rendering;
+* ``total``: time spent in the middleware stack below this one.
+
+Results go to a ``Server-Timing`` header and to one JSON log line on the
+``tracker.profiling`` logger, keyed by URL name. With
+``PROFILING_ENABLED`` off Django drops the middleware at startup, so it
+costs nothing.
+
+``MetricsMiddleware`` records every request's URL name, status, latency
+and query count into ``tracker.metrics``, scraped at ``/metrics``. It
+is likewise dropped unless ``METRICS_ENABLED`` is on.
+
+``SlowQueryMiddleware`` logs statements slower than
+``SLOW_QUERY_THRESHOLD_MS`` with their plans, see ``tracker.slow_queries``;
+it is dropped while the threshold is unset.
+"""
+import json
+import logging
+import random
+import time
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.template.base import Template
+
+from tracker import metrics
+from tracker.slow_queries import capture_slow_queries
+
+logger = logging.getLogger("tracker.profiling")
+
+_current_profile = ContextVar("tracker_profile", default=None)
+_templates_instrumented = False
+
+
+class RequestProfile:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.view_started = None
+        self.view_ms = 0.0
+        self.db_queries = 0
+        self.db_ms = 0.0
+        self.template_ms = 0.0
+        self.template_depth = 0
+
+    def record_query(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_queries += 1
+            self.db_ms += (time.perf_counter() - started) * 1000
+
+    def as_dict(self, total_ms: float) -> dict:
+        return {
+            "total_ms": round(total_ms, 2),
+            "view_ms": round(self.view_ms, 2),
+            "db_ms": round(self.db_ms, 2),
+            "db_queries": self.db_queries,
+            "template_ms": round(self.template_ms, 2),
+        }
+
+
+def _instrument_templates() -> None:
+    """Time ``Template.render`` while a sampled request is profiled."""
+    global _templates_instrumented
+    if _templates_instrumented:
+        return
+
+    original_render = Template.render
+
+    def render(self, context):
+        profile = _current_profile.get()
+        if profile is None:
+            return original_render(self, context)
+
+        profile.template_depth += 1
+        started = time.perf_counter()
+        try:
+            return original_render(self, context)
+        finally:
+            profile.template_depth -= 1
+            if profile.template_depth == 0:
+                profile.template_ms += (time.perf_counter() - started) * 1000
+
+    Template.render = render
+    _templates_instrumented = True
+
+
+class ProfilingMiddleware:
+    def __init__(self, get_response):
+        if not getattr(settings, "PROFILING_ENABLED", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, "PROFILING_SAMPLE_RATE", 1.0)
+        _instrument_templates()
+
+    def __call__(self, request):
+        if random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        profile = RequestProfile()
+        request._profile = profile
+        token = _current_profile.set(profile)
+        try:
+            with ExitStack() as stack:
+                for alias in connections:
+                    stack.enter_context(
+                        connections[alias].execute_wrapper(
+                            profile.record_query
+                        )
+                    )
+                response = self.get_response(request)
+                if profile.view_started is not None:
+                    profile.view_ms = (
+                        time.perf_counter() - profile.view_started
+                    ) * 1000
+        finally:
+            _current_profile.reset(token)
+        total_ms = (time.perf_counter() - profile.started) * 1000
+
+        response["Server-Timing"] = ", ".join([
+            f'db;dur={profile.db_ms:.2f};desc="{profile.db_queries} queries"',
+            f"tpl;dur={profile.template_ms:.2f}",
+            f"view;dur={profile.view_ms:.2f}",
+            f"total;dur={total_ms:.2f}",
+        ])
+        match = request.resolver_match
+        logger.info(json.dumps({
+            "url_name": match.view_name if match else None,
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            **profile.as_dict(total_ms),
+        }))
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        profile = getattr(request, "_profile", None)
+        if profile is not None:
+            profile.view_started = time.perf_counter()
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def metrics_view_name(request) -> str:
+    """Label requests by URL name, lumping non-tracker routes together."""
+    match = request.resolver_match
+    if match and match.view_name.startswith("tracker:"):
+        return match.view_name
+    return "other"
+
+
+METRICS_METHODS = {"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"}
+
+
+def metrics_method(request) -> str:
+    """Label requests by HTTP method; clients can send any method name,
+    so unknown ones share one label."""
+    if request.method in METRICS_METHODS:
+        return request.method
+    return "other"
+
+
+class MetricsMiddleware:
+    def __init__(self, get_response):
+        if not getattr(settings, "METRICS_ENABLED", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        counter = QueryCounter()
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(
+                    connections[alias].execute_wrapper(counter)
+                )
+            response = self.get_response(request)
+
+        metrics.record_request(
+            metrics_view_name(request),
+            metrics_method(request),
+            response.status_code,
+            time.perf_counter() - started,
+            counter.count,
+        )
+        return response
+
+    def process_exception(self, request, exception):
+        metrics.inc(
+            "tracker_http_exceptions_total", view=metrics_view_name(request)
+        )
+
+
+class SlowQueryMiddleware:
+    def __init__(self, get_response):
+        self.threshold_ms = getattr(settings, "SLOW_QUERY_THRESHOLD_MS", None)
+        if self.threshold_ms is None:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with capture_slow_queries(
+            view_name=lambda: metrics_view_name(request),
+            threshold_ms=self.threshold_ms,
+        ):
+            return self.get_response(request)
@@ -0,0 +1,36 @@
+# Generated by Django 4.1.7 on 2026-10-18 10:35
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tracker", "0009_remove_habit_completion_status_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="HabitStats",
+            fields=[
+                (
+                    "habit",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="stats",
+                        serialize=False,
+                        to="tracker.habit",
+                    ),
+                ),
+                ("completed_count", models.PositiveIntegerField(default=0)),
+                ("missed_count", models.PositiveIntegerField(default=0)),
+                ("last_log_date", models.DateField(blank=True, null=True)),
+                ("current_streak", models.PositiveIntegerField(default=0)),
+                ("longest_streak", models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                "verbose_name_plural": "habit stats",
+            },
+        ),
+    ]
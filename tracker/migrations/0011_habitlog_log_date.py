@@ -0,0 +1,68 @@
+# Generated by Django 4.1.7 on 2026-10-18 10:37
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+BATCH_SIZE = 2000
+
+
+def backfill_log_date(apps, schema_editor):
+    """Fill log_date from created_at and drop same-day duplicates.
+
+    Only the most recent log of a day is kept, matching what a user saw
+    last on the habit page.
+    """
+    HabitLog = apps.get_model("tracker", "HabitLog")
+    db_alias = schema_editor.connection.alias
+    logs = HabitLog.objects.using(db_alias).order_by("habit_id", "-id")
+
+    current_habit_id = None
+    seen = set()
+    duplicates = []
+    batch = []
+    for log in logs.only("id", "habit_id", "created_at").iterator():
+        if log.habit_id != current_habit_id:
+            current_habit_id = log.habit_id
+            seen = set()
+        log.log_date = timezone.localdate(log.created_at)
+        if log.log_date in seen:
+            duplicates.append(log.id)
+            continue
+        seen.add(log.log_date)
+        batch.append(log)
+        if len(batch) >= BATCH_SIZE:
+            HabitLog.objects.using(db_alias).bulk_update(batch, ["log_date"])
+            batch = []
+
+    HabitLog.objects.using(db_alias).bulk_update(batch, ["log_date"])
+    for start in range(0, len(duplicates), BATCH_SIZE):
+        HabitLog.objects.using(db_alias).filter(
+            id__in=duplicates[start:start + BATCH_SIZE]
+        ).delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tracker", "0010_habitstats"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="habitlog",
+            name="log_date",
+            field=models.DateField(null=True),
+        ),
+        migrations.RunPython(backfill_log_date, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="habitlog",
+            name="log_date",
+            field=models.DateField(default=timezone.localdate),
+        ),
+        migrations.AddConstraint(
+            model_name="habitlog",
+            constraint=models.UniqueConstraint(
+                fields=("habit", "log_date"), name="unique_habit_log_per_day"
+            ),
+        ),
+    ]
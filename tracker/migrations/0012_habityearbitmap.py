@@ -0,0 +1,90 @@
+# Generated by Django 4.1.7 on 2026-10-18 10:39
+
+from django.db import migrations, models
+import django.db.models.deletion
+import tracker.bitmaps
+from tracker import bitmaps
+
+
+def build_bitmaps(apps, schema_editor):
+    HabitLog = apps.get_model("tracker", "HabitLog")
+    HabitYearBitmap = apps.get_model("tracker", "HabitYearBitmap")
+    db_alias = schema_editor.connection.alias
+
+    current = None
+    years = {}
+    logs = (
+        HabitLog.objects.using(db_alias)
+        .order_by("habit_id")
+        .values_list("habit_id", "log_date", "completed")
+    )
+    for habit_id, log_date, completed in logs.iterator():
+        if habit_id != current:
+            HabitYearBitmap.objects.using(db_alias).bulk_create(years.values())
+            current = habit_id
+            years = {}
+        bitmap = years.setdefault(
+            log_date.year,
+            HabitYearBitmap(
+                habit_id=habit_id,
+                year=log_date.year,
+                completed=bitmaps.empty_bitmap(),
+                logged=bitmaps.empty_bitmap(),
+            ),
+        )
+        index = bitmaps.day_index(log_date)
+        bitmap.completed = bitmaps.set_bit(bitmap.completed, index, completed)
+        bitmap.logged = bitmaps.set_bit(bitmap.logged, index, True)
+
+    HabitYearBitmap.objects.using(db_alias).bulk_create(years.values())
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tracker", "0011_habitlog_log_date"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="HabitYearBitmap",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("year", models.PositiveSmallIntegerField()),
+                (
+                    "completed",
+                    models.BinaryField(
+                        default=tracker.bitmaps.empty_bitmap, max_length=46
+                    ),
+                ),
+                (
+                    "logged",
+                    models.BinaryField(
+                        default=tracker.bitmaps.empty_bitmap, max_length=46
+                    ),
+                ),
+                (
+                    "habit",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="year_bitmaps",
+                        to="tracker.habit",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="habityearbitmap",
+            constraint=models.UniqueConstraint(
+                fields=("habit", "year"), name="unique_habit_year_bitmap"
+            ),
+        ),
+        migrations.RunPython(build_bitmaps, migrations.RunPython.noop),
+    ]
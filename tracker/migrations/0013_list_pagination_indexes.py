@@ -0,0 +1,24 @@
+# Generated by Django 4.1.7 on 2026-10-18 10:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tracker", "0012_habityearbitmap"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="goal",
+            index=models.Index(
+                fields=["user", "created_at", "id"], name="goal_user_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="habit",
+            index=models.Index(
+                fields=["user", "created_at", "id"], name="habit_user_created_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,105 @@
+# Generated by Django 4.1.7 on 2026-10-18 10:46
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def install_index(apps, schema_editor):
+    from tracker.search import install_index
+
+    install_index(schema_editor)
+
+
+def uninstall_index(apps, schema_editor):
+    from tracker.search import uninstall_index
+
+    uninstall_index(schema_editor)
+
+
+def index_existing_objects(apps, schema_editor):
+    SearchDocument = apps.get_model("tracker", "SearchDocument")
+    db_alias = schema_editor.connection.alias
+    sources = [
+        ("goal", "Goal", lambda goal: (goal.name, goal.description)),
+        (
+            "habit",
+            "Habit",
+            lambda habit: (
+                habit.name,
+                "\n".join(filter(None, [habit.description, habit.month_goal])),
+            ),
+        ),
+        ("commentary", "Commentary", lambda commentary: ("", commentary.text)),
+    ]
+    for entity, model_name, text in sources:
+        model = apps.get_model("tracker", model_name)
+        documents = []
+        for obj in model.objects.using(db_alias).iterator():
+            title, body = text(obj)
+            documents.append(
+                SearchDocument(
+                    user_id=obj.user_id,
+                    entity=entity,
+                    object_id=obj.pk,
+                    title=title,
+                    body=body or "",
+                )
+            )
+            if len(documents) >= 1000:
+                SearchDocument.objects.using(db_alias).bulk_create(documents)
+                documents = []
+        SearchDocument.objects.using(db_alias).bulk_create(documents)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tracker", "0013_list_pagination_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SearchDocument",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "entity",
+                    models.CharField(
+                        choices=[
+                            ("goal", "Goal"),
+                            ("habit", "Habit"),
+                            ("commentary", "Commentary"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("object_id", models.BigIntegerField()),
+                ("title", models.CharField(blank=True, max_length=255)),
+                ("body", models.TextField(blank=True)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="search_documents",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="searchdocument",
+            constraint=models.UniqueConstraint(
+                fields=("entity", "object_id"), name="unique_search_document"
+            ),
+        ),
+        migrations.RunPython(install_index, uninstall_index),
+        migrations.RunPython(index_existing_objects, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 4.1.7 on 2026-10-18 10:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tracker", "0014_searchdocument"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="goal",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name="goalstage",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name="habit",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 4.1.7 on 2026-10-18 11:14
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tracker", "0015_updated_at"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SlowQuery",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("fingerprint", models.CharField(max_length=40, unique=True)),
+                ("normalized_sql", models.TextField()),
+                ("sql", models.TextField()),
+                ("params", models.TextField(blank=True)),
+                ("view_name", models.CharField(blank=True, max_length=255)),
+                ("plan", models.TextField(blank=True)),
+                ("count", models.PositiveIntegerField(default=0)),
+                ("total_ms", models.FloatField(default=0)),
+                ("max_ms", models.FloatField(default=0)),
+                ("first_seen", models.DateTimeField(auto_now_add=True)),
+                ("last_seen", models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                "verbose_name_plural": "slow queries",
+                "ordering": ["-max_ms"],
+            },
+        ),
+    ]
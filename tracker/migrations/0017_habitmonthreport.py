@@ -0,0 +1,81 @@
+# Generated by Django 4.1.7 on 2026-10-18 11:25
+
+from django.db import migrations, models
+from django.db.models.functions import TruncMonth
+import django.db.models.deletion
+import django.utils.timezone
+
+
+def mark_logged_months_dirty(apps, schema_editor):
+    """Queue every month that already has logs for the first rollup."""
+    HabitLog = apps.get_model("tracker", "HabitLog")
+    HabitMonthReport = apps.get_model("tracker", "HabitMonthReport")
+    months = (
+        HabitLog.objects.annotate(month=TruncMonth("log_date"))
+        .values_list("habit_id", "month")
+        .distinct()
+        .order_by()
+    )
+    batch = []
+    for habit_id, month in months.iterator(chunk_size=2000):
+        batch.append(HabitMonthReport(habit_id=habit_id, month=month))
+        if len(batch) >= 2000:
+            HabitMonthReport.objects.bulk_create(batch)
+            batch = []
+    HabitMonthReport.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tracker", "0016_slowquery"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="HabitMonthReport",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("month", models.DateField()),
+                ("completed_days", models.PositiveSmallIntegerField(default=0)),
+                ("missed_days", models.PositiveSmallIntegerField(default=0)),
+                ("ignored_days", models.PositiveSmallIntegerField(default=0)),
+                ("computed_through", models.DateField(blank=True, null=True)),
+                ("dirty", models.BooleanField(default=True)),
+                (
+                    "logs_changed_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                (
+                    "habit",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="month_reports",
+                        to="tracker.habit",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="habitmonthreport",
+            index=models.Index(
+                condition=models.Q(("dirty", True)),
+                fields=["month"],
+                name="habit_month_report_dirty_idx",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="habitmonthreport",
+            constraint=models.UniqueConstraint(
+                fields=("habit", "month"), name="unique_habit_month_report"
+            ),
+        ),
+        migrations.RunPython(mark_logged_months_dirty, migrations.RunPython.noop),
+    ]
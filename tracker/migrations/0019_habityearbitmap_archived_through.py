@@ -0,0 +1,17 @@
+# Generated by Django 4.1.7 on 2026-10-18 11:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tracker", "0018_job"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="habityearbitmap",
+            name="archived_through",
+            field=models.DateField(blank=True, null=True),
+        ),
+    ]
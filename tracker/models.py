@@ -1,5 +1,11 @@
+from datetime import date, timedelta
+
 from django.contrib.auth.models import AbstractUser
-from django.db import models
+from django.db import models, transaction
+from django.dispatch import Signal
+from django.utils import timezone
+
+from tracker import bitmaps
 
 
 class User(AbstractUser):
@@ -16,6 +22,7 @@ class Goal(models.Model):
     description = models.TextField(blank=True, null=True)
     deadline = models.DateTimeField()
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     STATUS_CHOICES = [
         ("active", "Active"),
@@ -29,6 +36,14 @@ class Goal(models.Model):
         default="active"
     )
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["user", "created_at", "id"],
+                name="goal_user_created_idx"
+            )
+        ]
+
     def __str__(self):
         return self.name
 
@@ -43,6 +58,7 @@ class GoalStage(models.Model):
     description = models.TextField(blank=True, null=True)
     deadline = models.DateTimeField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     STATUS_CHOICES = [
         ("active", "Active"),
@@ -70,11 +86,80 @@ class Habit(models.Model):
     description = models.TextField(blank=True, null=True)
     month_goal = models.TextField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["user", "created_at", "id"],
+                name="habit_user_created_idx"
+            )
+        ]
 
     def __str__(self) -> str:
         return self.name
 
 
+habit_logs_written = Signal()
+"""Sent after habit logs are inserted or upserted, inside the transaction.
+
+Receivers get ``habit_id`` and ``entries``, a list of
+``(log_date, completed)`` pairs sorted by date.
+"""
+
+habit_log_deleted = Signal()
+"""Sent after a single habit log is deleted, inside the transaction.
+
+Receivers get ``habit_id`` and ``log_date``. Bulk and cascade deletes do
+not send it.
+"""
+
+
+class HabitLogQuerySet(models.QuerySet):
+    def history(self, habit_id: int) -> dict:
+        """``{log_date: completed}`` for every logged day of a habit.
+
+        Days of archived logs are read back from the year bitmaps; a
+        live row wins over an archived day.
+        """
+        days = HabitYearBitmap.archived_days(habit_id)
+        days.update(
+            self.filter(habit_id=habit_id).values_list(
+                "log_date", "completed"
+            ).iterator()
+        )
+        return days
+
+    def upsert(self, logs: list) -> None:
+        """Insert logs, overwriting ``completed`` for days already logged.
+
+        Duplicate submissions for the same habit and day collapse into
+        one row through ``INSERT ... ON CONFLICT DO UPDATE``; within
+        ``logs`` itself the last log of a day wins.
+        """
+        unique_logs = {}
+        entries = {}
+        for log in logs:
+            unique_logs[log.habit_id, log.log_date] = log
+            entries.setdefault(log.habit_id, {})[log.log_date] = (
+                log.completed
+            )
+
+        with transaction.atomic(using=self.db):
+            self.bulk_create(
+                unique_logs.values(),
+                update_conflicts=True,
+                unique_fields=["habit", "log_date"],
+                update_fields=["completed"],
+            )
+            for habit_id, days in entries.items():
+                habit_logs_written.send(
+                    sender=HabitLog,
+                    habit_id=habit_id,
+                    entries=sorted(days.items()),
+                )
+
+
 class HabitLog(models.Model):
     habit = models.ForeignKey(
         Habit,
@@ -82,10 +167,370 @@ class HabitLog(models.Model):
         related_name="logs"
     )
     completed = models.BooleanField()
+    log_date = models.DateField(default=timezone.localdate)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = HabitLogQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["habit", "log_date"],
+                name="unique_habit_log_per_day"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.log_date}"
+
+    def save(self, *args, **kwargs):
+        created = self._state.adding
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if created:
+                habit_logs_written.send(
+                    sender=HabitLog,
+                    habit_id=self.habit_id,
+                    entries=[(self.log_date, self.completed)],
+                )
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            result = super().delete(*args, **kwargs)
+            # The stats read archived days from the bitmaps.
+            HabitYearBitmap.clear_day(self.habit_id, self.log_date)
+            HabitStats.rebuild(self.habit_id)
+            habit_log_deleted.send(
+                sender=HabitLog,
+                habit_id=self.habit_id,
+                log_date=self.log_date,
+            )
+        return result
+
+
+class HabitStats(models.Model):
+    habit = models.OneToOneField(
+        Habit,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="stats"
+    )
+    completed_count = models.PositiveIntegerField(default=0)
+    missed_count = models.PositiveIntegerField(default=0)
+    last_log_date = models.DateField(blank=True, null=True)
+    current_streak = models.PositiveIntegerField(default=0)
+    longest_streak = models.PositiveIntegerField(default=0)
+
+    STAT_FIELDS = [
+        "completed_count",
+        "missed_count",
+        "last_log_date",
+        "current_streak",
+        "longest_streak",
+    ]
+
+    class Meta:
+        verbose_name_plural = "habit stats"
+
+    def __str__(self):
+        return f"Stats for habit {self.habit_id}"
+
+    def active_streak(self, today: date = None) -> int:
+        """Current streak as seen from ``today``.
+
+        The stored streak ends at the last log; once a whole day passes
+        without a log the streak is broken.
+        """
+        today = today or timezone.localdate()
+        if (
+            self.last_log_date is None
+            or self.last_log_date < today - timedelta(days=1)
+        ):
+            return 0
+        return self.current_streak
+
+    def as_dict(self) -> dict:
+        return {field: getattr(self, field) for field in self.STAT_FIELDS}
+
+    @classmethod
+    def for_habit(cls, habit: Habit) -> "HabitStats":
+        """Return the stats of a habit, building them on first access."""
+        try:
+            return habit.stats
+        except cls.DoesNotExist:
+            return cls.rebuild(habit.pk)
+
+    @classmethod
+    def record_logs(cls, habit_id: int, entries: list) -> "HabitStats":
+        """Fold new ``(log_date, completed)`` entries into a habit's stats.
+
+        Must run in the transaction that wrote the logs. Entries dated
+        after the last known log are applied in O(1) each; anything
+        dated on or before it, or a habit without a stats row yet, falls
+        back to a full rebuild.
+        """
+        stats, created = cls.objects.select_for_update().get_or_create(
+            habit_id=habit_id
+        )
+        if created:
+            return cls.rebuild(habit_id)
+        first_date = min(log_date for log_date, _ in entries)
+        if stats.last_log_date and first_date <= stats.last_log_date:
+            return cls.rebuild(habit_id)
+
+        for log_date, completed in sorted(entries):
+            stats._apply(log_date, completed)
+        stats.save()
+        return stats
+
+    def _apply(self, log_date: date, completed: bool) -> None:
+        if completed:
+            self.completed_count += 1
+            follows_last_log = (
+                self.last_log_date == log_date - timedelta(days=1)
+            )
+            self.current_streak = (
+                self.current_streak + 1 if follows_last_log else 1
+            )
+            self.longest_streak = max(
+                self.longest_streak, self.current_streak
+            )
+        else:
+            self.missed_count += 1
+            self.current_streak = 0
+
+        self.last_log_date = log_date
+
+    @classmethod
+    def compute(cls, habit_id: int) -> dict:
+        """Compute the stats of a habit from its raw and archived logs."""
+        values = dict.fromkeys(cls.STAT_FIELDS, 0)
+        values["last_log_date"] = None
+        completed_dates = set()
+        log_dates = set()
+
+        for log_date, completed in HabitLog.objects.history(
+            habit_id
+        ).items():
+            log_dates.add(log_date)
+            if completed:
+                values["completed_count"] += 1
+                completed_dates.add(log_date)
+            else:
+                values["missed_count"] += 1
+
+        streak = 0
+        previous_date = None
+        for log_date in sorted(log_dates):
+            if log_date not in completed_dates:
+                streak = 0
+            elif previous_date == log_date - timedelta(days=1):
+                streak += 1
+            else:
+                streak = 1
+            previous_date = log_date
+            values["longest_streak"] = max(values["longest_streak"], streak)
+
+        values["current_streak"] = streak
+        values["last_log_date"] = previous_date
+        return values
+
+    @classmethod
+    def rebuild(cls, habit_id: int) -> "HabitStats":
+        stats, _ = cls.objects.update_or_create(
+            habit_id=habit_id, defaults=cls.compute(habit_id)
+        )
+        return stats
+
+
+class HabitYearBitmap(models.Model):
+    """One year of a habit's history as two 366-bit day bitmaps.
+
+    Logs of the days up to ``archived_through`` may have been deleted by
+    ``tracker.archive``; for those days the bitmaps are the only record.
+    """
+
+    habit = models.ForeignKey(
+        Habit,
+        on_delete=models.CASCADE,
+        related_name="year_bitmaps"
+    )
+    year = models.PositiveSmallIntegerField()
+    completed = models.BinaryField(
+        max_length=bitmaps.YEAR_BYTES,
+        default=bitmaps.empty_bitmap
+    )
+    logged = models.BinaryField(
+        max_length=bitmaps.YEAR_BYTES,
+        default=bitmaps.empty_bitmap
+    )
+    archived_through = models.DateField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["habit", "year"],
+                name="unique_habit_year_bitmap"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.habit_id}/{self.year}"
+
+    def set_day(self, day: date, completed: bool) -> None:
+        index = bitmaps.day_index(day)
+        self.completed = bitmaps.set_bit(self.completed, index, completed)
+        self.logged = bitmaps.set_bit(self.logged, index, True)
+
+    def summary(self, first_day: date, last_day: date) -> dict:
+        """Totals for the days of this year between the two dates."""
+        first = max(first_day, date(self.year, 1, 1))
+        last = min(last_day, date(self.year, 12, 31))
+        return bitmaps.summarize(
+            self.completed,
+            self.logged,
+            bitmaps.day_index(first),
+            bitmaps.day_index(last) if last >= first else -1,
+        )
+
+    @classmethod
+    def record_logs(cls, habit_id: int, entries: list,
+                    archived: bool = False) -> None:
+        """Set the bits of ``(log_date, completed)`` entries.
+
+        Must run in the transaction that wrote the logs, or with
+        ``archived`` in the one that deletes them for archival.
+        """
+        by_year = {}
+        for log_date, completed in entries:
+            by_year.setdefault(log_date.year, []).append(
+                (log_date, completed)
+            )
+
+        for year, days in by_year.items():
+            bitmap, _ = cls.objects.select_for_update().get_or_create(
+                habit_id=habit_id, year=year
+            )
+            for log_date, completed in days:
+                bitmap.set_day(log_date, completed)
+            last_day = max(log_date for log_date, _ in days)
+            if archived and (
+                bitmap.archived_through is None
+                or bitmap.archived_through < last_day
+            ):
+                bitmap.archived_through = last_day
+            bitmap.save()
+
+    @classmethod
+    def clear_day(cls, habit_id: int, day: date) -> None:
+        bitmap = cls.objects.select_for_update().filter(
+            habit_id=habit_id, year=day.year
+        ).first()
+        if bitmap is None:
+            return
+        index = bitmaps.day_index(day)
+        bitmap.completed = bitmaps.set_bit(bitmap.completed, index, False)
+        bitmap.logged = bitmaps.set_bit(bitmap.logged, index, False)
+        bitmap.save()
+
+    @classmethod
+    def archived_days(cls, habit_id: int) -> dict:
+        """``{log_date: completed}`` of the archived days of a habit."""
+        rows = cls.objects.filter(
+            habit_id=habit_id, archived_through__isnull=False
+        ).values_list("year", "completed", "logged", "archived_through")
+        days = {}
+        for year, completed, logged, archived_through in rows:
+            days.update(
+                bitmaps.iter_days(
+                    year, completed, logged,
+                    bitmaps.day_index(archived_through),
+                )
+            )
+        return days
+
+    @classmethod
+    def rebuild(cls, habit_id: int) -> None:
+        """Recreate all bitmaps of a habit from its raw and archived
+        logs."""
+        years = {}
+        for log_date, completed in HabitLog.objects.history(
+            habit_id
+        ).items():
+            bitmap = years.setdefault(
+                log_date.year, cls(habit_id=habit_id, year=log_date.year)
+            )
+            bitmap.set_day(log_date, completed)
+        archived = cls.objects.filter(
+            habit_id=habit_id, archived_through__isnull=False
+        ).values_list("year", "archived_through")
+        for year, archived_through in archived:
+            years.setdefault(
+                year, cls(habit_id=habit_id, year=year)
+            ).archived_through = archived_through
+
+        with transaction.atomic():
+            cls.objects.filter(habit_id=habit_id).delete()
+            cls.objects.bulk_create(years.values())
+
+
+class HabitMonthReport(models.Model):
+    """Completed, missed and ignored days of a habit in one month.
+
+    A row is marked dirty in the transaction that writes or deletes a
+    log of its month, and recomputed from the year bitmap later, see
+    ``tracker.reports``. ``ignored_days`` counts the days up to
+    ``computed_through``.
+    """
+
+    habit = models.ForeignKey(
+        Habit,
+        on_delete=models.CASCADE,
+        related_name="month_reports"
+    )
+    month = models.DateField()
+    completed_days = models.PositiveSmallIntegerField(default=0)
+    missed_days = models.PositiveSmallIntegerField(default=0)
+    ignored_days = models.PositiveSmallIntegerField(default=0)
+    computed_through = models.DateField(null=True, blank=True)
+    dirty = models.BooleanField(default=True)
+    logs_changed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["habit", "month"],
+                name="unique_habit_month_report"
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=["month"],
+                condition=models.Q(dirty=True),
+                name="habit_month_report_dirty_idx"
+            )
+        ]
+
     def __str__(self):
-        return f"{self.created_at.date()}"
+        return f"{self.habit_id}/{self.month:%Y-%m}"
+
+    @classmethod
+    def mark_dirty(cls, habit_id: int, days) -> None:
+        """Flag the months of ``days`` for recomputation.
+
+        Must run in the transaction that changed the logs.
+        """
+        now = timezone.now()
+        months = {day.replace(day=1) for day in days}
+        cls.objects.bulk_create(
+            [
+                cls(habit_id=habit_id, month=month, logs_changed_at=now)
+                for month in sorted(months)
+            ],
+            update_conflicts=True,
+            unique_fields=["habit", "month"],
+            update_fields=["dirty", "logs_changed_at"],
+        )
 
 
 class Commentary(models.Model):
@@ -98,3 +543,128 @@ class Commentary(models.Model):
     habits = models.ManyToManyField(Habit, related_name="commentaries")
     text = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
+
+
+class SearchDocument(models.Model):
+    """Searchable text of a goal, habit or commentary.
+
+    The full-text index itself lives in the database, see
+    ``tracker.search``.
+    """
+
+    ENTITY_CHOICES = [
+        ("goal", "Goal"),
+        ("habit", "Habit"),
+        ("commentary", "Commentary"),
+    ]
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="search_documents"
+    )
+    entity = models.CharField(max_length=20, choices=ENTITY_CHOICES)
+    object_id = models.BigIntegerField()
+    title = models.CharField(max_length=255, blank=True)
+    body = models.TextField(blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["entity", "object_id"],
+                name="unique_search_document"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.entity} {self.object_id}"
+
+
+class SlowQuery(models.Model):
+    """One normalized SQL statement that ran over the slow-query threshold.
+
+    ``sql``, ``params``, ``view_name`` and ``plan`` describe the slowest
+    occurrence seen so far; see ``tracker.slow_queries``.
+    """
+
+    fingerprint = models.CharField(max_length=40, unique=True)
+    normalized_sql = models.TextField()
+    sql = models.TextField()
+    params = models.TextField(blank=True)
+    view_name = models.CharField(max_length=255, blank=True)
+    plan = models.TextField(blank=True)
+    count = models.PositiveIntegerField(default=0)
+    total_ms = models.FloatField(default=0)
+    max_ms = models.FloatField(default=0)
+    first_seen = models.DateTimeField(auto_now_add=True)
+    last_seen = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ["-max_ms"]
+        verbose_name_plural = "slow queries"
+
+    def __str__(self) -> str:
+        return self.normalized_sql[:80]
+
+    @property
+    def average_ms(self) -> float:
+        return self.total_ms / self.count if self.count else 0.0
+
+
+class Job(models.Model):
+    """A unit of background work, run by ``manage.py runworker``.
+
+    See ``tracker.jobs`` for how jobs are claimed, run and retried.
+    """
+
+    STATUS_CHOICES = [
+        ("queued", "Queued"),
+        ("running", "Running"),
+        ("succeeded", "Succeeded"),
+        ("failed", "Failed"),
+    ]
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="jobs",
+        null=True,
+        blank=True
+    )
+    kind = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default="queued"
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=3)
+    run_after = models.DateTimeField(default=timezone.now)
+    locked_by = models.CharField(max_length=255, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at", "-id"]
+        indexes = [
+            models.Index(
+                fields=["run_after", "id"],
+                condition=models.Q(status="queued"),
+                name="job_queued_idx"
+            ),
+            models.Index(
+                fields=["user", "created_at"],
+                name="job_user_created_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} #{self.pk} ({self.status})"
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in ("succeeded", "failed")
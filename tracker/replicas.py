@@ -0,0 +1,107 @@
+"""Read replicas with read-your-writes stickiness.
+
+``DATABASE_REPLICA_URLS`` adds read-only aliases, listed in
+``REPLICA_DATABASES``. ``ReplicaRouter`` sends every write to
+``default`` and, by default, every read too: only views marked with
+``ReplicaReadMixin`` read from a random replica, and only on GET and
+HEAD.
+
+Replicas lag behind the primary, so ``ReplicaMiddleware`` keeps a user
+on the primary for ``REPLICA_STICKY_SECONDS`` after any request of
+theirs that wrote: it sets a cookie holding the end of that window.
+Within a request, reads after the first write also go to the primary.
+The middleware is dropped when no replica is configured, which leaves
+the router with nothing to do.
+"""
+import random
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+REPLICA_STICKY_COOKIE = "primary_until"
+READ_METHODS = ("GET", "HEAD")
+
+_request_state = ContextVar("tracker_replica_state", default=None)
+
+
+def replica_databases() -> list:
+    return getattr(settings, "REPLICA_DATABASES", [])
+
+
+class ReplicaState:
+    """Per-request routing state, mutated in place so that the
+    threads and event loop a request runs in all see it."""
+
+    def __init__(self, pinned: bool):
+        self.pinned = pinned
+        self.replica_reads = False
+        self.wrote = False
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = _request_state.get()
+        replicas = replica_databases()
+        if state is None or not state.replica_reads or state.pinned:
+            return None
+        if not replicas:
+            return None
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        state = _request_state.get()
+        if state is not None:
+            state.wrote = state.pinned = True
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary.
+        return True
+
+
+class ReplicaMiddleware:
+    def __init__(self, get_response):
+        if not replica_databases():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sticky_seconds = getattr(settings, "REPLICA_STICKY_SECONDS", 10)
+
+    def __call__(self, request):
+        try:
+            pinned_until = float(
+                request.COOKIES.get(REPLICA_STICKY_COOKIE, 0)
+            )
+        except ValueError:
+            pinned_until = 0
+        state = ReplicaState(pinned=pinned_until > time.time())
+        token = _request_state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _request_state.reset(token)
+
+        if state.wrote:
+            response.set_cookie(
+                REPLICA_STICKY_COOKIE,
+                f"{time.time() + self.sticky_seconds:.3f}",
+                max_age=self.sticky_seconds,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
+
+
+class ReplicaReadMixin:
+    """Let GET and HEAD requests of a view read from a replica.
+
+    List it after the login mixin, so that the session and user are
+    still read from the primary.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        state = _request_state.get()
+        if state is not None and request.method in READ_METHODS:
+            state.replica_reads = True
+        return super().dispatch(request, *args, **kwargs)
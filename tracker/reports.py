@@ -0,0 +1,195 @@
+"""Monthly habit reports, materialized in ``HabitMonthReport``.
+
+Writing or deleting a log marks its month dirty (``tracker.signals``);
+``rollup_dirty_reports`` recomputes dirty months only, from the year
+bitmaps, so its cost follows the number of changed months rather than
+the size of the history. ``rollup_habit_months`` runs it from cron, and
+a report page refreshes the few dirty rows of the month it shows before
+reading, so reports are never stale and never scan ``HabitLog``.
+
+A month without logs has no row: all its tracked days are ignored.
+``month_goal`` is free text; its first number, if any, is read as the
+target of completed days for the month.
+"""
+import calendar
+import re
+from datetime import date
+
+from django.db.models import Case, F, Q, Value, When
+from django.utils import timezone
+
+from tracker import bitmaps
+from tracker.models import Habit, HabitMonthReport, HabitYearBitmap
+
+ROLLUP_BATCH_SIZE = 1000
+# Rows per UPDATE; keeps its CASE expressions short.
+UPDATE_BATCH_SIZE = 200
+REPORT_FIELDS = [
+    "completed_days",
+    "missed_days",
+    "ignored_days",
+    "computed_through",
+    "dirty",
+]
+
+TARGET_RE = re.compile(r"\d+")
+
+
+def month_end(month: date) -> date:
+    return month.replace(day=calendar.monthrange(month.year, month.month)[1])
+
+
+def tracked_range(habit, month: date, through: date) -> tuple:
+    """First and last day of ``month`` that count for ``habit``."""
+    first = max(month, timezone.localdate(habit.created_at))
+    last = min(month_end(month), through)
+    return first, last
+
+
+def tracked_days(habit, month: date, through: date) -> int:
+    first, last = tracked_range(habit, month, through)
+    return max((last - first).days + 1, 0)
+
+
+def month_target(month_goal) -> int:
+    match = TARGET_RE.search(month_goal or "")
+    return int(match.group()) if match else None
+
+
+def mark_logged_months_dirty(habit_ids=None) -> None:
+    """Queue every existing report and every month with at least one
+    log, read from the bitmaps.
+
+    For backfills and after rebuilding bitmaps, which bypass signals.
+    """
+    reports = HabitMonthReport.objects.all()
+    bitmaps_qs = HabitYearBitmap.objects.order_by("pk")
+    if habit_ids is not None:
+        reports = reports.filter(habit_id__in=habit_ids)
+        bitmaps_qs = bitmaps_qs.filter(habit_id__in=habit_ids)
+    # Existing rows too: their month may have lost all of its logs.
+    reports.update(dirty=True, logs_changed_at=timezone.now())
+
+    for bitmap in bitmaps_qs.iterator(chunk_size=ROLLUP_BATCH_SIZE):
+        logged = bitmaps.to_int(bitmap.logged)
+        days = []
+        for month in range(1, 13):
+            first = date(bitmap.year, month, 1)
+            mask = bitmaps.range_mask(
+                bitmaps.day_index(first), bitmaps.day_index(month_end(first))
+            )
+            if logged & mask:
+                days.append(first)
+        if days:
+            HabitMonthReport.mark_dirty(bitmap.habit_id, days)
+
+
+def refresh_reports(reports, today: date = None) -> int:
+    """Recompute ``reports`` (dirty ``HabitMonthReport`` rows).
+
+    Each batch is saved with one conditional ``UPDATE``: a row whose
+    logs changed meanwhile keeps its old values and its dirty flag, and
+    is picked up by the next refresh. Returns the number of rows read.
+    """
+    today = today or timezone.localdate()
+    reports = list(reports)
+    if not reports:
+        return 0
+
+    habits = Habit.objects.in_bulk(
+        {report.habit_id for report in reports}
+    )
+    year_bitmaps = {
+        (bitmap.habit_id, bitmap.year): bitmap
+        for bitmap in HabitYearBitmap.objects.filter(
+            habit_id__in=habits,
+            year__in={report.month.year for report in reports},
+        )
+    }
+
+    for start in range(0, len(reports), UPDATE_BATCH_SIZE):
+        batch = reports[start:start + UPDATE_BATCH_SIZE]
+        values = {field: [] for field in REPORT_FIELDS}
+        for report in batch:
+            habit = habits[report.habit_id]
+            first, last = tracked_range(habit, report.month, today)
+            bitmap = year_bitmaps.get((report.habit_id, report.month.year))
+            totals = (
+                bitmap.summary(first, last) if bitmap and last >= first
+                else {"completed": 0, "missed": 0, "ignored": 0}
+            )
+            unchanged = Q(pk=report.pk, logs_changed_at=report.logs_changed_at)
+            for field, value in (
+                ("completed_days", totals["completed"]),
+                ("missed_days", totals["missed"]),
+                ("ignored_days", totals["ignored"]),
+                ("computed_through", last if last >= first else None),
+                ("dirty", False),
+            ):
+                values[field].append(When(unchanged, then=Value(value)))
+
+        HabitMonthReport.objects.filter(
+            pk__in=[report.pk for report in batch]
+        ).update(**{
+            field: Case(
+                *whens,
+                default=F(field),
+                output_field=HabitMonthReport._meta.get_field(field),
+            )
+            for field, whens in values.items()
+        })
+    return len(reports)
+
+
+def rollup_dirty_reports(batch_size: int = ROLLUP_BATCH_SIZE,
+                         today: date = None) -> int:
+    """Refresh every dirty report, ``batch_size`` rows at a time."""
+    total = 0
+    last_pk = 0
+    while True:
+        batch = list(
+            HabitMonthReport.objects.filter(
+                dirty=True, pk__gt=last_pk
+            ).order_by("pk")[:batch_size]
+        )
+        if not batch:
+            return total
+        total += refresh_reports(batch, today)
+        last_pk = batch[-1].pk
+
+
+def month_report(user, month: date, today: date = None) -> list:
+    """One entry per habit of ``user`` that existed during ``month``."""
+    today = today or timezone.localdate()
+    habits = list(
+        Habit.objects.filter(
+            user=user, created_at__date__lte=month_end(month)
+        ).order_by("name", "pk")
+    )
+    reports = HabitMonthReport.objects.filter(
+        habit__user=user, month=month
+    )
+    refresh_reports(reports.filter(dirty=True), today)
+    by_habit = {report.habit_id: report for report in reports}
+
+    rows = []
+    for habit in habits:
+        days = tracked_days(habit, month, today)
+        report = by_habit.get(habit.pk)
+        completed = report.completed_days if report else 0
+        missed = report.missed_days if report else 0
+        target = month_target(habit.month_goal)
+        rows.append({
+            "habit": habit,
+            "days": days,
+            "completed": completed,
+            "missed": missed,
+            # Days after ``computed_through`` are ignored until logged.
+            "ignored": days - completed - missed,
+            "target": target,
+            "target_percent": (
+                min(round(100 * completed / target), 100)
+                if target else None
+            ),
+        })
+    return rows
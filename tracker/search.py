@@ -0,0 +1,326 @@
+"""Full-text search over goals, habits and commentaries.
+
+Every searchable object has one ``SearchDocument`` row, kept in sync by
+model signals. The database indexes those rows natively:
+
+* SQLite: an external-content FTS5 table, maintained by triggers and
+  ranked with ``bm25()``;
+* PostgreSQL: a generated, weighted ``tsvector`` column with a GIN
+  index, ranked with ``ts_rank()``.
+
+Other backends fall back to an unranked ``icontains`` match.
+
+On SQLite, Django rebuilds a table to alter it, which drops its
+triggers: a migration that alters ``tracker_searchdocument`` has to run
+``uninstall_index`` before and ``install_index`` after the change.
+"""
+import re
+
+from django.db import connection
+from django.db.models import Q
+
+from tracker.models import Commentary, Goal, Habit, SearchDocument
+
+FTS_TABLE = "tracker_searchdocument_fts"
+MAX_TERMS = 8
+DEFAULT_LIMIT = 100
+
+TERM_RE = re.compile(r"\w+", re.UNICODE)
+
+SQLITE_SETUP = [
+    f"""
+    CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+        title, body,
+        content='tracker_searchdocument', content_rowid='id'
+    )
+    """,
+    f"""
+    CREATE TRIGGER {FTS_TABLE}_ai AFTER INSERT ON tracker_searchdocument
+    BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, body)
+        VALUES (new.id, new.title, new.body);
+    END
+    """,
+    f"""
+    CREATE TRIGGER {FTS_TABLE}_ad AFTER DELETE ON tracker_searchdocument
+    BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, body)
+        VALUES ('delete', old.id, old.title, old.body);
+    END
+    """,
+    f"""
+    CREATE TRIGGER {FTS_TABLE}_au AFTER UPDATE ON tracker_searchdocument
+    BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, body)
+        VALUES ('delete', old.id, old.title, old.body);
+        INSERT INTO {FTS_TABLE}(rowid, title, body)
+        VALUES (new.id, new.title, new.body);
+    END
+    """,
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+]
+SQLITE_TEARDOWN = [
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ai",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ad",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_au",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+POSTGRESQL_SETUP = [
+    """
+    ALTER TABLE tracker_searchdocument ADD COLUMN search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(title, '')), 'A')
+        || setweight(to_tsvector('simple', coalesce(body, '')), 'B')
+    ) STORED
+    """,
+    """
+    CREATE INDEX tracker_searchdocument_vector_idx
+    ON tracker_searchdocument USING GIN (search_vector)
+    """,
+]
+POSTGRESQL_TEARDOWN = [
+    "DROP INDEX IF EXISTS tracker_searchdocument_vector_idx",
+    "ALTER TABLE tracker_searchdocument DROP COLUMN IF EXISTS search_vector",
+]
+
+SQLITE_QUERY = f"""
+    SELECT d.entity, d.object_id, bm25({FTS_TABLE}, 10.0, 1.0) AS rank
+    FROM {FTS_TABLE}
+    JOIN tracker_searchdocument d ON d.id = {FTS_TABLE}.rowid
+    WHERE {FTS_TABLE} MATCH %s AND d.user_id = %s {{entity_filter}}
+    ORDER BY rank
+    LIMIT %s
+"""
+POSTGRESQL_QUERY = """
+    SELECT entity, object_id,
+           ts_rank(search_vector, to_tsquery('simple', %s)) AS rank
+    FROM tracker_searchdocument
+    WHERE search_vector @@ to_tsquery('simple', %s) AND user_id = %s
+          {entity_filter}
+    ORDER BY rank DESC
+    LIMIT %s
+"""
+
+
+def install_index(schema_editor):
+    statements = {
+        "sqlite": SQLITE_SETUP,
+        "postgresql": POSTGRESQL_SETUP,
+    }.get(schema_editor.connection.vendor, [])
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def uninstall_index(schema_editor):
+    statements = {
+        "sqlite": SQLITE_TEARDOWN,
+        "postgresql": POSTGRESQL_TEARDOWN,
+    }.get(schema_editor.connection.vendor, [])
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def document_for(instance) -> SearchDocument:
+    if isinstance(instance, Goal):
+        entity, title, body = "goal", instance.name, instance.description
+    elif isinstance(instance, Habit):
+        entity, title = "habit", instance.name
+        body = "\n".join(
+            filter(None, [instance.description, instance.month_goal])
+        )
+    else:
+        entity, title, body = "commentary", "", instance.text
+    return SearchDocument(
+        user_id=instance.user_id,
+        entity=entity,
+        object_id=instance.pk,
+        title=title,
+        body=body or "",
+    )
+
+
+def index_objects(objects) -> None:
+    """Insert or refresh the search documents of saved objects."""
+    documents = [document_for(obj) for obj in objects if obj.pk]
+    SearchDocument.objects.bulk_create(
+        documents,
+        update_conflicts=True,
+        unique_fields=["entity", "object_id"],
+        update_fields=["user", "title", "body"],
+    )
+
+
+def unindex_object(instance) -> None:
+    SearchDocument.objects.filter(
+        entity=document_for(instance).entity, object_id=instance.pk
+    ).delete()
+
+
+def reindex_user(user_id: int) -> None:
+    for model in (Goal, Habit, Commentary):
+        objects = model.objects.filter(user_id=user_id)
+        batch = []
+        for obj in objects.iterator(chunk_size=1000):
+            batch.append(obj)
+            if len(batch) >= 1000:
+                index_objects(batch)
+                batch = []
+        index_objects(batch)
+
+
+def _terms(query: str) -> list:
+    return TERM_RE.findall(query.lower())[:MAX_TERMS]
+
+
+def _fts_match(terms: list) -> str:
+    return " ".join(f'"{term}"' for term in terms) + "*"
+
+
+def _tsquery(terms: list) -> str:
+    return " & ".join(terms[:-1] + [f"{terms[-1]}:*"])
+
+
+def _matching_documents(user_id: int, terms: list):
+    documents = SearchDocument.objects.filter(user_id=user_id)
+    for term in terms:
+        documents = documents.filter(
+            Q(title__icontains=term) | Q(body__icontains=term)
+        )
+    return documents
+
+
+def search(user_id: int, query: str, entity: str = None,
+           limit: int = DEFAULT_LIMIT) -> list:
+    """Return ``(entity, object_id, rank)`` tuples, best match first.
+
+    Every term must match; the last one also matches as a prefix so
+    results show up while a word is still being typed.
+    """
+    terms = _terms(query)
+    if not terms:
+        return []
+
+    entity_filter = "AND entity = %s" if entity else ""
+    entity_params = [entity] if entity else []
+
+    if connection.vendor == "sqlite":
+        sql = SQLITE_QUERY.format(
+            entity_filter=entity_filter.replace("entity", "d.entity")
+        )
+        params = [_fts_match(terms), user_id, *entity_params, limit]
+    elif connection.vendor == "postgresql":
+        tsquery = _tsquery(terms)
+        sql = POSTGRESQL_QUERY.format(entity_filter=entity_filter)
+        params = [tsquery, tsquery, user_id, *entity_params, limit]
+    else:
+        documents = _matching_documents(user_id, terms)
+        if entity:
+            documents = documents.filter(entity=entity)
+        return [
+            (doc_entity, object_id, 0)
+            for doc_entity, object_id in documents.values_list(
+                "entity", "object_id"
+            )[:limit]
+        ]
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+
+
+def search_ids(user_id: int, query: str, entity: str,
+               limit: int = DEFAULT_LIMIT) -> list:
+    """Ids of one kind of object matching ``query``, best match first."""
+    return [
+        object_id
+        for _, object_id, _ in search(user_id, query, entity, limit)
+    ]
+
+
+def rank_queryset(queryset, user_id: int, query: str, entity: str):
+    """Restrict ``queryset`` to the objects matching ``query``, best
+    match first.
+
+    The documents and their rank are joined into the query itself, so
+    it does not grow with the number of matches and the paginator's
+    COUNT and LIMIT/OFFSET run on the ranked rows.
+    """
+    terms = _terms(query)
+    if not terms:
+        return queryset.none()
+
+    table = queryset.model._meta.db_table
+    documents = SearchDocument._meta.db_table
+    if connection.vendor == "sqlite":
+        # The unary plus keeps SQLite from using the document indexes,
+        # so every plan starts from the FTS match. Started from the
+        # user's objects instead, it would run the MATCH once per row.
+        where = [
+            f"{FTS_TABLE} MATCH %s",
+            f"{documents}.id = {FTS_TABLE}.rowid",
+            f"+{documents}.object_id = {table}.id",
+            f"+{documents}.entity = %s",
+            f"+{documents}.user_id = %s",
+        ]
+        params = [_fts_match(terms), entity, user_id]
+        ranked = {
+            "tables": [documents, FTS_TABLE],
+            "select": {"search_rank": f"bm25({FTS_TABLE}, 10.0, 1.0)"},
+            "order_by": ["search_rank", "pk"],
+        }
+    elif connection.vendor == "postgresql":
+        tsquery = _tsquery(terms)
+        vector = f"{documents}.search_vector"
+        where = [
+            f"{vector} @@ to_tsquery('simple', %s)",
+            f"{documents}.object_id = {table}.id",
+            f"{documents}.entity = %s",
+            f"{documents}.user_id = %s",
+        ]
+        params = [tsquery, entity, user_id]
+        ranked = {
+            "tables": [documents],
+            "select": {
+                "search_rank": f"ts_rank({vector}, to_tsquery('simple', %s))"
+            },
+            "select_params": [tsquery],
+            "order_by": ["-search_rank", "pk"],
+        }
+    else:
+        return queryset.filter(
+            pk__in=_matching_documents(user_id, terms)
+            .filter(entity=entity).values("object_id")
+        )
+
+    return queryset.extra(where=where, params=params, **ranked)
+
+
+def search_objects(user_id: int, query: str,
+                   limit: int = DEFAULT_LIMIT) -> list:
+    """Goals, habits and commentaries matching ``query``, best first.
+
+    Returns ``(entity, object)`` pairs; objects are loaded with one
+    query per entity.
+    """
+    hits = search(user_id, query, limit=limit)
+    ids = {}
+    for entity, object_id, _ in hits:
+        ids.setdefault(entity, []).append(object_id)
+
+    querysets = {
+        "goal": Goal.objects.all(),
+        "habit": Habit.objects.all(),
+        "commentary": Commentary.objects.prefetch_related("goals", "habits"),
+    }
+    objects = {
+        entity: querysets[entity].filter(
+            user_id=user_id
+        ).in_bulk(entity_ids)
+        for entity, entity_ids in ids.items()
+    }
+    return [
+        (entity, objects[entity][object_id])
+        for entity, object_id, _ in hits
+        if object_id in objects[entity]
+    ]
@@ -0,0 +1,263 @@
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_init,
+    post_save,
+    pre_delete,
+)
+from django.db import transaction
+from django.dispatch import receiver
+from django.utils import timezone
+
+from tracker import fragments, search
+from tracker.auth import invalidate_cached_user
+from tracker.dashboard import (
+    adjust_dashboard_counts,
+    invalidate_dashboard_counts,
+)
+from tracker.models import (
+    Commentary,
+    Goal,
+    GoalStage,
+    Habit,
+    HabitLog,
+    HabitMonthReport,
+    HabitStats,
+    HabitYearBitmap,
+    Job,
+    User,
+    habit_log_deleted,
+    habit_logs_written,
+)
+from tracker.tasks import job_file_path
+
+
+@receiver(post_init, sender=Goal)
+def remember_goal_state(sender, instance, **kwargs):
+    instance._dashboard_state = (
+        instance.__dict__.get("user_id"),
+        instance.__dict__.get("status"),
+    )
+
+
+@receiver(post_save, sender=Goal)
+def update_goal_counters(sender, instance, created, **kwargs):
+    new_state = (instance.user_id, instance.status)
+    old_user_id, old_status = (
+        (None, None) if created else instance._dashboard_state
+    )
+
+    if created:
+        adjust_dashboard_counts(
+            instance.user_id, total=1, **{instance.status: 1}
+        )
+    elif (old_user_id, old_status) != new_state:
+        if old_status is None:
+            invalidate_dashboard_counts(instance.user_id)
+        else:
+            adjust_dashboard_counts(
+                old_user_id, total=-1, **{old_status: -1}
+            )
+            adjust_dashboard_counts(
+                instance.user_id, total=1, **{instance.status: 1}
+            )
+
+    instance._dashboard_state = new_state
+
+
+@receiver(post_delete, sender=Goal)
+def decrement_goal_counters(sender, instance, **kwargs):
+    adjust_dashboard_counts(
+        instance.user_id, total=-1, **{instance.status: -1}
+    )
+
+
+@receiver(post_init, sender=Habit)
+def remember_habit_owner(sender, instance, **kwargs):
+    instance._dashboard_user_id = instance.__dict__.get("user_id")
+
+
+@receiver(post_save, sender=Habit)
+def update_habit_counters(sender, instance, created, **kwargs):
+    old_user_id = instance._dashboard_user_id
+
+    if created:
+        adjust_dashboard_counts(instance.user_id, habits=1)
+    elif old_user_id and old_user_id != instance.user_id:
+        adjust_dashboard_counts(old_user_id, habits=-1)
+        adjust_dashboard_counts(instance.user_id, habits=1)
+
+    instance._dashboard_user_id = instance.user_id
+
+
+@receiver(post_delete, sender=Habit)
+def decrement_habit_counters(sender, instance, **kwargs):
+    adjust_dashboard_counts(instance.user_id, habits=-1)
+
+
+@receiver(habit_logs_written, sender=HabitLog)
+def update_habit_stats(sender, habit_id, entries, **kwargs):
+    HabitStats.record_logs(habit_id, entries)
+
+
+@receiver(habit_logs_written, sender=HabitLog)
+def update_habit_bitmaps(sender, habit_id, entries, **kwargs):
+    HabitYearBitmap.record_logs(habit_id, entries)
+
+
+@receiver(habit_logs_written, sender=HabitLog)
+def mark_written_log_months(sender, habit_id, entries, **kwargs):
+    HabitMonthReport.mark_dirty(
+        habit_id, [log_date for log_date, _ in entries]
+    )
+
+
+@receiver(habit_log_deleted, sender=HabitLog)
+def mark_deleted_log_month(sender, habit_id, log_date, **kwargs):
+    HabitMonthReport.mark_dirty(habit_id, [log_date])
+
+
+@receiver(post_save, sender=Goal)
+@receiver(post_save, sender=Habit)
+@receiver(post_save, sender=Commentary)
+def index_search_document(sender, instance, **kwargs):
+    search.index_objects([instance])
+
+
+@receiver(post_delete, sender=Goal)
+@receiver(post_delete, sender=Habit)
+@receiver(post_delete, sender=Commentary)
+def unindex_search_document(sender, instance, **kwargs):
+    search.unindex_object(instance)
+
+
+def _habit_owner(habit_id: int):
+    return Habit.objects.filter(pk=habit_id).values_list(
+        "user_id", flat=True
+    ).first()
+
+
+def _bump_cache_version(user_id) -> None:
+    fragments.bump_cache_version(user_id)
+    # Again after commit: a request in between may have cached fragments
+    # of the pre-commit rows.
+    transaction.on_commit(lambda: fragments.bump_cache_version(user_id))
+
+
+@receiver(post_save, sender=Goal)
+@receiver(post_delete, sender=Goal)
+@receiver(post_save, sender=Habit)
+@receiver(post_delete, sender=Habit)
+@receiver(post_save, sender=Commentary)
+@receiver(post_delete, sender=Commentary)
+def bump_owner_cache_version(sender, instance, **kwargs):
+    _bump_cache_version(instance.user_id)
+
+
+@receiver(post_save, sender=User)
+def reset_new_user_cache_version(sender, instance, created, **kwargs):
+    # A reused primary key must not inherit a previous owner's entries.
+    if created:
+        fragments.bump_cache_version(instance.pk)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def drop_cached_user(sender, instance, **kwargs):
+    invalidate_cached_user(instance.pk)
+    # Again after commit: a request in between may have cached the
+    # pre-commit row.
+    transaction.on_commit(lambda: invalidate_cached_user(instance.pk))
+
+
+@receiver(post_save, sender=GoalStage)
+@receiver(post_delete, sender=GoalStage)
+def bump_stage_owner_cache_version(sender, instance, **kwargs):
+    if GoalStage.goal.is_cached(instance):
+        user_id = instance.goal.user_id
+    else:
+        user_id = Goal.objects.filter(pk=instance.goal_id).values_list(
+            "user_id", flat=True
+        ).first()
+    _bump_cache_version(user_id)
+
+
+@receiver(habit_logs_written, sender=HabitLog)
+@receiver(habit_log_deleted, sender=HabitLog)
+def bump_log_owner_cache_version(sender, habit_id, **kwargs):
+    _bump_cache_version(_habit_owner(habit_id))
+
+
+@receiver(post_save, sender=HabitLog)
+def bump_updated_log_owner_cache_version(sender, instance, created,
+                                         **kwargs):
+    # New logs are covered by ``habit_logs_written``.
+    if not created:
+        _bump_cache_version(_habit_owner(instance.habit_id))
+
+
+@receiver(m2m_changed, sender=Commentary.goals.through)
+@receiver(m2m_changed, sender=Commentary.habits.through)
+def bump_commentary_links_cache_version(sender, instance, action, **kwargs):
+    if action.startswith("post_"):
+        _bump_cache_version(instance.user_id)
+
+
+@receiver(post_save, sender=GoalStage)
+@receiver(post_delete, sender=GoalStage)
+def touch_stage_goal(sender, instance, **kwargs):
+    Goal.objects.filter(pk=instance.goal_id).update(
+        updated_at=timezone.now()
+    )
+
+
+@receiver(habit_logs_written, sender=HabitLog)
+@receiver(habit_log_deleted, sender=HabitLog)
+def touch_log_habit(sender, habit_id, **kwargs):
+    Habit.objects.filter(pk=habit_id).update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=HabitLog)
+def touch_updated_log_habit(sender, instance, created, **kwargs):
+    if not created:
+        touch_log_habit(sender, instance.habit_id)
+
+
+def _touch_commentary_targets(commentary) -> None:
+    now = timezone.now()
+    Goal.objects.filter(commentaries=commentary).update(updated_at=now)
+    Habit.objects.filter(commentaries=commentary).update(updated_at=now)
+
+
+@receiver(post_save, sender=Commentary)
+def touch_commentary_targets(sender, instance, created, **kwargs):
+    # A new commentary has no links yet: ``m2m_changed`` covers those.
+    if not created:
+        _touch_commentary_targets(instance)
+
+
+@receiver(pre_delete, sender=Commentary)
+def touch_deleted_commentary_targets(sender, instance, **kwargs):
+    _touch_commentary_targets(instance)
+
+
+@receiver(m2m_changed, sender=Commentary.goals.through)
+@receiver(m2m_changed, sender=Commentary.habits.through)
+def touch_linked_commentary_targets(sender, instance, action, reverse,
+                                    model, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    now = timezone.now()
+    if reverse:
+        # ``instance`` is the goal or habit itself.
+        type(instance).objects.filter(pk=instance.pk).update(updated_at=now)
+    elif action == "pre_clear":
+        _touch_commentary_targets(instance)
+    else:
+        model.objects.filter(pk__in=pk_set).update(updated_at=now)
+
+
+@receiver(post_delete, sender=Job)
+def delete_job_file(sender, instance, **kwargs):
+    path = job_file_path(instance)
+    transaction.on_commit(lambda: path.unlink(missing_ok=True))
@@ -0,0 +1,191 @@
+"""Slow-query log with captured query plans.
+
+``capture_slow_queries`` wraps every database connection and remembers
+statements slower than ``SLOW_QUERY_THRESHOLD_MS``. When the block ends,
+each one is stored as a ``SlowQuery`` row keyed by the fingerprint of
+its normalized SQL, so repeats of the same statement with different
+literals only bump its counters. The parameters, originating view and
+``EXPLAIN`` output are kept for the slowest occurrence:
+
+* SQLite: ``EXPLAIN QUERY PLAN``;
+* PostgreSQL: ``EXPLAIN``, or ``EXPLAIN (ANALYZE, BUFFERS)`` for
+  ``SELECT`` statements when ``SLOW_QUERY_EXPLAIN_ANALYZE`` is on;
+* MySQL: ``EXPLAIN``.
+
+Plans are captured after the statement has run, outside the wrappers,
+so explaining never counts as a slow query itself.
+"""
+import hashlib
+import json
+import re
+import time
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.db import DatabaseError, IntegrityError, connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from tracker.models import SlowQuery
+
+EXPLAINABLE = ("select", "insert", "update", "delete", "with")
+
+STRING_RE = re.compile(r"'(?:[^']|'')*'")
+NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+PLACEHOLDER_RE = re.compile(r"%s|\?")
+IN_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+VALUES_LIST_RE = re.compile(r"\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+")
+WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_sql(sql: str) -> str:
+    """Replace literals and placeholders with ``?`` and collapse lists,
+    so ``IN (1, 2)`` and ``IN (1, 2, 3)`` share a fingerprint."""
+    sql = STRING_RE.sub("?", sql)
+    sql = NUMBER_RE.sub("?", sql)
+    sql = PLACEHOLDER_RE.sub("?", sql)
+    sql = IN_LIST_RE.sub("(...)", sql)
+    sql = VALUES_LIST_RE.sub("(...)", sql)
+    return WHITESPACE_RE.sub(" ", sql).strip()
+
+
+def fingerprint(sql: str) -> str:
+    return hashlib.sha1(normalize_sql(sql).encode()).hexdigest()
+
+
+def explain(connection, sql: str, params) -> str:
+    """The backend's plan for ``sql``, or ``""`` if it has none."""
+    if not sql.lstrip().lower().startswith(EXPLAINABLE):
+        return ""
+    if connection.vendor == "sqlite":
+        prefix = "EXPLAIN QUERY PLAN "
+    elif connection.vendor == "postgresql":
+        analyze = getattr(settings, "SLOW_QUERY_EXPLAIN_ANALYZE", False)
+        is_select = sql.lstrip().lower().startswith("select")
+        prefix = (
+            "EXPLAIN (ANALYZE, BUFFERS) " if analyze and is_select
+            else "EXPLAIN "
+        )
+    elif connection.vendor == "mysql":
+        prefix = "EXPLAIN "
+    else:
+        return ""
+
+    try:
+        with transaction.atomic(using=connection.alias):
+            with connection.cursor() as cursor:
+                cursor.execute(prefix + sql, params)
+                rows = cursor.fetchall()
+    except DatabaseError:
+        return ""
+
+    if connection.vendor != "sqlite":
+        return "\n".join(" ".join(map(str, row)) for row in rows)
+
+    # (id, parent, notused, detail): indent each step under its parent.
+    depths = {0: -1}
+    lines = []
+    for step_id, parent, _, detail in rows:
+        depths[step_id] = depths.get(parent, -1) + 1
+        lines.append("  " * depths[step_id] + detail)
+    return "\n".join(lines)
+
+
+def _format_params(params) -> str:
+    if params is None:
+        return ""
+    return json.dumps(list(params), default=str)
+
+
+def record_slow_query(alias: str, sql: str, params, duration_ms: float,
+                      view_name: str = "", many: bool = False) -> None:
+    """Count one slow run of ``sql``, keeping its details if it is the
+    slowest run of its fingerprint so far."""
+    key = fingerprint(sql)
+    now = timezone.now()
+    SlowQuery.objects.filter(fingerprint=key).update(
+        count=F("count") + 1,
+        total_ms=F("total_ms") + duration_ms,
+        last_seen=now,
+    )
+    slowest = SlowQuery.objects.filter(fingerprint=key).values_list(
+        "max_ms", flat=True
+    ).first()
+    if slowest is not None and slowest >= duration_ms:
+        return
+
+    connection = connections[alias]
+    details = {
+        "sql": sql,
+        "params": _format_params(params[0] if many and params else params),
+        "view_name": view_name or "",
+        "plan": "" if many else explain(connection, sql, params),
+        "max_ms": duration_ms,
+    }
+    if slowest is not None:
+        SlowQuery.objects.filter(
+            fingerprint=key, max_ms__lt=duration_ms
+        ).update(**details)
+        return
+
+    try:
+        with transaction.atomic():
+            SlowQuery.objects.create(
+                fingerprint=key,
+                normalized_sql=normalize_sql(sql),
+                count=1,
+                total_ms=duration_ms,
+                last_seen=now,
+                **details,
+            )
+    except IntegrityError:
+        # Another request recorded it first.
+        record_slow_query(alias, sql, params, duration_ms, view_name, many)
+
+
+class SlowQueryCollector:
+    def __init__(self, alias: str, threshold_ms: float, found: list):
+        self.alias = alias
+        self.threshold_ms = threshold_ms
+        self.found = found
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        result = execute(sql, params, many, context)
+        duration_ms = (time.perf_counter() - started) * 1000
+        if duration_ms >= self.threshold_ms:
+            self.found.append((self.alias, sql, params, duration_ms, many))
+        return result
+
+
+@contextmanager
+def capture_slow_queries(view_name=None, threshold_ms=None):
+    """Record statements run in the block that exceed ``threshold_ms``
+    (``SLOW_QUERY_THRESHOLD_MS`` by default; nothing is recorded while
+    neither is set).
+
+    ``view_name`` may be a callable, evaluated when the block ends, so a
+    request can be labelled with the URL name it resolved to.
+    """
+    if threshold_ms is None:
+        threshold_ms = getattr(settings, "SLOW_QUERY_THRESHOLD_MS", None)
+    found = []
+    if threshold_ms is None:
+        yield found
+        return
+
+    with ExitStack() as stack:
+        for alias in connections:
+            stack.enter_context(
+                connections[alias].execute_wrapper(
+                    SlowQueryCollector(alias, threshold_ms, found)
+                )
+            )
+        yield found
+
+    if found:
+        label = view_name() if callable(view_name) else view_name
+        for alias, sql, params, duration_ms, many in found:
+            record_slow_query(
+                alias, sql, params, duration_ms, label or "", many
+            )
@@ -0,0 +1,70 @@
+"""Handlers of the background job kinds run by ``manage.py runworker``.
+
+See ``tracker.jobs``. Every handler gets the ``Job`` and returns a
+JSON-serializable result that the job status page shows.
+"""
+import gzip
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+
+from tracker import fragments
+from tracker.exporters import WRITERS, iter_records
+from tracker.jobs import task
+from tracker.models import Habit, HabitStats, HabitYearBitmap
+from tracker.reports import mark_logged_months_dirty
+from tracker.transitions import bulk_goal_action
+
+
+def job_files_dir() -> Path:
+    return Path(
+        getattr(settings, "JOB_FILES_DIR", None)
+        or Path(tempfile.gettempdir()) / "tracker-job-files"
+    )
+
+
+def job_file_path(job) -> Path:
+    return job_files_dir() / f"job-{job.pk}.gz"
+
+
+@task("export_data")
+def export_data(job) -> dict:
+    """Write the user's export, gzipped, for download from the job page."""
+    data_format = job.payload.get("format", "jsonl")
+    writer, content_type = WRITERS[data_format]
+    path = job_file_path(job)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    lines = 0
+    with gzip.open(path, "wt", encoding="utf-8", newline="") as output:
+        for line in writer(iter_records(job.user)):
+            output.write(line)
+            lines += 1
+    return {
+        "format": data_format,
+        "content_type": content_type,
+        "lines": lines,
+        "bytes": path.stat().st_size,
+    }
+
+
+@task("rebuild_habit_stats")
+def rebuild_habit_stats(job) -> dict:
+    """Rebuild the stats, bitmaps and monthly reports of every habit."""
+    habit_ids = list(
+        Habit.objects.filter(user_id=job.user_id).values_list("pk", flat=True)
+    )
+    for habit_id in habit_ids:
+        HabitStats.rebuild(habit_id)
+        HabitYearBitmap.rebuild(habit_id)
+    mark_logged_months_dirty(habit_ids)
+    fragments.bump_cache_version(job.user_id)
+    return {"habits": len(habit_ids)}
+
+
+@task("delete_goals")
+def delete_goals(job) -> dict:
+    return {
+        "deleted": bulk_goal_action(job.user_id, job.payload["ids"], "delete")
+    }
@@ -0,0 +1,65 @@
+from django import template
+
+from tracker import fragments
+
+register = template.Library()
+
+
+class UserFragmentNode(template.Node):
+    def __init__(self, nodelist, name, vary_on, owner=None):
+        self.nodelist = nodelist
+        self.name = name
+        self.vary_on = vary_on
+        self.owner = owner
+
+    def get_owner_id(self, context):
+        if self.owner is not None:
+            return self.owner.resolve(context)
+        user = context.get("user")
+        if user is not None and user.is_authenticated:
+            return user.pk
+
+    def render(self, context):
+        owner_id = self.get_owner_id(context)
+        if owner_id is None:
+            return self.nodelist.render(context)
+
+        return fragments.get_or_set(
+            owner_id,
+            self.name.resolve(context),
+            lambda: self.nodelist.render(context),
+            vary_on=[value.resolve(context) for value in self.vary_on],
+        )
+
+
+@register.tag("user_fragment")
+def do_user_fragment(parser, token):
+    """Cache a block of template under a user's cache version.
+
+        {% load user_fragments %}
+        {% user_fragment "goal_stages" goal.pk owner=goal.user_id %}
+            ...
+        {% enduser_fragment %}
+
+    Extra arguments are resolved and added to the key, like the built-in
+    ``{% cache %}`` tag's ``vary_on`` arguments. ``owner`` names the user
+    whose data the block shows and defaults to the logged-in user.
+    """
+    nodelist = parser.parse(("enduser_fragment",))
+    parser.delete_first_token()
+    bits = token.split_contents()
+    if len(bits) < 2:
+        raise template.TemplateSyntaxError(
+            f"'{bits[0]}' tag requires at least one argument."
+        )
+
+    owner = None
+    vary_on = []
+    for bit in bits[2:]:
+        if bit.startswith("owner="):
+            owner = parser.compile_filter(bit[len("owner="):])
+        else:
+            vary_on.append(parser.compile_filter(bit))
+    return UserFragmentNode(
+        nodelist, parser.compile_filter(bits[1]), vary_on, owner
+    )
@@ -0,0 +1,116 @@
+"""Goal and stage status toggles as single conditional UPDATEs.
+
+The new status is computed by the database with ``CASE``, in the same
+statement that checks ownership, so concurrent clicks cannot lose an
+update and nothing is read first. ``queryset.update()`` bypasses model
+signals, so the caches they maintain are refreshed here instead.
+"""
+from django.db import transaction
+from django.db.models import Case, Value, When
+from django.utils import timezone
+
+from tracker import fragments
+from tracker.dashboard import invalidate_dashboard_counts
+from tracker.models import Goal, GoalStage
+
+# toggle name: (status to leave, status to enter, status otherwise)
+TOGGLES = {
+    "complete": ("active", "completed", "active"),
+    "abandon": ("abandoned", "active", "abandoned"),
+}
+
+
+def toggle_expression(toggle: str) -> Case:
+    current, new, otherwise = TOGGLES[toggle]
+    return Case(
+        When(status=current, then=Value(new)), default=Value(otherwise)
+    )
+
+
+def toggle_goal_status(user_id: int, goal_id: int, toggle: str):
+    """Toggle a goal of ``user_id``; return its new status or ``None``."""
+    goals = Goal.objects.filter(pk=goal_id, user_id=user_id)
+    with transaction.atomic():
+        updated = goals.update(
+            status=toggle_expression(toggle), updated_at=timezone.now()
+        )
+        if not updated:
+            return None
+        status = goals.values_list("status", flat=True).get()
+
+    invalidate_dashboard_counts(user_id)
+    fragments.bump_cache_version(user_id)
+    return status
+
+
+def toggle_stage_status(user_id: int, goal_id: int, stage_id: int,
+                        toggle: str):
+    """Toggle a stage of one of ``user_id``'s goals; ``None`` if missing."""
+    stages = GoalStage.objects.filter(
+        pk=stage_id, goal_id=goal_id, goal__user_id=user_id
+    )
+    now = timezone.now()
+    with transaction.atomic():
+        updated = stages.update(
+            status=toggle_expression(toggle), updated_at=now
+        )
+        if not updated:
+            return None
+        Goal.objects.filter(pk=goal_id).update(updated_at=now)
+        status = GoalStage.objects.filter(pk=stage_id).values_list(
+            "status", flat=True
+        ).get()
+
+    fragments.bump_cache_version(user_id)
+    return status
+
+
+# bulk action name: status it sets (``None`` deletes)
+BULK_ACTIONS = {
+    "complete": "completed",
+    "abandon": "abandoned",
+    "reactivate": "active",
+    "delete": None,
+}
+
+
+def _apply_bulk_action(queryset, action: str) -> int:
+    """Run ``action`` as one UPDATE or DELETE; return the affected rows.
+
+    Rows already in the target status are left alone and not counted.
+    Deletes go through ``queryset.delete()`` so that the per-object
+    signals keep the dashboard counters and search index right.
+    """
+    status = BULK_ACTIONS[action]
+    if status is None:
+        _, deleted = queryset.delete()
+        return deleted.get(queryset.model._meta.label, 0)
+    return queryset.exclude(status=status).update(
+        status=status, updated_at=timezone.now()
+    )
+
+
+def bulk_goal_action(user_id: int, goal_ids, action: str) -> int:
+    goals = Goal.objects.filter(user_id=user_id, pk__in=goal_ids)
+    with transaction.atomic():
+        count = _apply_bulk_action(goals, action)
+
+    if count:
+        invalidate_dashboard_counts(user_id)
+        fragments.bump_cache_version(user_id)
+    return count
+
+
+def bulk_stage_action(user_id: int, goal_id: int, stage_ids,
+                      action: str) -> int:
+    stages = GoalStage.objects.filter(
+        goal_id=goal_id, goal__user_id=user_id, pk__in=stage_ids
+    )
+    with transaction.atomic():
+        count = _apply_bulk_action(stages, action)
+        if count:
+            Goal.objects.filter(pk=goal_id).update(updated_at=timezone.now())
+
+    if count:
+        fragments.bump_cache_version(user_id)
+    return count
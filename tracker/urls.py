@@ -8,6 +8,9 @@ from tracker.views import (
     HabitListView,
     HabitCreateView,
     HabitDetailView,
+    HabitCheckInView,
+    HabitHeatmapView,
+    HabitMonthReportView,
     CommentaryGoalCreateView,
     CommentaryHabitCreateView,
     GoalDeleteView,
@@ -20,7 +23,17 @@ from tracker.views import (
     GoalToggleStatusView,
     GoalToggleAbandonedStatusView,
     GoalToggleStageStatusView,
-    GoalToggleStageAbandonedStatusView
+    GoalToggleStageAbandonedStatusView,
+    GoalBulkActionView,
+    GoalStageBulkActionView,
+    DataImportView,
+    DataExportView,
+    JobListView,
+    JobCreateView,
+    JobDetailView,
+    JobDownloadView,
+    SearchView,
+    MetricsView,
 )
 
 app_name = "tracker"
@@ -36,6 +49,11 @@ urlpatterns = [
         GoalListView.as_view(),
         name="goal-list"
     ),
+    path(
+        "goals/bulk/",
+        GoalBulkActionView.as_view(),
+        name="goal-bulk-action"
+    ),
     path(
         "goals/create/",
         GoalCreateView.as_view(),
@@ -91,6 +109,11 @@ urlpatterns = [
         GoalToggleStageAbandonedStatusView.as_view(),
         name="goal-update-stage-status-abandoned"
     ),
+    path(
+        "goals/<int:goal_id>/stages/bulk/",
+        GoalStageBulkActionView.as_view(),
+        name="goal-stage-bulk-action"
+    ),
     path(
         "goals/<int:pk>/create/commentary/",
         CommentaryGoalCreateView.as_view(),
@@ -106,6 +129,11 @@ urlpatterns = [
         HabitCreateView.as_view(),
         name="habit-create"
     ),
+    path(
+        "habits/check-in/",
+        HabitCheckInView.as_view(),
+        name="habit-check-in"
+    ),
     path(
         "habits/<int:pk>/delete/",
         HabitDeleteView.as_view(),
@@ -121,6 +149,21 @@ urlpatterns = [
         HabitDetailView.as_view(),
         name="habit-detail"
     ),
+    path(
+        "habits/<int:pk>/heatmap/<int:year>/",
+        HabitHeatmapView.as_view(),
+        name="habit-heatmap"
+    ),
+    path(
+        "habits/reports/",
+        HabitMonthReportView.as_view(),
+        name="habit-report"
+    ),
+    path(
+        "habits/reports/<int:year>/<int:month>/",
+        HabitMonthReportView.as_view(),
+        name="habit-month-report"
+    ),
     path(
         "habits/<int:pk>/create/commentary/",
         CommentaryHabitCreateView.as_view(),
@@ -131,4 +174,44 @@ urlpatterns = [
         CommentaryHabitCreateView.as_view(),
         name="habit-commentary-create"
     ),
+    path(
+        "import/",
+        DataImportView.as_view(),
+        name="data-import"
+    ),
+    path(
+        "export/",
+        DataExportView.as_view(),
+        name="data-export"
+    ),
+    path(
+        "jobs/",
+        JobListView.as_view(),
+        name="job-list"
+    ),
+    path(
+        "jobs/create/",
+        JobCreateView.as_view(),
+        name="job-create"
+    ),
+    path(
+        "jobs/<int:pk>/",
+        JobDetailView.as_view(),
+        name="job-detail"
+    ),
+    path(
+        "jobs/<int:pk>/download/",
+        JobDownloadView.as_view(),
+        name="job-download"
+    ),
+    path(
+        "search/",
+        SearchView.as_view(),
+        name="search"
+    ),
+    path(
+        "metrics",
+        MetricsView.as_view(),
+        name="metrics"
+    ),
 ]
@@ -1,11 +1,35 @@
-from datetime import date
+import codecs
+from base64 import b64encode
+from datetime import date, timedelta
 
+from django.conf import settings
+from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.http import HttpResponseRedirect, HttpResponse
+from django.http import (
+    FileResponse,
+    Http404,
+    HttpResponseRedirect,
+    HttpResponse,
+    JsonResponse,
+    StreamingHttpResponse,
+)
 from django.shortcuts import render, get_object_or_404, redirect
 from django.urls import reverse_lazy, reverse
+from django.utils import timezone
+from django.utils.decorators import method_decorator
 from django.views import generic, View
-
+from django.views.decorators.cache import cache_control
+from django.views.decorators.gzip import gzip_page
+from django.views.decorators.http import condition
+
+from tracker import bitmaps, fragments, metrics, search
+from tracker.conditional import (
+    goal_etag,
+    goal_last_modified,
+    habit_etag,
+    habit_last_modified,
+)
+from tracker.dashboard import dashboard_context, get_dashboard_counts
 from tracker.forms import (
     GoalCreationForm,
     GoalCreationStageForm,
@@ -14,56 +38,69 @@ from tracker.forms import (
     HabitCommentaryForm,
     GoalNameSearchForm,
     HabitNameSearchForm, HabitLogForm,
+    HabitCheckInForm,
+    BulkActionForm,
+    DataImportForm,
+    JobCreateForm,
+)
+from tracker.exporters import WRITERS, iter_records
+from tracker.importers import import_stream
+from tracker.jobs import enqueue
+from tracker.loaders import goal_detail_queryset, load_goal_detail
+from tracker.pagination import CursorPaginationMixin
+from tracker.replicas import ReplicaReadMixin
+from tracker.reports import month_end, month_report
+from tracker.tasks import job_file_path
+from tracker.transitions import (
+    bulk_goal_action,
+    bulk_stage_action,
+    toggle_goal_status,
+    toggle_stage_status,
 )
 from tracker.models import (
     Goal,
     GoalStage,
     Habit,
-    Commentary
+    HabitLog,
+    HabitStats,
+    HabitYearBitmap,
+    Commentary,
+    Job,
 )
 
 
-class IndexView(LoginRequiredMixin, View):
+class IndexView(LoginRequiredMixin, ReplicaReadMixin, View):
+    # The newest habits shown; the habit list has the rest.
+    habit_limit = 10
+
     def get(self, request):
         user = request.user
-        queryset = Goal.objects.filter(user=user)
-        statuses = ["active", "completed", "abandoned"]
-        goals_number = {
-            f"{status}_goals_number": queryset.filter(status=status).count()
-            for status in statuses
-        }
-        total_goals_number = queryset.count()
-
-        if total_goals_number == 0:
-            total_goals_number = float("inf")
-
-        goals_percent = {
-            f"{field_name.split('_number')[0]}_percent":
-                round(goal_number / total_goals_number * 100, 1)
-            for field_name, goal_number in goals_number.items()
-        }
-
-        habits_objects = Habit.objects.filter(user=user)
-        habits_number = habits_objects.count()
+        counts = get_dashboard_counts(user.pk)
 
         context = {
-            **goals_number,
-            **goals_percent,
-            "habits_number": habits_number,
-            "habits_objects": habits_objects,
-            "total_goals_number": total_goals_number
+            **dashboard_context(counts),
+            "habits_objects": (
+                Habit.objects.filter(user=user)
+                .order_by("-created_at", "-id")[:self.habit_limit]
+            ),
         }
 
         return render(request, "index.html", context=context)
 
 
-class GoalListView(LoginRequiredMixin, generic.ListView):
+class GoalListView(
+    LoginRequiredMixin,
+    ReplicaReadMixin,
+    CursorPaginationMixin,
+    generic.ListView,
+):
     model = Goal
     template_name = "goal/goal_list.html"
     context_object_name = "goal_list"
     paginate_by = 5
     queryset = Goal.objects.all()
-    ordering = ["created_at"]
+    ordering = ["created_at", "id"]
+    dashboard_count_key = "total"
 
     def get_context_data(self, *, object_list=None, **kwargs):
         context = super(GoalListView, self).get_context_data(**kwargs)
@@ -81,7 +118,9 @@ class GoalListView(LoginRequiredMixin, generic.ListView):
         queryset = super().get_queryset()
 
         if name:
-            queryset = queryset.filter(name__icontains=name)
+            queryset = search.rank_queryset(
+                queryset, user.pk, name, "goal"
+            )
 
         status = self.request.GET.get("status")
 
@@ -107,25 +146,138 @@ class GoalUpdateView(LoginRequiredMixin, generic.UpdateView):
         return reverse("tracker:goal-detail", kwargs={"pk": self.kwargs["pk"]})
 
 
-class GoalToggleStatusView(View):
-    def get(self, request, pk):
-        goal = get_object_or_404(Goal, pk=pk)
-        goal.status = "completed" if goal.status == "active" else "active"
-        goal.save()
+class StatusToggleView(LoginRequiredMixin, View):
+    """POST-only status toggle.
+
+    Callers that accept JSON get ``{"id": ..., "status": ...}`` back and
+    can update the page in place; others are redirected to the goal.
+
+    ``transition`` is a ``tracker.transitions`` toggle function. It is
+    called with the user id, the URL kwargs named in ``id_kwargs`` and
+    ``toggle``, and returns the new status or ``None``.
+    """
+
+    transition = None
+    id_kwargs = ("pk",)
+    toggle = None
+
+    def post(self, request, **kwargs):
+        status = self.transition(
+            request.user.pk,
+            *(kwargs[name] for name in self.id_kwargs),
+            self.toggle,
+        )
+        if status is None:
+            raise Http404
+
+        if "application/json" in request.headers.get("Accept", ""):
+            return JsonResponse({"id": kwargs["pk"], "status": status})
         return HttpResponseRedirect(
-            reverse_lazy("tracker:goal-detail", args=[pk])
+            reverse(
+                "tracker:goal-detail",
+                args=[kwargs.get("goal_id", kwargs["pk"])]
+            )
         )
 
 
-class GoalToggleAbandonedStatusView(View):
-    def get(self, request, pk):
-        goal = get_object_or_404(Goal, pk=pk)
-        goal.status = "active" if goal.status == "abandoned" else "abandoned"
-        goal.save()
-        return HttpResponseRedirect(
-            reverse_lazy("tracker:goal-detail", args=[pk])
+class GoalToggleStatusView(StatusToggleView):
+    transition = staticmethod(toggle_goal_status)
+    toggle = "complete"
+
+
+class GoalToggleAbandonedStatusView(GoalToggleStatusView):
+    toggle = "abandon"
+
+
+class BulkActionView(LoginRequiredMixin, View):
+    """Apply a ``BulkActionForm`` action to the selected objects.
+
+    JSON callers get ``{"action": ..., "count": ...}``; others are
+    redirected with the number of affected rows as a message. Actions
+    that ``offload`` hands to a background job answer with
+    ``{"action": ..., "job": ...}`` and status 202 instead, or redirect
+    to the job page.
+
+    ``perform`` is a ``tracker.transitions`` bulk function. It is called
+    with the user id, the URL kwargs named in ``id_kwargs``, the selected
+    ids and the action, and returns the number of changed rows. The same
+    URL kwargs are the arguments of ``success_url_name``.
+    """
+
+    noun = None
+    perform = None
+    id_kwargs = ()
+    success_url_name = None
+
+    def offload(self, action, ids, **kwargs):
+        """Return a queued ``Job`` to run the action in the background,
+        or ``None`` to run it in the request."""
+        return None
+
+    def get_success_url(self, **kwargs) -> str:
+        return reverse(
+            self.success_url_name,
+            args=[kwargs[name] for name in self.id_kwargs],
         )
 
+    def post(self, request, **kwargs):
+        form = BulkActionForm(request.POST)
+        if not form.is_valid():
+            if "application/json" in request.headers.get("Accept", ""):
+                return JsonResponse({"errors": form.errors}, status=400)
+            messages.error(request, f"Select {self.noun}s and an action.")
+            return redirect(self.get_success_url(**kwargs))
+
+        action = form.cleaned_data["action"]
+        ids = form.cleaned_data["ids"]
+        job = self.offload(action, ids, **kwargs)
+        if job is not None:
+            if "application/json" in request.headers.get("Accept", ""):
+                return JsonResponse(
+                    {"action": action, "job": job.pk}, status=202
+                )
+            messages.info(
+                request,
+                f"{action.capitalize()}: {len(ids)} {self.noun}s are being "
+                f"changed in the background."
+            )
+            return redirect("tracker:job-detail", pk=job.pk)
+
+        count = self.perform(
+            request.user.pk,
+            *(kwargs[name] for name in self.id_kwargs),
+            ids,
+            action,
+        )
+
+        if "application/json" in request.headers.get("Accept", ""):
+            return JsonResponse({"action": action, "count": count})
+        messages.success(
+            request,
+            f"{action.capitalize()}: {count} {self.noun}"
+            f"{'' if count == 1 else 's'} changed."
+        )
+        return redirect(self.get_success_url(**kwargs))
+
+
+class GoalBulkActionView(BulkActionView):
+    noun = "goal"
+    perform = staticmethod(bulk_goal_action)
+    success_url_name = "tracker:goal-list"
+
+    def offload(self, action, ids):
+        threshold = getattr(settings, "JOB_BULK_DELETE_THRESHOLD", 200)
+        if action != "delete" or len(ids) <= threshold:
+            return None
+        return enqueue("delete_goals", self.request.user, {"ids": ids})
+
+
+class GoalStageBulkActionView(BulkActionView):
+    noun = "stage"
+    perform = staticmethod(bulk_stage_action)
+    id_kwargs = ("goal_id",)
+    success_url_name = "tracker:goal-detail"
+
 
 class GoalCreateView(LoginRequiredMixin, generic.CreateView):
     model = Goal
@@ -138,14 +290,23 @@ class GoalCreateView(LoginRequiredMixin, generic.CreateView):
         return super().form_valid(form)
 
 
-class GoalDetailView(LoginRequiredMixin, generic.DetailView):
+@method_decorator(cache_control(private=True, no_cache=True), name="get")
+@method_decorator(
+    condition(etag_func=goal_etag, last_modified_func=goal_last_modified),
+    name="get",
+)
+class GoalDetailView(
+    LoginRequiredMixin, ReplicaReadMixin, generic.DetailView
+):
     model = Goal
     template_name = "goal/goal_detail.html"
 
+    def get_queryset(self):
+        return goal_detail_queryset()
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context["goal_stages"] = self.object.stages.all()
-        context["goal_commentaries"] = self.object.commentaries.all()
+        context.update(load_goal_detail(self.object))
         context["form"] = GoalCommentaryForm
         return context
 
@@ -191,42 +352,28 @@ class GoalStageUpdateView(LoginRequiredMixin, generic.UpdateView):
         )
 
 
-class GoalToggleStageStatusView(View):
-    def get(self, request, goal_id, pk):
-        goal_stage = get_object_or_404(GoalStage, pk=pk)
-        complete = "completed"
-        active = "active"
-        goal_stage.status = complete if goal_stage.status == active else active
-        goal_stage.save()
-        return HttpResponseRedirect(
-            reverse_lazy(
-                "tracker:goal-detail",
-                args=[goal_id]
-            )
-        )
-
+class GoalToggleStageStatusView(StatusToggleView):
+    transition = staticmethod(toggle_stage_status)
+    id_kwargs = ("goal_id", "pk")
+    toggle = "complete"
 
-class GoalToggleStageAbandonedStatusView(View):
-    def get(self, request, goal_id, pk):
-        goal_stage = get_object_or_404(GoalStage, pk=pk)
-        abandon = "abandoned"
-        active = "active"
-        goal_stage.status = active if goal_stage.status == abandon else abandon
-        goal_stage.save()
 
-        return HttpResponseRedirect(
-            reverse_lazy(
-                "tracker:goal-detail",
-                args=[goal_id]
-            )
-        )
+class GoalToggleStageAbandonedStatusView(GoalToggleStageStatusView):
+    toggle = "abandon"
 
 
-class HabitListView(LoginRequiredMixin, generic.ListView):
+class HabitListView(
+    LoginRequiredMixin,
+    ReplicaReadMixin,
+    CursorPaginationMixin,
+    generic.ListView,
+):
     model = Habit
     template_name = "habit/habit_list.html"
     paginate_by = 5
     queryset = Habit.objects.all()
+    ordering = ["created_at", "id"]
+    dashboard_count_key = "habits"
 
     def get_context_data(self, *, object_list=None, **kwargs):
         context = super(HabitListView, self).get_context_data(**kwargs)
@@ -245,9 +392,8 @@ class HabitListView(LoginRequiredMixin, generic.ListView):
         queryset = super().get_queryset()
 
         if name:
-            return self.queryset.filter(
-                name__icontains=name,
-                user=user
+            return search.rank_queryset(
+                queryset.filter(user=user), user.pk, name, "habit"
             )
 
         return queryset.filter(user=user)
@@ -282,23 +428,51 @@ class HabitUpdateView(LoginRequiredMixin, generic.UpdateView):
         )
 
 
-class HabitDetailView(LoginRequiredMixin, generic.DetailView):
+@method_decorator(cache_control(private=True, no_cache=True), name="get")
+@method_decorator(
+    condition(etag_func=habit_etag, last_modified_func=habit_last_modified),
+    name="get",
+)
+class HabitDetailView(
+    LoginRequiredMixin, ReplicaReadMixin, generic.DetailView
+):
     model = Habit
     template_name = "habit/habit_detail.html"
+    queryset = Habit.objects.select_related("stats")
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context["commentary_form"] = HabitCommentaryForm()
-        context["habit_commentaries"] = self.object.commentaries.all()
+        # Only evaluated when its cached fragment is missing.
+        context["habit_commentaries"] = (
+            self.object.commentaries.select_related("user")
+        )
+        context["habit_log_form"] = HabitLogForm()
+        context["today_date"] = f"{date.today()}"
+        context["current_year"] = timezone.localdate().year
+        context.update(
+            fragments.get_or_set(
+                self.object.user_id,
+                "habit_detail_stats",
+                self.get_stats_context,
+                vary_on=[self.object.pk, timezone.localdate()],
+            )
+        )
+
+        return context
+
+    def get_stats_context(self) -> dict:
+        """Statistics part of the context, cached per user version."""
+        today = timezone.localdate()
+        context = {}
         total_days = (date.today() - self.object.created_at.date()).days
         context["total_days"] = total_days + 1
 
-        context["completed_days_log"] = self.object.logs.filter(
-            completed="True"
-        ).count()
-        context["not_completed_days_log"] = self.object.logs.filter(
-            completed="False"
-        ).count()
+        stats = HabitStats.for_habit(self.object)
+        context["habit_stats"] = stats
+        context["current_streak"] = stats.active_streak()
+        context["completed_days_log"] = stats.completed_count
+        context["not_completed_days_log"] = stats.missed_count
 
         context["ignored_days"] = (
             context["total_days"]
@@ -310,25 +484,186 @@ class HabitDetailView(LoginRequiredMixin, generic.DetailView):
             100 * (context["completed_days_log"] / context["total_days"]), 2
         ) if context["total_days"] else 0
 
-        context["today_date"] = f"{date.today()}"
-        context["habit_log_form"] = HabitLogForm()
-
-        dates = self.object.logs.all().dates("created_at", "day")
-        context["filled_dates"] = [d.strftime("%Y-%m-%d") for d in dates]
-
+        context["logged_today"] = self.object.logs.filter(
+            log_date=today
+        ).exists()
+        context["history_days"] = self.get_history_days()
         return context
 
+    def get_history_days(self) -> list:
+        """Day states of the current year, read from the year bitmap."""
+        today = timezone.localdate()
+        first_day = max(
+            timezone.localdate(self.object.created_at),
+            date(today.year, 1, 1)
+        )
+        bitmap = self.object.year_bitmaps.filter(year=today.year).first()
+        completed = bitmaps.to_int(bitmap.completed) if bitmap else 0
+        logged = bitmaps.to_int(bitmap.logged) if bitmap else 0
+
+        history = []
+        for index in range(
+            bitmaps.day_index(first_day), bitmaps.day_index(today) + 1
+        ):
+            if completed >> index & 1:
+                state = "completed"
+            elif logged >> index & 1:
+                state = "missed"
+            else:
+                state = "ignored"
+            history.append({
+                "date": bitmaps.index_date(today.year, index),
+                "state": state,
+            })
+        return history
+
     def post(self, request, *args, **kwargs):
         habit = self.get_object()
         form = HabitLogForm(request.POST)
         if form.is_valid():
             log = form.save(commit=False)
             log.habit = habit
-            log.save()
+            log.log_date = timezone.localdate()
+            HabitLog.objects.upsert([log])
 
         return redirect("tracker:habit-detail", pk=habit.pk)
 
 
+class HabitCheckInView(LoginRequiredMixin, generic.FormView):
+    """Log today's state of every habit of the user in one request."""
+
+    form_class = HabitCheckInForm
+    template_name = "habit/habit_check_in.html"
+
+    def get_habits(self) -> list:
+        if not hasattr(self, "_habits"):
+            self._habits = list(
+                Habit.objects.filter(user=self.request.user).order_by("name")
+            )
+        return self._habits
+
+    def get_initial(self) -> dict:
+        logged = HabitLog.objects.filter(
+            habit__user=self.request.user, log_date=timezone.localdate()
+        ).values_list("habit_id", "completed")
+        return {
+            f"habit_{habit_id}": completed for habit_id, completed in logged
+        }
+
+    def get_form_kwargs(self) -> dict:
+        kwargs = super().get_form_kwargs()
+        kwargs["habits"] = self.get_habits()
+        return kwargs
+
+    def form_valid(self, form):
+        logs = form.logs(timezone.localdate())
+        HabitLog.objects.upsert(logs)
+
+        return self.render_to_response(
+            self.get_context_data(
+                form=self.form_class(
+                    initial=self.get_initial(), habits=self.get_habits()
+                ),
+                logged=logs,
+            )
+        )
+
+
+class HabitHeatmapView(LoginRequiredMixin, View):
+    """One year of a habit's history as bitmaps.
+
+    ``?format=bin`` returns the raw 46-byte completed bitmap followed by
+    the 46-byte logged bitmap; otherwise the bitmaps are base64 encoded
+    in JSON next to totals computed from them.
+    """
+
+    def get(self, request, pk, year):
+        if not 1 <= year <= 9999:
+            raise Http404("Invalid year")
+
+        bitmap = HabitYearBitmap.objects.select_related("habit").filter(
+            habit_id=pk, habit__user=request.user, year=year
+        ).first()
+        if bitmap is None:
+            habit = get_object_or_404(Habit, pk=pk, user=request.user)
+            bitmap = HabitYearBitmap(habit=habit, year=year)
+
+        if request.GET.get("format") == "bin":
+            return HttpResponse(
+                bytes(bitmap.completed) + bytes(bitmap.logged),
+                content_type="application/octet-stream"
+            )
+
+        first_day = timezone.localdate(bitmap.habit.created_at)
+        last_day = timezone.localdate()
+        return JsonResponse({
+            "habit": pk,
+            "year": year,
+            "days": bitmaps.days_in_year(year),
+            "completed": b64encode(bytes(bitmap.completed)).decode(),
+            "logged": b64encode(bytes(bitmap.logged)).decode(),
+            "totals": bitmap.summary(first_day, last_day),
+        })
+
+
+class HabitMonthReportView(LoginRequiredMixin, View):
+    """Completed, missed and ignored days of every habit in a month.
+
+    Reads the materialized ``HabitMonthReport`` rows, so the cost does
+    not grow with the length of the history. ``?format=json`` returns
+    the same rows as JSON.
+    """
+
+    def get(self, request, year=None, month=None):
+        today = timezone.localdate()
+        if year is None:
+            year, month = today.year, today.month
+        if not (1 <= year <= 9999 and 1 <= month <= 12):
+            raise Http404("Invalid month")
+
+        first_day = date(year, month, 1)
+        rows = month_report(request.user, first_day, today)
+
+        if request.GET.get("format") == "json":
+            return JsonResponse({
+                "month": f"{first_day:%Y-%m}",
+                "habits": [
+                    {
+                        "id": row["habit"].pk,
+                        "name": row["habit"].name,
+                        "month_goal": row["habit"].month_goal or "",
+                        **{
+                            key: row[key] for key in (
+                                "days", "completed", "missed", "ignored",
+                                "target", "target_percent",
+                            )
+                        },
+                    }
+                    for row in rows
+                ],
+            })
+
+        previous_month = (
+            (first_day - timedelta(days=1)).replace(day=1)
+            if first_day > date.min else None
+        )
+        last_day = month_end(first_day)
+        # Checked before adding a day, which overflows for 9999/12.
+        next_month = (
+            last_day + timedelta(days=1) if last_day < today else None
+        )
+        return render(
+            request,
+            "habit/habit_month_report.html",
+            context={
+                "month": first_day,
+                "rows": rows,
+                "previous_month": previous_month,
+                "next_month": next_month,
+            }
+        )
+
+
 class CommentaryGoalCreateView(LoginRequiredMixin, generic.CreateView):
     model = Commentary
     form_class = GoalCommentaryForm
@@ -389,3 +724,151 @@ class CommentaryHabitCreateView(LoginRequiredMixin, generic.CreateView):
             "tracker:habit-detail",
             kwargs={"pk": self.kwargs["pk"]}
         )
+
+
+class DataImportView(LoginRequiredMixin, generic.FormView):
+    form_class = DataImportForm
+    template_name = "data/import_form.html"
+
+    def form_valid(self, form):
+        lines = codecs.iterdecode(form.cleaned_data["file"], "utf-8")
+        try:
+            report = import_stream(
+                self.request.user, lines, form.cleaned_data["format"]
+            )
+        except UnicodeDecodeError:
+            form.add_error("file", "The file is not valid UTF-8.")
+            return self.form_invalid(form)
+
+        return self.render_to_response(
+            self.get_context_data(form=self.form_class(), report=report)
+        )
+
+
+@method_decorator(gzip_page, name="get")
+class DataExportView(LoginRequiredMixin, View):
+    """Stream all of the user's data as CSV or JSONL (``?format=``).
+
+    The body is gzip-compressed on the fly when the client accepts it.
+    """
+
+    def get(self, request):
+        data_format = request.GET.get("format", "jsonl")
+        if data_format not in WRITERS:
+            raise Http404("Unknown export format")
+
+        writer, content_type = WRITERS[data_format]
+        response = StreamingHttpResponse(
+            writer(iter_records(request.user)),
+            content_type=content_type
+        )
+        filename = f"habits-and-goals-{timezone.localdate()}.{data_format}"
+        response["Content-Disposition"] = (
+            f'attachment; filename="{filename}"'
+        )
+        return response
+
+
+class JobListView(LoginRequiredMixin, generic.ListView):
+    model = Job
+    template_name = "job/job_list.html"
+    context_object_name = "job_list"
+    paginate_by = 20
+
+    def get_queryset(self):
+        return Job.objects.filter(user=self.request.user).defer(
+            "payload", "result", "error"
+        )
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["form"] = JobCreateForm()
+        return context
+
+
+class JobCreateView(LoginRequiredMixin, View):
+    def post(self, request):
+        form = JobCreateForm(request.POST)
+        if not form.is_valid():
+            messages.error(request, "Choose a job to start.")
+            return redirect("tracker:job-list")
+
+        job = enqueue(form.cleaned_data["kind"], request.user, form.payload())
+        return redirect("tracker:job-detail", pk=job.pk)
+
+
+class JobDetailView(LoginRequiredMixin, generic.DetailView):
+    """Status of one background job; ``?format=json`` for polling."""
+
+    model = Job
+    template_name = "job/job_detail.html"
+
+    def get_queryset(self):
+        return Job.objects.filter(user=self.request.user)
+
+    def render_to_response(self, context, **response_kwargs):
+        if self.request.GET.get("format") != "json":
+            return super().render_to_response(context, **response_kwargs)
+        job = self.object
+        return JsonResponse({
+            "id": job.pk,
+            "kind": job.kind,
+            "status": job.status,
+            "attempts": job.attempts,
+            "max_attempts": job.max_attempts,
+            "created_at": job.created_at.isoformat(),
+            "finished_at": (
+                job.finished_at.isoformat() if job.finished_at else None
+            ),
+            "result": job.result,
+        })
+
+
+class JobDownloadView(LoginRequiredMixin, View):
+    """Download the gzipped file written by a finished export job."""
+
+    def get(self, request, pk):
+        job = get_object_or_404(
+            Job,
+            pk=pk,
+            user=request.user,
+            kind="export_data",
+            status="succeeded",
+        )
+        path = job_file_path(job)
+        if not path.exists():
+            raise Http404("The export file is gone")
+
+        data_format = job.result.get("format", "jsonl")
+        return FileResponse(
+            path.open("rb"),
+            as_attachment=True,
+            filename=(
+                f"habits-and-goals-{job.created_at:%Y-%m-%d}"
+                f".{data_format}.gz"
+            ),
+            content_type="application/gzip",
+        )
+
+
+class SearchView(LoginRequiredMixin, View):
+    def get(self, request):
+        query = request.GET.get("q", "")
+        results = search.search_objects(request.user.pk, query)
+        return render(
+            request,
+            "search/search_results.html",
+            context={"query": query, "results": results}
+        )
+
+
+class MetricsView(View):
+    """Prometheus scrape endpoint, summed over every worker process."""
+
+    def get(self, request):
+        if not getattr(settings, "METRICS_ENABLED", False):
+            raise Http404
+        return HttpResponse(
+            metrics.render_prometheus(metrics.collect()),
+            content_type="text/plain; version=0.0.4; charset=utf-8"
+        )